@@ -1,293 +1,41 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import random
-import math
-import copy
 import io
+import os
 import time
-
-st.set_page_config(
-    page_title="RTSS Simulator - ITU",
-    page_icon="⏱️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-
-import matplotlib
-matplotlib.use('Agg')
-
-class Task:
-    def __init__(self, task_type, args, original_char):
-        self.task_type = task_type
-        self.original_char = original_char
-        self.id = 0
-        self.color = ""
-        self.arrival_time = 0
-        self.burst_time = 0
-        self.period = 0
-        self.deadline = 0
-        self.relative_deadline = 0
-        self.server_capacity = 0
-        self.current_budget = 0
-        self.parse_args(args)
-
-    def parse_args(self, args):
-        n = len(args)
-        if self.task_type == 'P':
-            if self.original_char == 'P':
-                if n == 4: self.arrival_time, self.burst_time, self.period, self.deadline = args
-                elif n == 3: self.arrival_time, self.burst_time, self.period = args; self.deadline = self.period
-                elif n == 2: self.arrival_time = 0; self.burst_time, self.period = args; self.deadline = self.period
-            elif self.original_char == 'D':
-                if n == 3: self.arrival_time = 0; self.burst_time, self.period, self.deadline = args
-                elif n == 4: self.arrival_time, self.burst_time, self.period, self.deadline = args
-            self.relative_deadline = self.deadline
-        elif self.task_type == 'S':
-            self.arrival_time = 0
-            self.burst_time = args[0]
-            self.period = args[1]
-            self.deadline = args[1]
-            self.relative_deadline = self.period
-            self.server_capacity = self.burst_time
-            self.current_budget = self.burst_time
-        elif self.task_type == 'A':
-            if n >= 2:
-                self.arrival_time = args[0]
-                self.burst_time = args[1]
-                self.period = 0
-                self.deadline = 99999
-                self.relative_deadline = 99999
-
-
-def calculate_lcm(tasks):
-    periods = [t.period for t in tasks if t.period > 0]
-    if not periods: return 100
-    lcm = periods[0]
-    for p in periods[1:]:
-        lcm = abs(lcm * p) // math.gcd(lcm, p)
-    return min(lcm, 2000) 
-
-def calculate_utilization(tasks):
-    u = 0.0
-    for t in tasks:
-        if t.task_type in ['P', 'S'] and t.period > 0:
-            u += t.burst_time / t.period
-    return u
-
-def parse_content(content):
-    tasks = []
-    task_counter = 1
-    lines = content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('#'): continue
-        parts = line.split()
-        if not parts: continue
-        
-        char_code = parts[0].upper()
-        clean_args = []
-        for p in parts[1:]:
-            if p.startswith('('): break 
-            try: clean_args.append(int(p))
-            except ValueError: continue
-        
-        if clean_args:
-            t_type = 'P'
-            if char_code == 'A': t_type = 'A'
-            elif char_code == 'S': t_type = 'S'
-            elif char_code == 'D': t_type = 'P'
-            
-            new_task = Task(t_type, clean_args, char_code)
-            new_task.id = task_counter
-            if t_type == 'S': new_task.color = '#a6e3a1' 
-            elif t_type == 'A': new_task.color = '#fab387' 
-            else: new_task.color = '#89b4fa' 
-            tasks.append(new_task)
-            task_counter += 1
-    return tasks
-
-def generate_smart_random_tasks(total_tasks, num_aperiodic, target_util, include_server):
-    tasks = []
-    current_util_budget = target_util
-    server_task = None
-    
-    if include_server:
-        server_util = min(0.2, current_util_budget * 0.25)
-        current_util_budget -= server_util
-        s_period = random.choice([20, 40, 50])
-        s_cap = max(1, int(s_period * server_util))
-        server_task = Task('S', [s_cap, s_period], 'S')
-        server_task.color = '#a6e3a1'
-    
-    num_periodic = total_tasks - num_aperiodic
-    if include_server: num_periodic -= 1 
-    if num_periodic < 0: num_periodic = 0 
-
-    if num_periodic > 0 and current_util_budget > 0:
-        points = [0.0] + sorted([random.uniform(0, current_util_budget) for _ in range(num_periodic - 1)]) + [current_util_budget]
-        utilizations = [points[i+1] - points[i] for i in range(num_periodic)]
-        periods_pool = [20, 40, 50, 60, 80, 100, 200]
-        for i in range(num_periodic):
-            p = random.choice(periods_pool)
-            u = utilizations[i]
-            c = max(1, int(p * u))
-            if c >= p: c = p - 1
-            t = Task('P', [0, c, p, p], 'P')
-            t.color = '#89b4fa'
-            tasks.append(t)
-            
-    if server_task: tasks.insert(0, server_task) 
-
-    for i in range(num_aperiodic):
-        arrival = random.randint(0, 100)
-        exec_time = random.randint(1, 5)
-        t = Task('A', [arrival, exec_time], 'A')
-        t.color = '#fab387'
-        tasks.append(t)
-        
-    for i, t in enumerate(tasks): t.id = i + 1
-    return tasks
-
-def run_simulation(tasks, algorithm, num_cores):
-    periodic_tasks = [t for t in tasks if t.task_type == 'P']
-    server_task = next((t for t in tasks if t.task_type == 'S'), None)
-    aperiodic_tasks = [t for t in tasks if t.task_type == 'A']
-    
-    if algorithm in ["Poller", "Deferrable Server", "Sporadic Server"] and not server_task:
-        return [], 0, {'error': f"Error: {algorithm} requires a Server (S) task definition."}
-
-    active_periodic = periodic_tasks[:]
-    if server_task and algorithm != "Background":
-        active_periodic.append(server_task)
-
-    lcm = calculate_lcm(active_periodic) if active_periodic else 100
-    
-    schedule_log = [] 
-    ready_queue = []    
-    aperiodic_queue = [] 
-    sporadic_replenishments = []
-    
-    aperiodic_tasks.sort(key=lambda x: x.arrival_time)
-    ap_index = 0
-    stats = {'total_jobs': 0, 'missed_deadlines': 0, 'aperiodic_done': 0}
-
-    for t in range(lcm):
-        # 1. Arrivals
-        for task in active_periodic:
-            if t >= task.arrival_time and (t - task.arrival_time) % task.period == 0:
-                abs_deadline = t + task.deadline
-                new_job = {'task': task, 'remaining': task.burst_time, 'abs_deadline': abs_deadline}
-                stats['total_jobs'] += 1
-                if task == server_task:
-                    if algorithm == "Deferrable Server":
-                        task.current_budget = task.server_capacity
-                        ready_queue = [j for j in ready_queue if j['task'] != server_task]
-                        new_job['remaining'] = task.current_budget
-                        ready_queue.append(new_job)
-                    elif algorithm == "Sporadic Server":
-                        if task.current_budget > 0:
-                            new_job['remaining'] = task.current_budget
-                            ready_queue = [j for j in ready_queue if j['task'] != server_task]
-                            ready_queue.append(new_job)
-                    else: ready_queue.append(new_job)
-                else: ready_queue.append(new_job)
-
-        # 2. Sporadic Replenishment
-        if algorithm == "Sporadic Server" and server_task:
-            while sporadic_replenishments and sporadic_replenishments[0][0] <= t:
-                rep_time, amount = sporadic_replenishments.pop(0)
-                server_task.current_budget = min(server_task.server_capacity, server_task.current_budget + amount)
-                server_in_queue = any(j['task'] == server_task for j in ready_queue)
-                if not server_in_queue and server_task.current_budget > 0:
-                    ready_queue.append({'task': server_task, 'remaining': server_task.current_budget, 'abs_deadline': t + server_task.period})
-                elif server_in_queue:
-                    for j in ready_queue:
-                        if j['task'] == server_task: j['remaining'] = server_task.current_budget
-
-        # 3. Aperiodic Arrivals
-        while ap_index < len(aperiodic_tasks) and aperiodic_tasks[ap_index].arrival_time == t:
-            aperiodic_queue.append({'task': aperiodic_tasks[ap_index], 'remaining': aperiodic_tasks[ap_index].burst_time, 'abs_deadline': 99999})
-            ap_index += 1
-
-        # 4. Poller Check
-        if algorithm == "Poller" and server_task:
-             for job in ready_queue:
-                 if job['task'] == server_task:
-                     if not aperiodic_queue: job['remaining'] = 0 
-                     break
-
-        # 5. SORTING (PRIORITY ASSIGNMENT)
-        ready_queue = [j for j in ready_queue if j['remaining'] > 0]
-        
-        if algorithm == "Least Laxity First (LLF)":
-            # LAXITY = (Absolute Deadline - Current Time) - Remaining Execution
-            # Lower Laxity = Higher Priority
-            ready_queue.sort(key=lambda x: ((x['abs_deadline'] - t - x['remaining']), x['task'].id))
-            
-        elif algorithm == "Earliest Deadline First (EDF)": 
-            ready_queue.sort(key=lambda x: (x['abs_deadline'], x['task'].id))
-            
-        elif algorithm == "Deadline Monotonic (DM)": 
-            ready_queue.sort(key=lambda x: (x['task'].relative_deadline, x['task'].id))
-            
-        else: # Rate Monotonic (Default)
-            ready_queue.sort(key=lambda x: (x['task'].period if x['task'].period > 0 else 9999, x['task'].id))
-
-        # 6. Dispatching
-        cores_available = num_cores
-        job_index = 0
-        while cores_available > 0 and job_index < len(ready_queue):
-            current_job = ready_queue[job_index]
-            if current_job['task'] == server_task and not aperiodic_queue and algorithm in ["Deferrable Server", "Sporadic Server"]:
-                job_index += 1; continue
-
-            core_id = num_cores - cores_available + 1 
-            label = f"T{current_job['task'].id}"; status = 'OK'
-            
-            if current_job['task'] == server_task and aperiodic_queue and algorithm != "RM Baseline":
-                ap_job = aperiodic_queue[0]
-                label = f"T{ap_job['task'].id}" 
-                ap_job['remaining'] -= 1
-                if ap_job['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
-            elif current_job['task'] == server_task and algorithm != "RM Baseline": label = "" 
-
-            if t >= current_job['abs_deadline']: status = 'MISS'; stats['missed_deadlines'] += 1
-
-            schedule_log.append({'core': core_id, 'time': t, 'duration': 1, 'label': label, 'status': status, 'task_id': current_job['task'].id})
-            current_job['remaining'] -= 1
-            
-            if algorithm == "Sporadic Server" and current_job['task'] == server_task:
-                server_task.current_budget -= 1; sporadic_replenishments.append((t + server_task.period, 1))
-            
-            if current_job['remaining'] == 0: ready_queue.pop(job_index)
-            else: job_index += 1
-            cores_available -= 1
-
-        while cores_available > 0 and algorithm == "Background" and aperiodic_queue:
-            core_id = num_cores - cores_available + 1
-            ap_job = aperiodic_queue[0]
-            schedule_log.append({'core': core_id, 'time': t, 'duration': 1, 'label': f"T{ap_job['task'].id}", 'status': 'OK', 'task_id': ap_job['task'].id})
-            ap_job['remaining'] -= 1
-            if ap_job['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
-            cores_available -= 1
-
-    return schedule_log, lcm, stats
-
-
-def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
-    merged_schedule = []
-    raw_schedule.sort(key=lambda x: (x['core'], x['time']))
-    for item in raw_schedule:
-        if not merged_schedule: merged_schedule.append(item); continue
-        last = merged_schedule[-1]
-        if (last['core'] == item['core'] and last['task_id'] == item['task_id'] and 
-            last['status'] == item['status'] and last['label'] == item['label'] and 
-            last['time'] + last['duration'] == item['time']):
-            last['duration'] += 1 
-        else: merged_schedule.append(item) 
-
+import tempfile
+
+from rtss.analysis import analyze, describe
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.cache import ResultCache, parse_cached
+from rtss.compare import compare_algorithms
+from rtss.gantt import BarLabels, draw_bars
+from rtss.model import calculate_utilization, generate_smart_random_tasks
+from rtss.partition import HEURISTICS, analyze_partitions, partition_tasks, run_partitioned
+from rtss.profiling import PHASES, format_profile, run_instrumented
+from rtss.trace import open_trace, save_trace
+
+@st.cache_resource
+def result_cache():
+    # One cache per server process, shared by every session (RTSS_CACHE_DIR adds a disk tier)
+    return ResultCache(directory=os.environ.get("RTSS_CACHE_DIR"))
+
+def keep_upload(key, upload, suffix):
+    # Copies an upload to a temporary file whose path is kept in st.session_state[key];
+    # the copy of the previous upload (if any) is deleted. upload None just deletes it.
+    old = st.session_state.get(key)
+    if old:
+        try: os.remove(old)
+        except OSError: pass  # already gone, or still mapped on Windows
+    st.session_state[key] = None
+    if upload is None: return
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f: f.write(upload.getvalue())
+    st.session_state[key] = f.name
+
+def draw_gantt(schedule, tasks, simulation_time, num_cores, algorithm):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
     is_single_core = (num_cores == 1)
     fig_height = len(tasks) * 0.5 + 1 if is_single_core else num_cores * 1.0 + 1
     y_label = "Tasks" if is_single_core else "Processors (Cores)"
@@ -303,7 +51,7 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     yticks = []
     yticklabels = []
     if is_single_core:
-        tasks.sort(key=lambda x: x.id)
+        tasks = sorted(tasks, key=lambda x: x.id)
         for i, task in enumerate(tasks):
             y_pos = 10 * (i + 1)
             yticks.append(y_pos)
@@ -318,15 +66,7 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     gnt.set_yticks(yticks)
     gnt.set_yticklabels(yticklabels)
 
-    for job in merged_schedule:
-        task = next((t for t in tasks if t.id == job['task_id']), None)
-        color = task.color if task else 'gray'
-        if job['status'] == 'MISS': color = '#f38ba8' 
-        y_pos = 10 * (next((i for i, t in enumerate(tasks) if t.id == job['task_id']), 0) + 1) if is_single_core else 10 * job['core']
-        gnt.broken_barh([(job['time'], job['duration'])], (y_pos - 4, 8), facecolors=color, edgecolors='black', linewidth=0.5)
-        
-        if job['label'] and job['duration'] > 1:
-            gnt.text(job['time'] + job['duration']/2, y_pos, job['label'], ha='center', va='center', color='white', fontsize=8, fontweight='bold')
+    BarLabels(gnt, draw_bars(gnt, schedule, tasks, num_cores))
 
     patches = [mpatches.Patch(color='#89b4fa', label='Periodic Task'), mpatches.Patch(color='#a6e3a1', label='Server Task'), mpatches.Patch(color='#fab387', label='Aperiodic Job'), mpatches.Patch(color='#f38ba8', label='Deadline Miss')]
     gnt.legend(handles=patches, loc='upper right', frameon=True)
@@ -334,7 +74,140 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     
     return fig
 
+def show_metrics(slot, t, duration, stats, analysis):
+    m1, m2, m3, m4, m5 = slot.container().columns(5)
+    m1.metric("Duration", f"{duration} ms" if t >= duration else f"{t} / {duration} ms")
+    m2.metric("Missed Deadlines", stats['missed_deadlines'], delta_color="inverse" if stats['missed_deadlines']>0 else "normal")
+    m3.metric("Analysis", describe(analysis))
+    m4.metric("Total Jobs", stats['total_jobs'])
+    m5.metric("Aperiodic Done", stats['aperiodic_done'])
+
+def run_streamed(sim_tasks, algorithm, num_cores, analysis, u, redraw_every=0.5):
+    # The engine hands back the schedule window by window: metrics follow every
+    # window, the chart at most every redraw_every seconds. Pressing Cancel (or
+    # any other widget) reruns the script, which abandons the generator.
+    import matplotlib.pyplot as plt
+    cancel = st.empty()
+    cancel.button("⏹ Cancel", on_click=lambda: st.session_state.update(sim_cancelled=True))
+    progress = st.progress(0.0, text="Simulating...")
+    metrics = st.empty(); chart = st.empty()
+    last_draw = time.monotonic()
+    for t, schedule, duration, stats in result_cache().stream(sim_tasks, algorithm, num_cores, st.session_state.get('trace_path')):
+        if 'error' in stats: break
+        progress.progress(min(t / max(duration, 1), 1.0), text=f"Simulated {t} of {duration} ms")
+        show_metrics(metrics, t, duration, stats, analysis)
+        if t < duration and time.monotonic() - last_draw >= redraw_every:
+            fig = draw_gantt(schedule, sim_tasks, t, num_cores, algorithm)
+            chart.pyplot(fig); plt.close(fig)
+            last_draw = time.monotonic()
+    cancel.empty(); progress.empty()
+    show_result(metrics, chart, sim_tasks, algorithm, num_cores, analysis, u, schedule, duration, stats)
+
+def run_partitioned_view(sim_tasks, algorithm, num_cores, analysis, u, heuristic):
+    # Every core is simulated in its own worker process; nothing to stream
+    with st.spinner(f"Simulating {num_cores} partitions..."):
+        schedule, duration, stats = run_partitioned(sim_tasks, algorithm, num_cores, heuristic, "rta", st.session_state.get('trace_path'))
+    metrics = st.empty(); chart = st.empty()
+    show_result(metrics, chart, sim_tasks, algorithm, num_cores, analysis, u, schedule, duration, stats)
+    if 'error' in stats: return
+    if stats['unassigned']: st.warning(f"Did not fit on any core (placed on the least loaded one): {', '.join(f'T{tid}' for tid in stats['unassigned'])}")
+    st.dataframe([{"Core": p['core'], "Tasks": ' '.join(f"T{tid}" for tid in p['tasks']), "Utilization": p['utilization'],
+                   "Misses": p['missed_deadlines']} for p in stats['partitions']], use_container_width=True, hide_index=True)
+
+def run_profiled(sim_tasks, algorithm, num_cores, analysis, u):
+    # Instrumented run (not streamed, not cached) plus a cProfile dump to download
+    trace = st.session_state.get('trace_path')
+    arrivals = (lambda: read_arrival_trace(trace, next_free_id(sim_tasks))) if trace else None
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = os.path.join(tmp, "run.pstats")
+        with st.spinner("Profiling the engine..."):
+            schedule, duration, stats = run_instrumented(sim_tasks, algorithm, num_cores, arrivals, memory=True, pstats_path=dump)
+        pstats_bytes = open(dump, 'rb').read() if os.path.exists(dump) else None
+    metrics = st.empty(); chart = st.empty()
+    show_result(metrics, chart, sim_tasks, algorithm, num_cores, analysis, u, schedule, duration, stats)
+    if 'error' in stats: return
+    profile = stats['profile']
+    with st.expander("Engine Profile", expanded=True):
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Events / s", f"{profile['events_per_second']:,.0f}" if profile['events_per_second'] else "-")
+        c2.metric("Peak Ready Queue", profile['peak_ready_queue'])
+        c3.metric("Peak Allocations", f"{profile['memory']['peak_bytes'] / 1024:,.1f} KiB")
+        st.dataframe([{"Phase": name, "ms": round(profile['phases'][name]['seconds'] * 1000, 3), "Calls": profile['phases'][name]['calls']} for name in PHASES],
+                     use_container_width=True, hide_index=True)
+        st.download_button("📄 Download Profile (.txt)", format_profile({k: v for k, v in profile.items() if k != 'pstats'}), file_name="profile.txt")
+        if pstats_bytes: st.download_button("🔬 Download cProfile Dump (.pstats)", pstats_bytes, file_name="run.pstats")
+
+def show_response_stats(stats):
+    # Streaming statistics from the engine
+    with st.expander("Response Times & Jitter"):
+        ap = stats['aperiodic_response']
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Preemptions", stats['preemptions']); c2.metric("Migrations", stats['migrations'])
+        c3.metric("Aperiodic Mean", f"{ap['mean']} ms" if ap['count'] else "-"); c4.metric("Aperiodic p95", f"{ap['p95']} ms" if ap['count'] else "-")
+        st.dataframe([{"Task": f"T{tid}", "Jobs": r['jobs'], "Min R": r['min_response'], "Mean R": round(r['mean_response'], 2), "Max R": r['max_response'],
+                       "Release Jitter": r['release_jitter'], "Finishing Jitter": r['finishing_jitter']} for tid, r in stats['tasks'].items()],
+                     use_container_width=True, hide_index=True)
+
+def show_replay(trace, max_segments=20000):
+    # A saved run (rtss.trace), no re-simulation: only the chosen time window is read from the memory map
+    stats = trace.stats
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("Algorithm", trace.algorithm.split(" (")[0]); m2.metric("Cores", trace.num_cores)
+    m3.metric("Duration", f"{trace.horizon} ms"); m4.metric("Missed Deadlines", stats['missed_deadlines'], delta_color="inverse" if stats['missed_deadlines']>0 else "normal")
+    m5.metric("Segments", f"{len(trace):,}")
+    if stats['truncated']: st.warning(f"The run was stopped at {trace.horizon} ms (hyperperiod {stats['hyperperiod']} ms).")
+    elif stats['steady_state']: st.caption(f"Hyperperiod {stats['hyperperiod']} ms: the last {stats['hyperperiod']} ms repeat from here on.")
+    show_response_stats(stats)
+    if stats.get('partitions'):
+        st.dataframe([{"Core": p['core'], "Tasks": ' '.join(f"T{tid}" for tid in p['tasks']), "Utilization": p['utilization'],
+                       "Misses": p['missed_deadlines']} for p in stats['partitions']], use_container_width=True, hide_index=True)
+
+    # Long runs open on a window of about max_segments segments
+    horizon = max(trace.horizon, 1)
+    default = horizon if len(trace) <= max_segments else max(1, horizon * max_segments // len(trace))
+    lo, hi = st.slider("Time Window (ms)", 0, horizon, (0, default))
+    hi = max(hi, lo + 1)
+    fig = draw_gantt(trace.schedule(lo, hi), trace.tasks, hi, trace.num_cores, f"{trace.algorithm} (replay)")
+    fig.axes[0].set_xlim(lo, hi)
+    st.pyplot(fig)
+
+def show_result(metrics, chart, sim_tasks, algorithm, num_cores, analysis, u, schedule, duration, stats):
+    if 'error' in stats:
+        st.error(stats['error']); return
+    show_metrics(metrics, duration, duration, stats, analysis)
+    if stats['truncated']:
+        st.warning(f"Stopped at the {duration} ms limit (hyperperiod {stats['hyperperiod']} ms, offset sets need up to max offset + 2H).")
+    elif stats['steady_state']:
+        st.caption(f"Hyperperiod {stats['hyperperiod']} ms: the last {stats['hyperperiod']} ms repeat from here on.")
+
+    show_response_stats(stats)
+
+    # Chart
+    fig = draw_gantt(schedule, sim_tasks, duration, num_cores, algorithm)
+    chart.pyplot(fig)
+
+    # Export
+    report_text = f"Algorithm: {algorithm}\nCores: {num_cores}\nLoad: {u*100:.1f}%\nMisses: {stats['missed_deadlines']}\nAnalysis: {describe(analysis)}\n"
+    st.download_button("💾 Download Report (.txt)", report_text, file_name=f"Report_{algorithm.split()[0]}.txt")
+
+    img = io.BytesIO()
+    fig.savefig(img, format='png')
+    st.download_button("🖼️ Download Chart (.png)", img, file_name=f"Chart_{algorithm.split()[0]}.png", mime="image/png")
+
+    # Whole schedule as a binary trace (see rtss.trace)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = save_trace(os.path.join(tmp, "run.npz"), schedule, sim_tasks, algorithm, num_cores, duration, stats)
+        with open(path, 'rb') as f: trace_bytes = f.read()
+    st.download_button("🗂️ Download Schedule Trace (.npz)", trace_bytes, file_name=f"Trace_{algorithm.split()[0]}.npz", mime="application/octet-stream")
+
 def main():
+    # Page setup happens here, not at import, so the module can be imported as a library
+    st.set_page_config(
+        page_title="RTSS Simulator - ITU",
+        page_icon="⏱️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
     st.markdown("## ⏱️ RTSS Simulator - ITU ")
     st.markdown("""
     A web-based simulator for **BLG 450E**. Supports Sporadic Server, Deferable Server, RM, DM, EDF, LLF and Multicore.
@@ -350,6 +223,10 @@ def main():
             "Earliest Deadline First (EDF)", "Least Laxity First (LLF)",
             "Background", "Poller", "Deferrable Server", "Sporadic Server", "RM Baseline"
         ])
+        modes = {"Global": None, **{f"Partitioned ({h} decreasing)": h for h in HEURISTICS}}
+        mode = st.selectbox("Multicore Mode", list(modes), help="Partitioned: tasks are bound to cores by bin packing with an RTA / QPA admission test")
+        partition = modes[mode]
+        profile = st.checkbox("Profile engine", value=False, help="Time every engine phase of a global run (no streaming, no cache)")
         
         st.divider()
         st.markdown("### ℹ️ Info")
@@ -359,15 +236,23 @@ def main():
     if 'tasks' not in st.session_state: st.session_state.tasks = []
     
     # --- TABS FOR INPUT ---
-    tab1, tab2, tab3 = st.tabs(["📂 Load File", "🎲 Random Generator", "✏️ Manual Input"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📂 Load File", "🎲 Random Generator", "✏️ Manual Input", "🎞️ Replay Trace"])
 
     with tab1:
         uploaded_file = st.file_uploader("Upload Task File (.txt)", type="txt")
         if uploaded_file is not None:
             content = uploaded_file.getvalue().decode("utf-8")
-            st.session_state.tasks = parse_content(content)
+            st.session_state.tasks = parse_cached(content)
             st.success(f"Loaded: {uploaded_file.name} ({len(st.session_state.tasks)} tasks)")
 
+        trace_file = st.file_uploader("Aperiodic Arrival Trace (optional, .npy or .txt)", type=["npy", "txt"])
+        if trace_file is None:
+            keep_upload('trace_path', None, None); st.session_state.trace_id = None
+        elif st.session_state.get('trace_id') != trace_file.file_id:
+            # Kept on disk so the engine can stream (and memory-map) it on every run
+            keep_upload('trace_path', trace_file, ".npy" if trace_file.name.endswith(".npy") else ".txt")
+            st.session_state.trace_id = trace_file.file_id
+
     with tab2:
         col1, col2 = st.columns(2)
         rn = col1.number_input("Total Tasks", 1, 20, 5)
@@ -406,8 +291,18 @@ A 12 2         # Aperiodic Job
 """
         txt_input = st.text_area("Paste Task Data Here", value=default_txt, height=300)
         if st.button("Load Manual Data"):
-            st.session_state.tasks = parse_content(txt_input)
+            st.session_state.tasks = parse_cached(txt_input)
             st.success("Loaded manual tasks.")
+    with tab4:
+        replay_file = st.file_uploader("Exported Schedule Trace (.npz)", type="npz")
+        if replay_file is None:
+            keep_upload('replay_path', None, None); st.session_state.replay_id = None
+        else:
+            if st.session_state.get('replay_id') != replay_file.file_id:
+                # On disk so the segments can be memory mapped
+                keep_upload('replay_path', replay_file, ".npz"); st.session_state.replay_id = replay_file.file_id
+            try: show_replay(open_trace(st.session_state.replay_path))
+            except (OSError, ValueError) as e: st.error(f"Cannot open trace: {e}")
 
     # --- MAIN DISPLAY ---
     st.divider()
@@ -418,38 +313,36 @@ A 12 2         # Aperiodic Job
         cap = num_cores * 1.0
         status_color = "red" if u > cap else "green"
         st.markdown(f"### System Load: :{status_color}[{u*100:.1f}%] (Capacity: {cap*100:.0f}%)")
+        if partition: analysis = analyze_partitions(partition_tasks(st.session_state.tasks, num_cores, algorithm, partition, "rta")[0], algorithm)
+        else: analysis = analyze(st.session_state.tasks, algorithm, num_cores)
+        verdict_color = {True: "green", False: "red", None: "gray"}[analysis['verdict']]
+        st.markdown(f"**Analysis:** :{verdict_color}[{describe(analysis)}]")
         
         with st.expander("View Task List"):
-            task_data = [{"ID": t.id, "Type": t.task_type, "C": t.burst_time, "P": t.period, "D": t.deadline} for t in st.session_state.tasks]
+            rt = analysis['response_times']
+            task_data = [{"ID": t.id, "Type": t.task_type, "C": t.burst_time, "P": t.period, "D": t.deadline,
+                          "R (RTA)": ("> D" if rt[t.id] is None else str(rt[t.id])) if t.id in rt else "-"} for t in st.session_state.tasks]
             st.table(task_data)
 
         # --- RUN SIMULATION ---
-        if st.button("▶ START SIMULATION", type="primary", use_container_width=True):
-            with st.spinner("Simulating..."):
-                sim_tasks = copy.deepcopy(st.session_state.tasks)
-                schedule, duration, stats = run_simulation(sim_tasks, algorithm, num_cores)
-                
-                if 'error' in stats:
-                    st.error(stats['error'])
-                else:
-                    # Metrics
-                    m1, m2, m3, m4 = st.columns(4)
-                    m1.metric("Duration", f"{duration} ms")
-                    m2.metric("Missed Deadlines", stats['missed_deadlines'], delta_color="inverse" if stats['missed_deadlines']>0 else "normal")
-                    m3.metric("Total Jobs", stats['total_jobs'])
-                    m4.metric("Aperiodic Done", stats['aperiodic_done'])
-                    
-                    # Chart
-                    fig = draw_gantt(schedule, sim_tasks, duration, num_cores, algorithm)
-                    st.pyplot(fig)
-                    
-                    # Export
-                    report_text = f"Algorithm: {algorithm}\nCores: {num_cores}\nLoad: {u*100:.1f}%\nMisses: {stats['missed_deadlines']}\n"
-                    st.download_button("💾 Download Report (.txt)", report_text, file_name=f"Report_{algorithm.split()[0]}.txt")
-                    
-                    img = io.BytesIO()
-                    fig.savefig(img, format='png')
-                    st.download_button("🖼️ Download Chart (.png)", img, file_name=f"Chart_{algorithm.split()[0]}.png", mime="image/png")
+        skip = st.checkbox("Skip simulation when the analysis decides", value=False)
+        if skip and analysis['verdict'] is not None:
+            st.info(f"Simulation skipped: {describe(analysis)}")
+        else:
+            run_clicked = st.button("▶ START SIMULATION", type="primary", use_container_width=True)
+            if st.session_state.pop('sim_cancelled', False): st.info("Simulation cancelled.")
+            if run_clicked and partition: run_partitioned_view(st.session_state.tasks, algorithm, num_cores, analysis, u, partition)
+            elif run_clicked and profile: run_profiled(st.session_state.tasks, algorithm, num_cores, analysis, u)
+            elif run_clicked: run_streamed(st.session_state.tasks, algorithm, num_cores, analysis, u)
+
+        # --- COMPARE ALL ALGORITHMS (one worker process per policy) ---
+        if st.button("📊 COMPARE ALL ALGORITHMS", use_container_width=True):
+            with st.spinner("Running every algorithm..."):
+                results = compare_algorithms(st.session_state.tasks, num_cores, trace=st.session_state.get('trace_path'))
+            st.dataframe([row for row, _ in results], use_container_width=True, hide_index=True)
+            charts = [(row['algorithm'], png) for row, png in results if png]
+            for i in range(0, len(charts), 3):
+                for col, (name, png) in zip(st.columns(3), charts[i:i + 3]): col.image(png, caption=name, use_container_width=True)
 
     else:
         st.warning("Waiting for tasks...")
@@ -0,0 +1 @@
+# Lets pytest import the rtss package from the repository root
@@ -1,277 +1,54 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog, scrolledtext
-import matplotlib
-matplotlib.use('TkAgg') # KRİTİK: Executable içinde grafik çizimi için şart
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import random
 import os
-import math
-import copy
+import base64
+import multiprocessing
 from datetime import datetime
 
-# =============================================================================
-# 1. DATA STRUCTURES (MODEL)
-# =============================================================================
-
-class Task:
-    def __init__(self, task_type, args, original_char):
-        self.task_type = task_type
-        self.original_char = original_char 
-        self.id = 0 
-        self.color = "" 
-        
-        self.arrival_time = 0 
-        self.burst_time = 0    
-        self.period = 0        
-        self.deadline = 0      
-        self.relative_deadline = 0 
-        
-        self.server_capacity = 0
-        self.current_budget = 0
-        
-        self.parse_args(args)
-
-    def parse_args(self, args):
-        n = len(args)
-        if self.task_type == 'P':
-            if self.original_char == 'P':
-                if n == 4: self.arrival_time, self.burst_time, self.period, self.deadline = args
-                elif n == 3: self.arrival_time, self.burst_time, self.period = args; self.deadline = self.period
-                elif n == 2: self.arrival_time = 0; self.burst_time, self.period = args; self.deadline = self.period
-            elif self.original_char == 'D':
-                if n == 3: self.arrival_time = 0; self.burst_time, self.period, self.deadline = args
-                elif n == 4: self.arrival_time, self.burst_time, self.period, self.deadline = args
-            self.relative_deadline = self.deadline 
-
-        elif self.task_type == 'S': 
-            self.arrival_time = 0
-            self.burst_time = args[0]
-            self.period = args[1]
-            self.deadline = args[1] 
-            self.relative_deadline = self.period
-            self.server_capacity = self.burst_time
-            self.current_budget = self.burst_time 
-            
-        elif self.task_type == 'A': 
-            if n >= 2: 
-                self.arrival_time = args[0]
-                self.burst_time = args[1]
-                self.period = 0 
-                self.deadline = 99999 
-                self.relative_deadline = 99999
-
-    def __repr__(self):
-        return f"T{self.id}"
+from rtss.analysis import analyze, describe
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.cache import ResultCache, parse_cached
+from rtss.compare import compare_algorithms
+from rtss.gantt import DrawThrottle, SegmentStore, WindowedGantt
+from rtss.model import calculate_utilization, generate_smart_random_tasks
+from rtss.partition import analyze_partitions, partition_tasks, run_partitioned
+from rtss.profiling import format_profile, run_instrumented
 
 # =============================================================================
-# 2. LOGIC & SIMULATION
+# 1-2. MODEL, LOGIC & SIMULATION (shared with app.py in the rtss package)
 # =============================================================================
 
-def calculate_lcm(tasks):
-    periods = [t.period for t in tasks if t.period > 0]
-    if not periods: return 100
-    lcm = periods[0]
-    for p in periods[1:]:
-        lcm = abs(lcm * p) // math.gcd(lcm, p)
-    return min(lcm, 2000) 
-
-def calculate_utilization(tasks):
-    u = 0.0
-    for t in tasks:
-        if t.task_type in ['P', 'S'] and t.period > 0:
-            u += t.burst_time / t.period
-    return u
-
-def parse_content(content):
-    tasks = []
-    task_counter = 1
-    lines = content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('#'): continue
-        parts = line.split()
-        if not parts: continue
-        
-        char_code = parts[0].upper()
-        clean_args = []
-        for p in parts[1:]:
-            if p.startswith('('): break 
-            try: clean_args.append(int(p))
-            except ValueError: continue
-        
-        if clean_args:
-            t_type = 'P'
-            if char_code == 'A': t_type = 'A'
-            elif char_code == 'S': t_type = 'S'
-            elif char_code == 'D': t_type = 'P'
-            
-            new_task = Task(t_type, clean_args, char_code)
-            new_task.id = task_counter
-            if t_type == 'S': new_task.color = '#a6e3a1' 
-            elif t_type == 'A': new_task.color = '#fab387' 
-            else: new_task.color = '#89b4fa' 
-            tasks.append(new_task)
-            task_counter += 1
-    return tasks
-
 def parse_file(filepath):
     try:
         with open(filepath, 'r') as f:
             content = f.read()
-        return parse_content(content)
+        return parse_cached(content)
     except Exception as e:
         messagebox.showerror("Error", f"File Error: {e}")
         return []
 
-def generate_smart_random_tasks(total_tasks, num_aperiodic, target_util, include_server):
-    tasks = []
-    current_util_budget = target_util
-    server_task = None
-    
-    if include_server:
-        server_util = min(0.2, current_util_budget * 0.25)
-        current_util_budget -= server_util
-        s_period = random.choice([20, 40, 50])
-        s_cap = max(1, int(s_period * server_util))
-        server_task = Task('S', [s_cap, s_period], 'S')
-        server_task.color = '#a6e3a1'
-    
-    num_periodic = total_tasks - num_aperiodic
-    if include_server: num_periodic -= 1 
-    if num_periodic < 0: num_periodic = 0 
-
-    if num_periodic > 0 and current_util_budget > 0:
-        points = [0.0] + sorted([random.uniform(0, current_util_budget) for _ in range(num_periodic - 1)]) + [current_util_budget]
-        utilizations = [points[i+1] - points[i] for i in range(num_periodic)]
-        periods_pool = [20, 40, 50, 60, 80, 100, 200]
-        for i in range(num_periodic):
-            p = random.choice(periods_pool)
-            u = utilizations[i]
-            c = max(1, int(p * u))
-            if c >= p: c = p - 1
-            t = Task('P', [0, c, p, p], 'P')
-            t.color = '#89b4fa'
-            tasks.append(t)
-            
-    if server_task: tasks.insert(0, server_task) 
-
-    for i in range(num_aperiodic):
-        arrival = random.randint(0, 100)
-        exec_time = random.randint(1, 5)
-        t = Task('A', [arrival, exec_time], 'A')
-        t.color = '#fab387'
-        tasks.append(t)
-        
-    for i, t in enumerate(tasks): t.id = i + 1
-    return tasks
-
-def run_simulation(tasks, algorithm, num_cores):
-    periodic_tasks = [t for t in tasks if t.task_type == 'P']
-    server_task = next((t for t in tasks if t.task_type == 'S'), None)
-    aperiodic_tasks = [t for t in tasks if t.task_type == 'A']
-    
-    if algorithm in ["Poller", "Deferrable Server", "Sporadic Server"] and not server_task:
+# Repeated runs of the same set come from here (RTSS_CACHE_DIR adds a disk tier)
+RESULTS = ResultCache(directory=os.environ.get("RTSS_CACHE_DIR"))
+
+# Multicore modes: global scheduling, or partitioned with a decreasing bin-packing
+# heuristic and the RTA / QPA admission test (see rtss/partition.py)
+PARTITION_MODES = {"Global": None, "Partitioned FFD": "first-fit", "Partitioned BFD": "best-fit", "Partitioned WFD": "worst-fit"}
+
+def analyze_tasks(tasks, algorithm, num_cores, partition=None):
+    if partition: return analyze_partitions(partition_tasks(tasks, num_cores, algorithm, partition, "rta")[0], algorithm)
+    return analyze(tasks, algorithm, num_cores)
+
+# partition: None (global scheduling) or a bin-packing heuristic; partitioned runs bypass the cache
+# profile: instrumented global run (also bypasses the cache), see rtss/profiling.py
+def run_simulation(tasks, algorithm, num_cores, trace=None, partition=None, profile=False, pstats_path=None):
+    if partition: schedule_log, lcm, stats = run_partitioned(tasks, algorithm, num_cores, partition, "rta", trace)
+    elif profile:
+        arrivals = (lambda: read_arrival_trace(trace, next_free_id(tasks))) if trace else None
+        schedule_log, lcm, stats = run_instrumented(tasks, algorithm, num_cores, arrivals, memory=True, pstats_path=pstats_path)
+    else: schedule_log, lcm, stats = RESULTS.run(tasks, algorithm, num_cores, trace)
+    if 'error' in stats:
         messagebox.showwarning("Config Error", f"{algorithm} requires a Server (S) task!\nPlease generate or load a set with a Server.")
         return [], 0, {}
-
-    active_periodic = periodic_tasks[:]
-    if server_task and algorithm != "Background":
-        active_periodic.append(server_task)
-
-    lcm = calculate_lcm(active_periodic) if active_periodic else 100
-    schedule_log = [] 
-    ready_queue = []    
-    aperiodic_queue = [] 
-    sporadic_replenishments = []
-    aperiodic_tasks.sort(key=lambda x: x.arrival_time)
-    ap_index = 0
-    stats = {'total_jobs': 0, 'missed_deadlines': 0, 'aperiodic_done': 0}
-
-    for t in range(lcm):
-        for task in active_periodic:
-            if t >= task.arrival_time and (t - task.arrival_time) % task.period == 0:
-                abs_deadline = t + task.deadline
-                new_job = {'task': task, 'remaining': task.burst_time, 'abs_deadline': abs_deadline}
-                stats['total_jobs'] += 1
-                if task == server_task:
-                    if algorithm == "Deferrable Server":
-                        task.current_budget = task.server_capacity
-                        ready_queue = [j for j in ready_queue if j['task'] != server_task]
-                        new_job['remaining'] = task.current_budget
-                        ready_queue.append(new_job)
-                    elif algorithm == "Sporadic Server":
-                        if task.current_budget > 0:
-                            new_job['remaining'] = task.current_budget
-                            ready_queue = [j for j in ready_queue if j['task'] != server_task]
-                            ready_queue.append(new_job)
-                    else: ready_queue.append(new_job)
-                else: ready_queue.append(new_job)
-
-        if algorithm == "Sporadic Server" and server_task:
-            while sporadic_replenishments and sporadic_replenishments[0][0] <= t:
-                rep_time, amount = sporadic_replenishments.pop(0)
-                server_task.current_budget = min(server_task.server_capacity, server_task.current_budget + amount)
-                server_in_queue = any(j['task'] == server_task for j in ready_queue)
-                if not server_in_queue and server_task.current_budget > 0:
-                    ready_queue.append({'task': server_task, 'remaining': server_task.current_budget, 'abs_deadline': t + server_task.period})
-                elif server_in_queue:
-                    for j in ready_queue:
-                        if j['task'] == server_task: j['remaining'] = server_task.current_budget
-
-        while ap_index < len(aperiodic_tasks) and aperiodic_tasks[ap_index].arrival_time == t:
-            aperiodic_queue.append({'task': aperiodic_tasks[ap_index], 'remaining': aperiodic_tasks[ap_index].burst_time, 'abs_deadline': 99999})
-            ap_index += 1
-
-        if algorithm == "Poller" and server_task:
-             for job in ready_queue:
-                 if job['task'] == server_task:
-                     if not aperiodic_queue: job['remaining'] = 0 
-                     break
-
-        ready_queue = [j for j in ready_queue if j['remaining'] > 0]
-        if algorithm == "Earliest Deadline First (EDF)": ready_queue.sort(key=lambda x: (x['abs_deadline'], x['task'].id))
-        elif algorithm == "Deadline Monotonic (DM)": ready_queue.sort(key=lambda x: (x['task'].relative_deadline, x['task'].id))
-        else: ready_queue.sort(key=lambda x: (x['task'].period if x['task'].period > 0 else 9999, x['task'].id))
-
-        cores_available = num_cores
-        job_index = 0
-        while cores_available > 0 and job_index < len(ready_queue):
-            current_job = ready_queue[job_index]
-            if current_job['task'] == server_task and not aperiodic_queue and algorithm in ["Deferrable Server", "Sporadic Server"]:
-                job_index += 1; continue
-
-            core_id = num_cores - cores_available + 1 
-            label = f"T{current_job['task'].id}"; status = 'OK'
-            
-            if current_job['task'] == server_task and aperiodic_queue and algorithm != "RM Baseline":
-                ap_job = aperiodic_queue[0]
-                label = f"T{ap_job['task'].id}" 
-                ap_job['remaining'] -= 1
-                if ap_job['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
-            elif current_job['task'] == server_task and algorithm != "RM Baseline": label = "" 
-
-            if t >= current_job['abs_deadline']: status = 'MISS'; stats['missed_deadlines'] += 1
-
-            schedule_log.append({'core': core_id, 'time': t, 'duration': 1, 'label': label, 'status': status, 'task_id': current_job['task'].id})
-            current_job['remaining'] -= 1
-            
-            if algorithm == "Sporadic Server" and current_job['task'] == server_task:
-                server_task.current_budget -= 1; sporadic_replenishments.append((t + server_task.period, 1))
-            
-            if current_job['remaining'] == 0: ready_queue.pop(job_index)
-            else: job_index += 1
-            cores_available -= 1
-
-        while cores_available > 0 and algorithm == "Background" and aperiodic_queue:
-            core_id = num_cores - cores_available + 1
-            ap_job = aperiodic_queue[0]
-            schedule_log.append({'core': core_id, 'time': t, 'duration': 1, 'label': f"T{ap_job['task'].id}", 'status': 'OK', 'task_id': ap_job['task'].id})
-            ap_job['remaining'] -= 1
-            if ap_job['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
-            cores_available -= 1
-
     return schedule_log, lcm, stats
 
 def get_algo_short_name(algo_long):
@@ -284,7 +61,7 @@ def get_algo_short_name(algo_long):
     if "Sporadic" in algo_long: return "SS"
     return "Algo"
 
-def export_results(figure, schedule, stats, algorithm, tasks, num_cores, input_filename):
+def export_results(figure, schedule, stats, algorithm, tasks, num_cores, input_filename, partition=None, horizon=None):
     if not schedule: return
     algo_short = get_algo_short_name(algorithm)
     clean_filename = input_filename.replace(".txt", "")
@@ -297,6 +74,10 @@ def export_results(figure, schedule, stats, algorithm, tasks, num_cores, input_f
     txt_path = file_path
     png_path = file_path.replace(".txt", ".png")
     figure.savefig(png_path, dpi=150, bbox_inches='tight')
+    # Full schedule as a binary trace (memory mapped on reload, see rtss.trace)
+    from rtss.trace import save_trace
+    trace_path = file_path.replace(".txt", ".npz")
+    save_trace(trace_path, schedule, tasks, algorithm, num_cores, horizon if horizon is not None else max(seg['end'] for seg in schedule), stats)
     u = calculate_utilization(tasks)
     
     with open(txt_path, "w", encoding="utf-8") as f:
@@ -309,22 +90,26 @@ def export_results(figure, schedule, stats, algorithm, tasks, num_cores, input_f
         f.write(f"Configuration  : {num_cores} Core(s)\n")
         f.write(f"System Load (U): {u*100:.1f}%\n")
         f.write(f"Deadline Misses: {stats['missed_deadlines']}\n")
+        f.write(f"Hyperperiod    : {stats['hyperperiod']} ms{' (simulation truncated)' if stats['truncated'] else ''}\n")
+        f.write(f"Analysis       : {describe(analyze_tasks(tasks, algorithm, num_cores, partition))}\n")
+        f.write(f"Preemptions    : {stats['preemptions']} (migrations: {stats['migrations']})\n")
+        for tid, r in stats['tasks'].items():
+            f.write(f"T{tid} response  : min={r['min_response']} mean={r['mean_response']:.1f} max={r['max_response']} (jitter: release={r['release_jitter']}, finishing={r['finishing_jitter']})\n")
+        ap = stats['aperiodic_response']
+        if ap['count']: f.write(f"Aperiodic resp.: mean={ap['mean']} p50={ap['p50']} p95={ap['p95']} p99={ap['p99']} max={ap['max']}\n")
+        for p in stats.get('partitions', []):
+            f.write(f"Core {p['core']}         : {' '.join(f'T{tid}' for tid in p['tasks'])} (U={p['utilization']}, misses={p['missed_deadlines']})\n")
         f.write("-" * 40 + "\n")
         for t in tasks:
             f.write(f"T{t.id}: Type={t.task_type}, C={t.burst_time}, P={t.period}, D={t.deadline}\n")
             
-    messagebox.showinfo("Export Successful", f"Saved:\n{os.path.basename(txt_path)}")
-
-def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
-    merged_schedule = []
-    raw_schedule.sort(key=lambda x: (x['core'], x['time']))
-    for item in raw_schedule:
-        if not merged_schedule: merged_schedule.append(item); continue
-        last = merged_schedule[-1]
-        if (last['core'] == item['core'] and last['task_id'] == item['task_id'] and last['status'] == item['status'] and last['label'] == item['label'] and last['time'] + last['duration'] == item['time']):
-            last['duration'] += 1 
-        else: merged_schedule.append(item) 
+    messagebox.showinfo("Export Successful", f"Saved:\n{os.path.basename(txt_path)}\n{os.path.basename(png_path)}\n{os.path.basename(trace_path)}")
 
+# store: a prebuilt SegmentStore (e.g. SegmentStore.from_trace), used instead of schedule
+def draw_gantt(schedule, tasks, simulation_time, num_cores, algorithm, store=None):
+    # matplotlib is imported on first use so the module loads without it
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
     is_single_core = (num_cores == 1)
     fig_height = len(tasks) * 0.8 + 2 if is_single_core else num_cores * 1.5 + 2
     y_label = "Tasks" if is_single_core else "Processors (Cores)"
@@ -340,7 +125,7 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     yticks = []
     yticklabels = []
     if is_single_core:
-        tasks.sort(key=lambda x: x.id)
+        tasks = sorted(tasks, key=lambda x: x.id)
         for i, task in enumerate(tasks):
             y_pos = 10 * (i + 1)
             yticks.append(y_pos)
@@ -355,19 +140,9 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     gnt.set_yticks(yticks)
     gnt.set_yticklabels(yticklabels, fontsize=10)
 
-    bar_patches = [] 
-    for job in merged_schedule:
-        task = next((t for t in tasks if t.id == job['task_id']), None)
-        color = task.color if task else 'gray'
-        if job['status'] == 'MISS': color = '#f38ba8' 
-        y_pos = 10 * (next((i for i, t in enumerate(tasks) if t.id == job['task_id']), 0) + 1) if is_single_core else 10 * job['core']
-        gnt.broken_barh([(job['time'], job['duration'])], (y_pos - 4, 8), facecolors=color, edgecolors='black', linewidth=0.5)
-        
-        bbox = [job['time'], y_pos - 4, job['time'] + job['duration'], y_pos + 4] 
-        info = f"Task: {job['label']}\nStart: {job['time']}\nDur: {job['duration']}\nStatus: {job['status']}"
-        bar_patches.append((bbox, info))
-        if job['label'] and job['duration'] > 1:
-            plt.text(job['time'] + job['duration']/2, y_pos, job['label'], ha='center', va='center', color='white', fontsize=8, fontweight='bold')
+    # Only the visible time range is drawn; kept alive with the figure
+    if store is None: store = SegmentStore(schedule, tasks, num_cores)
+    fig.gantt_view = view = WindowedGantt(gnt, store, simulation_time)
 
     patches = [mpatches.Patch(color='#89b4fa', label='Periodic Task'), mpatches.Patch(color='#a6e3a1', label='Server Task'), mpatches.Patch(color='#fab387', label='Aperiodic Job'), mpatches.Patch(color='#f38ba8', label='Deadline Miss')]
     plt.legend(handles=patches, loc='upper right', frameon=True, fancybox=True, shadow=True)
@@ -376,40 +151,116 @@ def draw_gantt(raw_schedule, tasks, simulation_time, num_cores, algorithm):
     annot = gnt.annotate("", xy=(0,0), xytext=(20,20),textcoords="offset points", bbox=dict(boxstyle="round", fc="#313244", ec="black", alpha=0.9), arrowprops=dict(arrowstyle="->", color="black"))
     annot.set_visible(False); annot.set_color("white")
 
+    throttle = DrawThrottle(fig.canvas)
+    shown = [None]  # bar under the tooltip
+
     def hover(event):
-        vis = annot.get_visible()
-        if event.inaxes == gnt:
-            found = False
-            for bbox, text in bar_patches:
-                if bbox[0] <= event.xdata <= bbox[2] and bbox[1] <= event.ydata <= bbox[3]:
-                    annot.xy = (event.xdata, event.ydata); annot.set_text(text); annot.set_visible(True); fig.canvas.draw_idle(); found = True; break
-            if not found and vis: annot.set_visible(False); fig.canvas.draw_idle()
+        bar = store.find(event.xdata, event.ydata) if event.inaxes == gnt else None
+        if bar is None:
+            if shown[0] is not None: shown[0] = None; annot.set_visible(False); throttle.request(force=True)
+            return
+        annot.xy = (event.xdata, event.ydata)
+        if bar != shown[0]:  # find() builds a fresh tuple per call
+            start, end, job = bar
+            annot.set_text(f"Task: {job['label']}\nStart: {start}\nDur: {end - start}\nStatus: {job['status']}")
+            annot.set_visible(True); shown[0] = bar
+            throttle.request(force=True)
+        else: throttle.request()
+
+    def wheel(event):
+        if event.inaxes != gnt: return
+        view.zoom(event.xdata, 1.25 if event.button == 'up' else 0.8)
+        throttle.request(force=True)
 
     fig.canvas.mpl_connect("motion_notify_event", hover)
+    fig.canvas.mpl_connect("scroll_event", wheel)
     plt.tight_layout()
     return fig
 
 # --- NEW: RESULT WINDOW TO REPLACE PLT.SHOW (EMBEDDED) ---
-def show_result_window(fig, algorithm):
+def summarize_stats(stats, duration):
+    # Result window lines after the headline: horizon, preemptions, aperiodic response, partitions
+    summary = ""
+    if stats['truncated']: summary += f"  |  ⚠️ cut at {duration} ms (H = {stats['hyperperiod']} ms)"
+    elif stats['steady_state']: summary += f"  |  repeats every {stats['hyperperiod']} ms"
+    ap = stats['aperiodic_response']
+    summary += f"\nPreemptions: {stats['preemptions']}  |  Migrations: {stats['migrations']}"
+    if ap['count']: summary += f"  |  Aperiodic response: mean {ap['mean']:.1f}, p95 {ap['p95']:.1f}, max {ap['max']} ms"
+    if stats.get('partitions'): summary += "\n" + "  |  ".join(f"Core {p['core']}: {' '.join(f'T{tid}' for tid in p['tasks'])}" for p in stats['partitions'])
+    if stats.get('unassigned'): summary += f"  |  ⚠️ did not fit: {' '.join(f'T{tid}' for tid in stats['unassigned'])}"
+    return summary
+
+def show_result_window(fig, algorithm, summary=None):
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
     result_win = tk.Toplevel()
     result_win.title(f"Simulation Result: {algorithm}")
     result_win.geometry("1000x700")
+    if summary: tk.Label(result_win, text=summary, font=("Consolas", 11), anchor="w").pack(fill="x", padx=10, pady=5)
     
     # Embedding the Plot
     canvas = FigureCanvasTkAgg(fig, master=result_win)
     canvas.draw()
     canvas.get_tk_widget().pack(fill="both", expand=True)
     
+    # Horizontal scrollbar over the simulated time range (mouse wheel zooms)
+    view = getattr(fig, 'gantt_view', None)
+    if view is not None:
+        def scroll(*args):
+            lo, hi = view.span()
+            if args[0] == 'moveto': view.pan_to(float(args[1]))
+            else: view.pan_to(lo + int(args[1]) * (hi - lo) * (0.9 if args[2] == 'pages' else 0.1))
+            canvas.draw_idle()
+        xbar = ttk.Scrollbar(result_win, orient="horizontal", command=scroll)
+        xbar.pack(fill="x", side="bottom"); xbar.set(*view.span())
+        view.ax.callbacks.connect('xlim_changed', lambda ax: xbar.set(*view.span()))
+
     # Adding Toolbar
     toolbar = NavigationToolbar2Tk(canvas, result_win)
     toolbar.update()
     canvas.get_tk_widget().pack(fill="both", expand=True)
 
+def show_profile_window(profile, algorithm, save_pstats):
+    # Phase timings of one instrumented run; save_pstats(path) reruns it under cProfile
+    win = tk.Toplevel()
+    win.title(f"Engine Profile: {algorithm}")
+    win.geometry("620x360")
+    text = scrolledtext.ScrolledText(win, font=("Consolas", 10), height=14)
+    text.insert(tk.END, format_profile(profile)); text.config(state="disabled")
+    text.pack(fill="both", expand=True, padx=10, pady=10)
+    def save():
+        path = filedialog.asksaveasfilename(defaultextension=".pstats", initialfile=f"{get_algo_short_name(algorithm)}.pstats", filetypes=[("cProfile dump", "*.pstats")], title="Save cProfile Dump")
+        if path: save_pstats(path); messagebox.showinfo("Profile Saved", f"Saved:\n{os.path.basename(path)}\n(open with python -m pstats)", parent=win)
+    ttk.Button(win, text="💾 Save cProfile dump (.pstats)", command=save).pack(pady=(0, 10))
+
+def show_compare_window(results, num_cores):
+    # Summary table on top, one small Gantt chart per algorithm below (3 per row)
+    win = tk.Toplevel()
+    win.title(f"Algorithm Comparison ({num_cores} Core(s))")
+    win.geometry("1200x800")
+    cols = ("Algorithm", "Misses", "Aperiodic Done", "Avg Ap. Resp.", "Worst Resp.", "Analysis")
+    tree = ttk.Treeview(win, columns=cols, show='headings', height=len(results))
+    for col in cols: tree.heading(col, text=col); tree.column(col, width=150 if col in ("Algorithm", "Analysis") else 100, anchor="center")
+    for row, _ in results:
+        if 'error' in row: tree.insert("", "end", values=(row['algorithm'], "-", "-", "-", "-", row['error']))
+        else: tree.insert("", "end", values=(row['algorithm'], row['missed_deadlines'], row['aperiodic_done'], row['avg_aperiodic_response'] if row['avg_aperiodic_response'] is not None else "-", row['worst_response'] if row['worst_response'] is not None else "-", row['analysis']))
+    tree.pack(fill="x", padx=10, pady=10)
+
+    canvas = tk.Canvas(win); scroll = ttk.Scrollbar(win, orient="vertical", command=canvas.yview)
+    grid = tk.Frame(canvas); canvas.create_window((0, 0), window=grid, anchor="nw"); canvas.configure(yscrollcommand=scroll.set)
+    grid.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    scroll.pack(side="right", fill="y"); canvas.pack(fill="both", expand=True)
+    win.images = []
+    for i, (row, png) in enumerate(r for r in results if r[1]):
+        img = tk.PhotoImage(data=base64.b64encode(png)); win.images.append(img)
+        tk.Label(grid, image=img).grid(row=i // 3, column=i % 3, padx=4, pady=4)
+
 # =============================================================================
 # 5. UI (MODERN FLAT V4)
 # =============================================================================
 
 def main_app():
+    import matplotlib
+    matplotlib.use('TkAgg') # KRİTİK: Executable içinde grafik çizimi için şart
     root = tk.Tk()
     root.title("RTSS Simulator - ITU Platinum")
     root.geometry("700x820")
@@ -433,7 +284,7 @@ def main_app():
 
     main_frame = ttk.Frame(root, padding="30"); main_frame.pack(expand=True, fill="both")
     ttk.Label(main_frame, text="Real-Time Scheduling Simulator", style="Header.TLabel").pack(pady=(0, 25))
-    data_store = {"tasks": [], "last_schedule": None, "last_fig": None, "last_algo": "", "filename": "Unknown"}
+    data_store = {"tasks": [], "last_schedule": None, "last_fig": None, "last_algo": "", "filename": "Unknown", "trace": None}
 
     card_input = ttk.Frame(main_frame, style="Card.TFrame", padding="20"); card_input.pack(fill="x", pady=(0, 20))
     ttk.Label(card_input, text="1. System Input", font=("Helvetica Neue", 12, "bold"), foreground=ACCENT_ORANGE).pack(anchor="w", pady=(0, 15))
@@ -447,7 +298,7 @@ def main_app():
     
     def reset_app():
         data_store["tasks"] = []
-        data_store["last_schedule"] = None
+        data_store["last_schedule"] = None; data_store["trace"] = None
         file_status_lbl.config(text="No file loaded", foreground="#6c7086")
         btn_export.config(state="disabled"); btn_view.config(state="disabled")
         update_status_bar()
@@ -457,7 +308,7 @@ def main_app():
         num_cores = int(core_spin.get()); raw_u = calculate_utilization(data_store["tasks"])
         load_pct = raw_u * 100; capacity_pct = num_cores * 100.0
         is_overload = raw_u > num_cores
-        status_text = f"System Load: {load_pct:.1f}% (Capacity: {capacity_pct:.0f}%)"
+        status_text = f"System Load: {load_pct:.1f}% (Capacity: {capacity_pct:.0f}%) | Analysis: {describe(analyze_tasks(data_store['tasks'], algo_combo.get(), num_cores, PARTITION_MODES[mode_combo.get()]))}"
         if is_overload: util_bar.config(text=f"⚠️ {status_text} - OVERLOAD", background=ACCENT_RED, foreground="#11111b")
         else: util_bar.config(text=f"✅ {status_text} - SAFE", background=ACCENT_GREEN, foreground="#11111b")
 
@@ -484,6 +335,12 @@ def main_app():
                 update_status_bar(); btn_export.config(state="disabled"); btn_view.config(state="normal")
             else: messagebox.showerror("Error", "Invalid file!")
 
+    def load_trace():
+        fp = filedialog.askopenfilename(filetypes=[("Arrival Trace", "*.npy *.txt"), ("All Files", "*.*")])
+        if fp:
+            data_store["trace"] = fp
+            file_status_lbl.config(text=f"{file_status_lbl.cget('text')} + trace: {os.path.basename(fp)}", foreground=ACCENT_GREEN)
+
     def open_creator():
         creator_win = tk.Toplevel(root); creator_win.title("Task Set Creator"); creator_win.geometry("600x550"); creator_win.configure(bg=BG_COLOR)
         tab_control = ttk.Notebook(creator_win)
@@ -519,7 +376,7 @@ A 12 2
         txt_edit.insert(tk.INSERT, template)
         
         def save_manual():
-            content = txt_edit.get("1.0", tk.END); tasks = parse_content(content)
+            content = txt_edit.get("1.0", tk.END); tasks = parse_cached(content)
             if tasks:
                 f = filedialog.asksaveasfilename(defaultextension=".txt", initialfile="manual_task_set", title="Save Task File")
                 if f:
@@ -568,6 +425,8 @@ A 12 2
     create_tooltip(btn_create, "Create new task set (Manual or Random)")
     btn_view = ttk.Button(btn_frame, text="📋 List", style="Action.TButton", command=view_tasks, state="disabled"); btn_view.pack(side="left", padx=5)
     create_tooltip(btn_view, "View detailed table of current tasks")
+    btn_trace = ttk.Button(btn_frame, text="⏱ Trace", style="Action.TButton", command=load_trace); btn_trace.pack(side="left", padx=5)
+    create_tooltip(btn_trace, "Attach a recorded aperiodic arrival trace (.npy or .txt), streamed during the run")
     btn_reset = ttk.Button(btn_frame, text="❌ Reset", style="Action.TButton", command=reset_app); btn_reset.pack(side="left", padx=5)
     create_tooltip(btn_reset, "Clear all data and reset system")
 
@@ -583,6 +442,16 @@ A 12 2
     algos = ["Rate Monotonic (RM)", "Deadline Monotonic (DM)", "Earliest Deadline First (EDF)", "Background", "Poller", "Deferrable Server", "Sporadic Server", "RM Baseline"]
     algo_combo = ttk.Combobox(grid_frame, values=algos, state="readonly", font=("Helvetica Neue", 11), width=25)
     algo_combo.current(0); algo_combo.grid(row=0, column=3, sticky="w", padx=10)
+    algo_combo.bind("<<ComboboxSelected>>", lambda e: update_status_bar())
+    ttk.Label(grid_frame, text="Multicore:").grid(row=1, column=0, sticky="w", pady=5)
+    mode_combo = ttk.Combobox(grid_frame, values=list(PARTITION_MODES), state="readonly", font=("Helvetica Neue", 11), width=16)
+    mode_combo.current(0); mode_combo.grid(row=1, column=1, columnspan=2, sticky="w", padx=(10, 30))
+    mode_combo.bind("<<ComboboxSelected>>", lambda e: update_status_bar())
+    create_tooltip(mode_combo, "Global: one ready queue for all cores. Partitioned: tasks bound to cores (first/best/worst-fit decreasing)")
+    profile_var = tk.BooleanVar(value=False)
+    profile_check = tk.Checkbutton(grid_frame, text="Profile engine", variable=profile_var, bg=CARD_BG, fg=TEXT_COLOR, selectcolor="#45475a", activebackground=CARD_BG)
+    profile_check.grid(row=1, column=3, sticky="w", padx=10)
+    create_tooltip(profile_check, "Time every engine phase (global runs): events/s, peak ready queue, allocations, cProfile dump")
 
     status_frame = ttk.Frame(main_frame, style="TFrame", padding=(0, 10)); status_frame.pack(fill="x")
     util_bar = ttk.Label(status_frame, text="System Load: 0.0% (Waiting)", font=("Consolas", 11), background="#45475a", foreground=TEXT_COLOR, padding=10); util_bar.pack(fill="x")
@@ -591,23 +460,66 @@ A 12 2
     
     def run_sim():
         if not data_store["tasks"]: messagebox.showwarning("Wait", "Please load tasks first."); return
-        sim_tasks = copy.deepcopy(data_store["tasks"])
-        selected_algo = algo_combo.get(); num_cores = int(core_spin.get())
-        schedule, duration, stats = run_simulation(sim_tasks, selected_algo, num_cores)
+        sim_tasks = data_store["tasks"]
+        selected_algo = algo_combo.get(); num_cores = int(core_spin.get()); partition = PARTITION_MODES[mode_combo.get()]
+        profile = profile_var.get() and not partition; trace = data_store["trace"]
+        try: schedule, duration, stats = run_simulation(sim_tasks, selected_algo, num_cores, trace, partition, profile)
+        except (OSError, ValueError) as e: messagebox.showerror("Trace Error", str(e)); return
         if duration > 0:
             fig = draw_gantt(schedule, sim_tasks, duration, num_cores, selected_algo)
             data_store["last_schedule"] = schedule; data_store["last_stats"] = stats; data_store["last_fig"] = fig; data_store["last_algo"] = selected_algo
+            data_store["last_partition"] = partition; data_store["last_horizon"] = duration
             btn_export.config(state="normal")
-            show_result_window(fig, selected_algo)
+            summary = f"Simulated misses: {stats['missed_deadlines']}  |  Analysis: {describe(analyze_tasks(sim_tasks, selected_algo, num_cores, partition))}"
+            show_result_window(fig, selected_algo, summary + summarize_stats(stats, duration))
+            if profile: show_profile_window(stats['profile'], selected_algo, lambda path: run_simulation(sim_tasks, selected_algo, num_cores, trace, profile=True, pstats_path=path))
+
+    def replay_trace():
+        # A saved run straight into the Gantt viewer: indexed from the memory-mapped columns, nothing is re-simulated
+        fp = filedialog.askopenfilename(filetypes=[("Schedule Trace", "*.npz")], title="Open Schedule Trace")
+        if not fp: return
+        from rtss.trace import open_trace
+        try: trace = open_trace(fp)
+        except (OSError, ValueError) as e: messagebox.showerror("Trace Error", str(e)); return
+        stats = trace.stats
+        fig = draw_gantt(None, trace.tasks, trace.horizon, trace.num_cores, trace.algorithm, store=SegmentStore.from_trace(trace))
+        summary = f"Replay of {os.path.basename(fp)} ({len(trace)} segments, {trace.num_cores} core(s))  |  Misses: {stats['missed_deadlines']}"
+        show_result_window(fig, f"{trace.algorithm} (replay)", summary + summarize_stats(stats, trace.horizon))
+
+    def compare_all():
+        if not data_store["tasks"]: messagebox.showwarning("Wait", "Please load tasks first."); return
+        num_cores = int(core_spin.get())
+        root.config(cursor="watch"); root.update_idletasks()
+        try: results = compare_algorithms(data_store["tasks"], num_cores, trace=data_store["trace"])
+        except (OSError, ValueError) as e: messagebox.showerror("Trace Error", str(e)); return
+        finally: root.config(cursor="")
+        show_compare_window(results, num_cores)
+
+    def analyze_only():
+        # Analytical verdict without simulating; response times when RTA ran
+        if not data_store["tasks"]: messagebox.showwarning("Wait", "Please load tasks first."); return
+        selected_algo = algo_combo.get(); num_cores = int(core_spin.get())
+        result = analyze_tasks(data_store["tasks"], selected_algo, num_cores, PARTITION_MODES[mode_combo.get()])
+        lines = [f"{selected_algo}, {num_cores} core(s): {describe(result)}", ""]
+        lines += [f"{name}: {describe({'verdict': v, 'test': None})}" for name, v in result['tests'].items()]
+        if result['response_times']:
+            lines += [""] + [f"T{tid}: R = {r if r is not None else '> D'}" for tid, r in result['response_times'].items()]
+        messagebox.showinfo("Schedulability Analysis", "\n".join(lines))
 
     def export_data():
         if not data_store["last_schedule"]: return
         num_cores = int(core_spin.get())
-        export_results(data_store["last_fig"], data_store["last_schedule"], data_store["last_stats"], data_store["last_algo"], data_store["tasks"], num_cores, data_store["filename"])
+        export_results(data_store["last_fig"], data_store["last_schedule"], data_store["last_stats"], data_store["last_algo"], data_store["tasks"], num_cores, data_store["filename"], data_store.get("last_partition"), data_store.get("last_horizon"))
 
     btn_run = ttk.Button(action_frame, text="▶ START SIMULATION", style="Action.TButton", command=run_sim); btn_run.pack(side="left", fill="x", expand=True, ipady=10, padx=(0, 10))
+    btn_analyze = ttk.Button(action_frame, text="🧮 Analyze", style="Action.TButton", command=analyze_only); btn_analyze.pack(side="left", ipady=10, padx=(0, 10))
+    create_tooltip(btn_analyze, "Analytical verdict (RTA / QPA / bounds) without simulating")
+    btn_compare = ttk.Button(action_frame, text="📊 Compare", style="Action.TButton", command=compare_all); btn_compare.pack(side="left", ipady=10, padx=(0, 10))
+    create_tooltip(btn_compare, "Run every algorithm in parallel and compare them side by side")
     btn_export = ttk.Button(action_frame, text="💾 Export Report", style="Action.TButton", command=export_data, state="disabled"); btn_export.pack(side="right", fill="x", expand=True, ipady=10, padx=(10, 0))
-    create_tooltip(btn_export, "Saves Chart (.png) and Report (.txt)")
+    create_tooltip(btn_export, "Saves Chart (.png), Report (.txt) and the schedule trace (.npz)")
+    btn_replay = ttk.Button(action_frame, text="🎞 Replay", style="Action.TButton", command=replay_trace); btn_replay.pack(side="right", ipady=10, padx=(10, 0))
+    create_tooltip(btn_replay, "Open an exported schedule trace (.npz) and view it without simulating")
 
     legend_frame = ttk.Frame(main_frame, style="TFrame"); legend_frame.pack(side="bottom", fill="x", pady=20)
     def add_legend_item(parent, color, text):
@@ -619,4 +531,5 @@ A 12 2
     root.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # worker processes of the packaged executables
     main_app()
\ No newline at end of file
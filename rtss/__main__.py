@@ -0,0 +1,5 @@
+import sys
+
+from rtss.cli import main
+
+sys.exit(main())
@@ -0,0 +1,187 @@
+import math
+from fractions import Fraction
+
+from rtss.engine import SERVER_ALGORITHMS
+from rtss.ready_queue import LLF
+
+# =============================================================================
+# ANALYTICAL SCHEDULABILITY TESTS
+# =============================================================================
+# Verdicts for the periodic part of a task set without simulating it. Every
+# test answers True (no deadline is ever missed), False (some deadline is
+# missed) or None (the test cannot tell). analyze() runs the tests that are
+# valid for the engine's policy and core count, cheapest first:
+#   any policy        : C > D, U > m (necessary), n <= m (trivially schedulable)
+#   1 core, fixed prio: Liu-Layland and hyperbolic bounds, response-time analysis
+#   1 core, EDF / LLF : processor-demand analysis (QPA)
+#   m cores (global)  : GFB for EDF, the Bertogna-Cirinei-Lipari bound for RM/DM
+# The exact tests assume synchronous releases. With offsets synchronous release
+# is still the worst case, so True stands, but False is weakened to None.
+# Aperiodic requests never delay periodic jobs (they only run in server budget
+# or idle time). The server is a periodic task for the classic policies; for
+# Poller and Sporadic Server it is an upper bound on the interference it causes
+# (the Sporadic Server never uses more than C in any window of T), and the
+# Deferrable Server adds release jitter T - C (back-to-back execution).
+
+EDF = "Earliest Deadline First (EDF)"
+DM = "Deadline Monotonic (DM)"
+MAX_ITERATIONS = 100000
+
+
+def _rows(tasks, algorithm):
+    # One row per periodic stream, in the engine's fixed-priority order.
+    # check: its deadlines count; firm: it always executes its full C
+    rows = []
+    for t in tasks:
+        if t.task_type == 'P' and t.period > 0:
+            rows.append({'task': t, 'C': t.burst_time, 'T': t.period, 'D': t.deadline, 'J': 0, 'check': True, 'firm': True})
+        elif t.task_type == 'S' and t.period > 0 and algorithm != "Background":
+            row = {'task': t, 'C': t.burst_time, 'T': t.period, 'D': t.deadline, 'J': 0, 'check': True, 'firm': True}
+            if algorithm in SERVER_ALGORITHMS:
+                # Poller jobs can still be late; DS/SS jobs are replaced before their deadline
+                row['firm'] = False; row['check'] = algorithm == "Poller"
+                if algorithm == "Deferrable Server": row['J'] = t.period - t.burst_time
+            rows.append(row)
+    if algorithm == DM: rows.sort(key=lambda r: (r['task'].relative_deadline, r['task'].id))
+    else: rows.sort(key=lambda r: (r['T'], r['task'].id))
+    return rows
+
+
+def liu_layland_bound(n):
+    return n * (2 ** (1 / n) - 1) if n else 1.0
+
+
+def liu_layland_test(rows):
+    # RM, implicit deadlines: sufficient only
+    u = sum(Fraction(r['C'], r['T']) for r in rows)
+    return True if u <= liu_layland_bound(len(rows)) else None
+
+
+def hyperbolic_test(rows):
+    # RM, implicit deadlines (Bini-Buttazzo): prod(u_i + 1) <= 2, sufficient only
+    p = 1
+    for r in rows: p *= 1 + Fraction(r['C'], r['T'])
+    return True if p <= 2 else None
+
+
+def response_times(rows):
+    # Worst-case response time of every checked row (None once it exceeds D):
+    # R = C_i + sum over higher priority j of ceil((R + J_j) / T_j) * C_j
+    result = {}
+    for i, r in enumerate(rows):
+        if not r['check']: continue
+        hp = rows[:i]
+        resp = r['C'] + sum(h['C'] for h in hp)
+        while resp <= r['D']:
+            nxt = r['C'] + sum(-(-(resp + h['J']) // h['T']) * h['C'] for h in hp)
+            if nxt == resp: break
+            resp = nxt
+        result[r['task'].id] = resp if resp <= r['D'] else None
+    return result
+
+
+def rta_test(rows, exact):
+    times = response_times(rows)
+    if all(v is not None for v in times.values()): return True, times
+    return (False if exact else None), times
+
+
+def _demand(rows, t):
+    return sum(((t - r['D']) // r['T'] + 1) * r['C'] for r in rows if r['D'] <= t)
+
+
+def _last_deadline_before(rows, t):
+    d = None
+    for r in rows:
+        if r['D'] < t:
+            k = (t - r['D'] - 1) // r['T']
+            d = max(d or 0, k * r['T'] + r['D'])
+    return d
+
+
+def busy_period(rows):
+    w = sum(r['C'] for r in rows)
+    for _ in range(MAX_ITERATIONS):
+        nxt = sum(-(-w // r['T']) * r['C'] for r in rows)
+        if nxt == w: return w
+        w = nxt
+    return None
+
+
+def qpa_test(rows, exact):
+    # Quick Processor-demand Analysis (Zhang-Burns): checks h(t) <= t only at
+    # the absolute deadlines QPA walks through, from the bound L downwards
+    if not rows: return True
+    u = sum(Fraction(r['C'], r['T']) for r in rows)
+    if u > 1: return False if exact else None
+    bound = busy_period(rows)
+    if u < 1:
+        la = max(max(r['D'] for r in rows), math.ceil(sum((r['T'] - r['D']) * Fraction(r['C'], r['T']) for r in rows) / (1 - u)))
+        bound = la if bound is None else min(bound, la)
+    if bound is None: return None
+    d_min = min(r['D'] for r in rows)
+    t = _last_deadline_before(rows, bound + 1)
+    while t is not None:
+        h = _demand(rows, t)
+        if h > t: return False if exact else None
+        if h <= d_min: return True
+        t = h if h < t else _last_deadline_before(rows, t)
+    return True
+
+
+def gfb_test(rows, m):
+    # Global EDF (Goossens-Funk-Baruah, densities): sum(d) <= m - (m - 1) * max(d)
+    dens = [Fraction(r['C'], min(r['D'], r['T'])) for r in rows]
+    return True if sum(dens) <= m - (m - 1) * max(dens) else None
+
+
+def bcl_test(rows, m):
+    # Global DM / RM with implicit deadlines (Bertogna-Cirinei-Lipari):
+    # sum(d) <= m / 2 * (1 - max(d)) + max(d)
+    dens = [Fraction(r['C'], min(r['D'], r['T'])) for r in rows]
+    return True if sum(dens) <= Fraction(m, 2) * (1 - max(dens)) + max(dens) else None
+
+
+# Returns {'verdict', 'test', 'utilization', 'tests': {name: verdict}, 'response_times': {task id: R}}
+# verdict: True / False / None (undecided, simulate to find out)
+def analyze(tasks, algorithm, num_cores):
+    rows = _rows(tasks, algorithm)
+    firm = [r for r in rows if r['firm']]
+    synchronous = all(r['task'].arrival_time == 0 for r in rows)
+    exact = synchronous and all(r['firm'] and r['J'] == 0 for r in rows)
+    constrained = all(r['D'] <= r['T'] for r in rows)
+    result = {'verdict': None, 'test': None, 'utilization': float(sum(Fraction(r['C'], r['T']) for r in rows)),
+              'tests': {}, 'response_times': {}}
+
+    def decide(name, verdict):
+        result['tests'][name] = verdict
+        if verdict is not None and result['verdict'] is None:
+            result['verdict'] = verdict; result['test'] = name
+        return verdict is not None
+
+    if any(r['C'] > r['D'] for r in firm) and decide("C > D", False): return result
+    if sum(Fraction(r['C'], r['T']) for r in firm) > num_cores and decide("U > m", False): return result
+    if not rows: decide("no periodic load", True); return result
+    if constrained and len(rows) <= num_cores and all(r['C'] <= r['D'] for r in rows) and decide("n <= m", True): return result
+    if not constrained: return result
+
+    fixed_priority = algorithm not in (EDF, LLF)
+    implicit = all(r['D'] == r['T'] for r in rows) and not any(r['J'] for r in rows)
+    if num_cores == 1:
+        if fixed_priority:
+            if implicit:
+                decide("Liu-Layland", liu_layland_test(rows))
+                decide("Hyperbolic", hyperbolic_test(rows))
+            verdict, result['response_times'] = rta_test(rows, exact)
+            decide("RTA", verdict)
+        else:
+            decide("QPA", qpa_test(rows, exact))
+    elif not any(r['J'] for r in rows) and algorithm != "Sporadic Server":
+        if algorithm == EDF: decide("GFB", gfb_test(rows, num_cores))
+        elif algorithm == DM or (fixed_priority and implicit): decide("BCL", bcl_test(rows, num_cores))
+    return result
+
+
+def describe(result):
+    verdict = {True: "schedulable", False: "NOT schedulable", None: "undecided"}[result['verdict']]
+    return f"{verdict} ({result['test']})" if result['test'] else verdict
@@ -0,0 +1,83 @@
+import heapq
+
+from rtss.model import APERIODIC_COLOR
+
+# =============================================================================
+# APERIODIC ARRIVAL SOURCES
+# =============================================================================
+# The engine pulls aperiodic requests lazily, in arrival order, only when the
+# simulated time reaches them. A source is any iterable of objects with id,
+# arrival_time and burst_time (Task works, Arrival is the compact version used
+# for long recorded traces). Supported trace files:
+#   .txt / other : one request per line, "A r e" or "r e" ('#' comments allowed)
+#   .npy         : int array of shape (N, 2) = (arrival, exec), memory mapped
+
+CHUNK_ROWS = 65536
+
+
+class Arrival:
+    __slots__ = ('id', 'arrival_time', 'burst_time')
+    task_type = 'A'
+    color = APERIODIC_COLOR
+
+    def __init__(self, id, arrival_time, burst_time):
+        self.id = id
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+
+    def __repr__(self):
+        return f"T{self.id}"
+
+
+def task_arrivals(tasks):
+    # The 'A' lines of a task set, in arrival order
+    return sorted((t for t in tasks if t.task_type == 'A'), key=lambda x: x.arrival_time)
+
+
+def merge_arrivals(*sources):
+    # Lazily merges sorted sources; on equal times earlier sources come first
+    return heapq.merge(*sources, key=lambda x: x.arrival_time)
+
+
+def next_free_id(tasks):
+    return max((t.id for t in tasks), default=0) + 1
+
+
+def _text_rows(path):
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].split()
+            if line and line[0].upper() == 'A': line = line[1:]
+            if len(line) < 2: continue
+            try: yield int(line[0]), int(line[1])
+            except ValueError: continue
+
+
+def _npy_rows(path):
+    import numpy as np
+    data = np.load(path, mmap_mode='r')
+    for start in range(0, data.shape[0], CHUNK_ROWS):
+        yield from map(tuple, data[start:start + CHUNK_ROWS].tolist())
+
+
+def read_arrival_trace(path, first_id=1):
+    rows = _npy_rows(path) if str(path).endswith('.npy') else _text_rows(path)
+    last = None
+    for i, (arrival, exec_time) in enumerate(rows):
+        if last is not None and arrival < last:
+            raise ValueError(f"{path}: arrivals must be sorted by time (row {i + 1}: {arrival} < {last})")
+        last = arrival
+        yield Arrival(first_id + i, arrival, exec_time)
+
+
+def write_arrival_trace(path, rows):
+    # rows: iterable of (arrival, exec) pairs, written in chunks to a .npy file
+    import numpy as np
+    from rtss.npy_stream import NpyStreamWriter
+    with NpyStreamWriter(path, np.int64, (2,)) as writer:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == CHUNK_ROWS: writer.write(chunk); chunk = []
+        if chunk: writer.write(chunk)
+        return writer.count
@@ -0,0 +1,192 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+from rtss.engine import ALGORITHMS, SERVER_ALGORITHMS, run_simulation
+from rtss.model import parse_content
+
+# =============================================================================
+# BENCHMARK SUITE
+# =============================================================================
+# Times the three user-facing stages on the bundled samples and on synthetic
+# sweeps, and compares the numbers against a stored baseline:
+#   sample/<file>/parse                    parse_content on the file text
+#   sample/<file>/<algorithm>/<cores>      run_simulation
+#   sample/<file>/<algorithm>/<cores>/draw the desktop Gantt view (SegmentStore +
+#                                          WindowedGantt) drawn once on an Agg canvas
+#   tasks/<n>, horizon/<ms>, cores/<m>     synthetic sweeps (rtss.generator,
+#   algorithm/<name>                       log-uniform periods, so max_horizon
+#                                          sets the horizon)
+# Every case keeps the best of `repeat` runs (the least disturbed one). A case
+# is a regression when it is slower than the baseline by more than tolerance
+# (relative) *and* min_delta seconds (absolute), so sub-millisecond noise on
+# the small cases does not trip it. Baselines are machine-specific: record one
+# with --save-baseline on the machine that will run the comparisons.
+
+SAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test_sample")
+SAMPLE_CORES = (1, 4)
+SERVER = (5, 50)
+SWEEPS = {
+    # name: (task counts, horizons, core counts)
+    "quick": ([10, 100, 1000], [1000, 10000, 100000], [1, 4, 16]),
+    "full": ([10, 100, 1000, 10000], [1000, 10000, 100000, 1000000], [1, 2, 4, 8, 16, 32, 64]),
+}
+
+
+def best_of(repeat, fn, *args):
+    # (best wall-clock seconds, result of the last call)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def draw_view(schedule, tasks, horizon, num_cores):
+    # The work behind main.draw_gantt, without Tk
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from rtss.gantt import SegmentStore, WindowedGantt
+    rows = len(tasks) if num_cores == 1 else num_cores
+    fig = Figure(figsize=(14, min(rows, 40) * 0.8 + 2), dpi=80)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_ylim(0, 10 * (rows + 1)); ax.set_xlim(0, max(horizon, 1))
+    view = WindowedGantt(ax, SegmentStore(schedule, tasks, num_cores), horizon)
+    canvas.draw()
+    return view
+
+
+def _case(name, seconds, **info):
+    return dict({'name': name, 'seconds': round(seconds, 6)}, **info)
+
+
+def _simulate(name, tasks, algorithm, cores, max_horizon, repeat, arrivals=None):
+    seconds, (schedule, horizon, stats) = best_of(repeat, run_simulation, tasks, algorithm, cores, arrivals, max_horizon)
+    return _case(name, seconds, horizon=horizon, segments=len(schedule), jobs=stats['total_jobs']), schedule, horizon
+
+
+def sample_cases(paths, algorithms, repeat, draw=True):
+    for path in paths:
+        base = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f: content = f.read()
+        seconds, tasks = best_of(repeat, parse_content, content)
+        yield _case(f"sample/{base}/parse", seconds, tasks=len(tasks))
+        has_server = any(t.task_type == 'S' for t in tasks)
+        for algorithm in algorithms:
+            if algorithm in SERVER_ALGORITHMS and not has_server: continue
+            for cores in SAMPLE_CORES:
+                name = f"sample/{base}/{algorithm}/{cores}"
+                row, schedule, horizon = _simulate(name, tasks, algorithm, cores, 100000, repeat)
+                yield row
+                if draw:
+                    seconds, _ = best_of(repeat, draw_view, schedule, tasks, horizon, cores)
+                    yield _case(name + "/draw", seconds, segments=len(schedule))
+
+
+def _synthetic(n, util, seed, period_range=(10, 1000), server=None, aperiodic_rate=0.0, horizon=10000):
+    from rtss.generator import generate_task_sets, poisson_arrivals
+    batch = generate_task_sets(1, n, util, seed=seed, period_range=period_range)
+    arrivals = poisson_arrivals(horizon, aperiodic_rate, seed=seed) if aperiodic_rate else None
+    return batch.to_tasks(0, server, arrivals)
+
+
+def sweep_cases(size, algorithms, repeat, seed=0):
+    task_counts, horizons, core_counts = SWEEPS[size]
+    for n in task_counts:
+        # Periods grow with n so the set stays at 70% of one core rather than
+        # being swamped by the minimum execution time of 1
+        tasks = _synthetic(n, 0.7, seed, period_range=(n, 100 * n))
+        yield _simulate(f"tasks/{n}", tasks, ALGORITHMS[2], 1, 10000, repeat)[0]
+    for h in horizons:
+        tasks = _synthetic(20, 0.7, seed)
+        yield _simulate(f"horizon/{h}", tasks, ALGORITHMS[0], 1, h, repeat)[0]
+    for m in core_counts:
+        tasks = _synthetic(max(10, 4 * m), 0.6 * m, seed)
+        yield _simulate(f"cores/{m}", tasks, ALGORITHMS[2], m, 10000, repeat)[0]
+    tasks = _synthetic(20, 0.6, seed, server=SERVER, aperiodic_rate=0.02)
+    for algorithm in algorithms:
+        yield _simulate(f"algorithm/{algorithm}", tasks, algorithm, 1, 10000, repeat)[0]
+
+
+def environment():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'machine': platform.machine(),
+            'cpus': os.cpu_count(), 'date': time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, tolerance=0.25, min_delta=0.002):
+    # [(name, baseline seconds, seconds, ratio, regressed)] for the cases in both
+    before = {r['name']: r['seconds'] for r in baseline['results']}
+    rows = []
+    for r in results:
+        if r['name'] not in before: continue
+        old, new = before[r['name']], r['seconds']
+        ratio = new / old if old > 0 else None
+        rows.append((r['name'], old, new, ratio, new > old * (1 + tolerance) and new - old > min_delta))
+    return rows
+
+
+def format_comparison(rows):
+    lines = []
+    for name, old, new, ratio, regressed in sorted(rows, key=lambda r: -(r[3] or 0)):
+        lines.append(f"{'REGRESSED' if regressed else 'ok':<10}{ratio or 0:6.2f}x {old * 1000:10.2f} -> {new * 1000:10.2f} ms  {name}")
+    return "\n".join(lines)
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(prog="python -m rtss.benchmark", description="Time parsing, simulation and Gantt drawing")
+    parser.add_argument("--size", choices=list(SWEEPS), default="quick", help="synthetic sweep grid (full: 10k tasks, 1M ms, 64 cores)")
+    parser.add_argument("--samples", nargs="*", default=None, help="task files to time (default: every Test_sample/*.txt)")
+    parser.add_argument("--algorithms", nargs="*", choices=ALGORITHMS, metavar="NAME", default=None, help="policies to time (default: all)")
+    parser.add_argument("--only", choices=["samples", "sweeps"], default=None, help="run one half of the suite")
+    parser.add_argument("--no-draw", action="store_true", help="skip the Gantt drawing cases")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="-", help="JSON results (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="compare against this results file, exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slow-down")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="allowed absolute slow-down (s)")
+    parser.add_argument("--save-baseline", default=None, metavar="FILE", help="also write the results to FILE as the new baseline")
+    return parser
+
+
+def main(argv=None, args=None):
+    args = args or build_parser().parse_args(argv)
+    algorithms = args.algorithms or ALGORITHMS
+    draw = not args.no_draw
+    if draw:
+        try: import matplotlib  # noqa: F401
+        except ImportError:
+            print("matplotlib is not installed: skipping the drawing cases", file=sys.stderr); draw = False
+    cases = []
+    if args.only != "sweeps":
+        cases.append(sample_cases(args.samples or sorted(glob.glob(os.path.join(SAMPLES, "*.txt"))), algorithms, args.repeat, draw))
+    if args.only != "samples":
+        cases.append(sweep_cases(args.size, algorithms, args.repeat, args.seed))
+    results = []
+    for group in cases:
+        for row in group:
+            results.append(row)
+            print(f"{row['seconds'] * 1000:10.2f} ms  {row['name']}", file=sys.stderr)
+    report = {'environment': environment(), 'size': args.size, 'repeat': args.repeat, 'results': results}
+    if args.output == "-": json.dump(report, sys.stdout, indent=2); sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f: json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f: json.dump(report, f, indent=2)
+    if not args.baseline: return 0
+    with open(args.baseline) as f: rows = compare(results, json.load(f), args.tolerance, args.min_delta)
+    print(format_comparison(rows), file=sys.stderr)
+    regressed = sum(r[4] for r in rows)
+    print(f"{regressed} of {len(rows)} cases regressed", file=sys.stderr)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
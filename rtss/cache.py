@@ -0,0 +1,165 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.engine import DEFAULT_MAX_HORIZON, run_simulation, stream_simulation
+from rtss.model import parse_content
+
+# =============================================================================
+# CONTENT-ADDRESSED RESULT CACHE
+# =============================================================================
+# Results are keyed by a hash of what the engine actually sees, not by file
+# names or object identity:
+#   - tasks are taken in id order and their ids relabeled to ranks 1..n, so list
+#     order and the id values do not matter (the engine itself works in id
+#     order; their relative order does count, it breaks every tie)
+#   - colors and the original letter (P/D) are ignored
+#   - an arrival trace counts by the digest of its bytes
+# Cached runs always simulate the canonical set; the segments are mapped back
+# to the caller's ids on the way out. Memory is an LRU bounded by the number of
+# stored segments; an optional directory adds a disk tier shared between
+# processes (one pickle per key, written atomically).
+
+KEY_VERSION = 5
+SPEC_FIELDS = ('task_type', 'arrival_time', 'burst_time', 'period', 'deadline', 'relative_deadline', 'server_capacity')
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''): h.update(block)
+    return h.hexdigest()
+
+
+def canonical_tasks(tasks):
+    # (tasks in id order with ids replaced by ranks, the original id of each rank)
+    ordered = sorted(tasks, key=lambda t: t.id)
+    return [t.replace(id=i + 1) for i, t in enumerate(ordered)], [t.id for t in ordered]
+
+
+def result_key(canonical, algorithm, num_cores, max_horizon=DEFAULT_MAX_HORIZON, trace_digest=None):
+    specs = tuple(tuple(getattr(t, f) for f in SPEC_FIELDS) for t in canonical)
+    return hashlib.sha256(repr((KEY_VERSION, algorithm, num_cores, max_horizon, trace_digest, specs)).encode()).hexdigest()
+
+
+def _relabel(schedule, ids, first_trace_id):
+    # Canonical ids 1..n map back to ids; trace arrivals keep their offset
+    n = len(ids)
+    orig = lambda cid: ids[cid - 1] if cid <= n else cid - n - 1 + first_trace_id
+    if all(cid == i for cid, i in enumerate(ids, 1)): return schedule
+    out = []
+    for seg in schedule:
+        seg = dict(seg)
+        seg['task_id'] = orig(seg['task_id'])
+        if seg['label']: seg['label'] = f"T{orig(int(seg['label'][1:]))}"
+        out.append(seg)
+    return out
+
+
+def _relabel_stats(stats, ids):
+    # Per-task statistics are keyed by canonical id too
+    stats = dict(stats)
+    if 'tasks' in stats: stats['tasks'] = {ids[cid - 1]: v for cid, v in stats['tasks'].items()}
+    return stats
+
+
+class ResultCache:
+    def __init__(self, max_segments=2000000, directory=None):
+        self.max_segments = max_segments
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = 0
+        if directory: os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        if self.directory:
+            try:
+                with open(self._path(key), 'rb') as f: entry = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError): return None
+            self._store(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self._store(key, entry)
+        if self.directory:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f: pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def clear(self):
+        self.entries.clear(); self.size = 0
+
+    def _store(self, key, entry):
+        if key in self.entries: return
+        self.entries[key] = entry
+        self.size += len(entry[0]) + 1
+        while self.size > self.max_segments and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.size -= len(old[0]) + 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    # Same contract as rtss.engine.run_simulation, with the arrival trace given by path
+    def run(self, tasks, algorithm, num_cores, trace=None, max_horizon=DEFAULT_MAX_HORIZON):
+        canonical, ids = canonical_tasks(tasks)
+        key = result_key(canonical, algorithm, num_cores, max_horizon, file_digest(trace) if trace else None)
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            arrivals = read_arrival_trace(trace, len(canonical) + 1) if trace else None
+            entry = run_simulation(canonical, algorithm, num_cores, arrivals, max_horizon)
+            if 'error' in entry[2]: return entry
+            self.put(key, entry)
+        else: self.hits += 1
+        schedule, horizon, stats = entry
+        return _relabel(schedule, ids, next_free_id(tasks)), horizon, _relabel_stats(stats, ids)
+
+    # Same contract as rtss.engine.stream_simulation: a hit yields the stored
+    # result once, a miss streams the run and stores it when it completes (a
+    # cancelled run stores nothing)
+    def stream(self, tasks, algorithm, num_cores, trace=None, max_horizon=DEFAULT_MAX_HORIZON, window=None):
+        canonical, ids = canonical_tasks(tasks)
+        key = result_key(canonical, algorithm, num_cores, max_horizon, file_digest(trace) if trace else None)
+        first_trace_id = next_free_id(tasks)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            schedule, horizon, stats = entry
+            yield horizon, _relabel(schedule, ids, first_trace_id), horizon, _relabel_stats(stats, ids)
+            return
+        self.misses += 1
+        arrivals = read_arrival_trace(trace, len(canonical) + 1) if trace else None
+        for t, schedule, horizon, stats in stream_simulation(canonical, algorithm, num_cores, arrivals, max_horizon, window):
+            yield t, _relabel(schedule, ids, first_trace_id), horizon, _relabel_stats(stats, ids)
+        if 'error' not in stats: self.put(key, (schedule, horizon, stats))
+
+
+# =============================================================================
+# PARSED-CONTENT CACHE
+# =============================================================================
+# Task is immutable, so one parsed list can be handed to every caller.
+
+_parsed = OrderedDict()
+PARSED_ENTRIES = 256
+
+
+def parse_cached(content):
+    key = hashlib.sha256(content.encode()).digest()
+    tasks = _parsed.get(key)
+    if tasks is None:
+        tasks = _parsed[key] = tuple(parse_content(content))
+        if len(_parsed) > PARSED_ENTRIES: _parsed.popitem(last=False)
+    else: _parsed.move_to_end(key)
+    return list(tasks)
@@ -0,0 +1,187 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+from rtss.analysis import analyze, describe
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.engine import ALGORITHMS, DEFAULT_MAX_HORIZON, run_simulation
+from rtss.model import parse_content
+
+# =============================================================================
+# HEADLESS COMMAND LINE
+# =============================================================================
+#   python -m rtss simulate Test_sample/ --cores 1 2 --format csv -o stats.csv
+#   python -m rtss simulate Test_sample/ --cores 2 --partition first-fit --fit-test rta
+#   python -m rtss simulate my_set.txt --profile --memory --pstats prof/   (see rtss/profiling.py)
+#   python -m rtss ingest library/ sets.zip --cache .rtss-library --format csv   (see rtss/library.py)
+#   python -m rtss experiments ...          (see rtss/experiments.py)
+#   python -m rtss bench ...                (see rtss/benchmark.py)
+# Only the engine and the analysis are imported up front; matplotlib is
+# loaded only when --charts asks for PNGs, NumPy only for --schedules, the
+# partitioned runner and the experiment runner (both with a process pool) only
+# for --partition and the experiments command, and the benchmarks only for bench.
+
+# Same as rtss.partition.HEURISTICS / FIT_TESTS (not imported for the parser)
+HEURISTICS = ("first-fit", "best-fit", "worst-fit")
+FIT_TESTS = ("utilization", "rta")
+FIELDS = ['file', 'algorithm', 'cores', 'partition', 'unassigned', 'horizon', 'hyperperiod', 'steady_state', 'truncated',
+          'missed_deadlines', 'total_jobs', 'aperiodic_done', 'preemptions', 'migrations', 'worst_response',
+          'aperiodic_mean', 'aperiodic_p95', 'aperiodic_p99', 'events_per_second', 'peak_ready_queue', 'analysis', 'error']
+
+
+def task_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.txt'): yield os.path.join(path, name)
+        else: yield path
+
+
+def run_name(path, algorithm, cores):
+    slug = re.sub(r'\W+', '_', algorithm).strip('_')
+    return f"{os.path.splitext(os.path.basename(path))[0]}_{slug}_{cores}core"
+
+
+# partition: None for global scheduling, or a bin-packing heuristic (see rtss.partition)
+# profile: instrumented global runs, reported on stderr; memory adds tracemalloc
+# totals and pstats (a directory) one cProfile dump per run
+# schedules: a directory for one binary schedule trace (.npz, see rtss.trace) per run
+# tasks: the already parsed set (path is then only its name)
+def simulate_file(path, algorithms, core_counts, trace=None, max_horizon=DEFAULT_MAX_HORIZON, charts=None,
+                  partition=None, fit_test="utilization", profile=False, memory=False, pstats=None, schedules=None, tasks=None):
+    if tasks is None:
+        with open(path, 'r') as f: tasks = parse_content(f.read())
+    for algorithm in algorithms:
+        for cores in core_counts:
+            row = {'file': path, 'algorithm': algorithm, 'cores': cores, 'partition': partition or 'global'}
+            if partition:
+                from rtss.partition import analyze_partitions, partition_tasks, run_partitioned
+                schedule, horizon, stats = run_partitioned(tasks, algorithm, cores, partition, fit_test, trace, max_horizon)
+                row['analysis'] = describe(analyze_partitions(partition_tasks(tasks, cores, algorithm, partition, fit_test)[0], algorithm))
+            elif profile or pstats:
+                from rtss.profiling import run_instrumented
+                arrivals = (lambda: read_arrival_trace(trace, next_free_id(tasks))) if trace else None
+                dump = os.path.join(pstats, run_name(path, algorithm, cores) + '.pstats') if pstats else None
+                schedule, horizon, stats = run_instrumented(tasks, algorithm, cores, arrivals, max_horizon, memory, dump)
+                row['analysis'] = describe(analyze(tasks, algorithm, cores))
+            else:
+                arrivals = read_arrival_trace(trace, next_free_id(tasks)) if trace else None
+                schedule, horizon, stats = run_simulation(tasks, algorithm, cores, arrivals, max_horizon)
+                row['analysis'] = describe(analyze(tasks, algorithm, cores))
+            if 'error' in stats:
+                row['error'] = stats['error']; yield row; continue
+            if partition: row['unassigned'] = ' '.join(f"T{tid}" for tid in stats['unassigned'])
+            row.update({k: stats[k] for k in ('hyperperiod', 'steady_state', 'truncated', 'missed_deadlines', 'total_jobs', 'aperiodic_done', 'preemptions', 'migrations')})
+            row['worst_response'] = max((p['max_response'] for p in stats['tasks'].values()), default=None)
+            row.update({f"aperiodic_{k}": stats['aperiodic_response'][k] for k in ('mean', 'p95', 'p99')})
+            row['horizon'] = horizon
+            if 'profile' in stats:
+                from rtss.profiling import format_profile
+                row['events_per_second'] = round(stats['profile']['events_per_second'] or 0)
+                row['peak_ready_queue'] = stats['profile']['peak_ready_queue']
+                print(f"{path} | {algorithm} | {cores} core(s)\n{format_profile(stats['profile'])}\n", file=sys.stderr)
+            row = {k: row[k] for k in FIELDS if k in row}
+            if charts:
+                from rtss.gantt import render_png
+                with open(os.path.join(charts, run_name(path, algorithm, cores) + '.png'), 'wb') as f: f.write(render_png(schedule, tasks, horizon, cores, algorithm, width=12, dpi=100))
+            if schedules:
+                from rtss.trace import save_trace
+                save_trace(os.path.join(schedules, run_name(path, algorithm, cores) + '.npz'), schedule, tasks, algorithm, cores, horizon, stats)
+            yield row
+
+
+def write_rows(rows, out, fmt, fields=FIELDS):
+    if fmt == 'json':
+        json.dump(rows, out, indent=2); out.write('\n'); return
+    writer = csv.DictWriter(out, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def print_diagnostics(diagnostics):
+    for name, line, message in diagnostics: print(f"{name}:{line}: {message}" if line else f"{name}: {message}", file=sys.stderr)
+
+
+def ingest_library(args):
+    from rtss.library import ingest
+
+    def progress(done, total):
+        print(f"\r{done}/{total} sets parsed", end="", file=sys.stderr, flush=True)
+
+    library = ingest(args.paths, args.cache, args.workers, args.chunk, progress)
+    if library.parsed: print(file=sys.stderr)
+    print_diagnostics(library.diagnostics)
+    print(f"{len(library.sets)} sets: {library.parsed} parsed, {library.cached} from the cache, {library.failed} unreadable, "
+          f"{len(library.diagnostics)} diagnostics", file=sys.stderr)
+    rows = list(library.rows())
+    if args.output == "-": write_rows(rows, sys.stdout, args.format, ['file', 'tasks', 'diagnostics'])
+    else:
+        with open(args.output, "w", newline="") as f: write_rows(rows, f, args.format, ['file', 'tasks', 'diagnostics'])
+    return 1 if args.strict and library.diagnostics else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m rtss", description="Headless RTSS simulator")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sim = commands.add_parser("simulate", help="simulate task files (or every .txt in a directory)")
+    sim.add_argument("paths", nargs="+")
+    sim.add_argument("--algorithms", nargs="*", choices=ALGORITHMS, metavar="NAME", default=None, help="policies to run (default: all)")
+    sim.add_argument("--cores", type=int, nargs="*", default=[1])
+    sim.add_argument("--trace", default=None, help="extra aperiodic arrival trace (.npy or .txt)")
+    sim.add_argument("--max-horizon", type=int, default=DEFAULT_MAX_HORIZON)
+    sim.add_argument("--format", choices=["json", "csv"], default="json")
+    sim.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    sim.add_argument("--charts", default=None, metavar="DIR", help="also write one Gantt PNG per run into DIR")
+    sim.add_argument("--schedules", default=None, metavar="DIR", help="also write one binary schedule trace (.npz) per run into DIR")
+    sim.add_argument("--partition", choices=HEURISTICS, default=None, help="partitioned scheduling with this decreasing bin-packing heuristic (default: global)")
+    sim.add_argument("--fit-test", choices=FIT_TESTS, default="utilization", help="per-core admission test for --partition")
+    sim.add_argument("--profile", action="store_true", help="time the engine phases of every (global) run, report on stderr")
+    sim.add_argument("--memory", action="store_true", help="with --profile: also trace allocations (tracemalloc)")
+    sim.add_argument("--pstats", default=None, metavar="DIR", help="also write one cProfile dump (.pstats) per (global) run into DIR")
+    sim.add_argument("--library-cache", default=None, metavar="DIR", help="read the sets through a parsed-set cache in DIR (archives allowed, see ingest)")
+    sim.add_argument("--fail-on-miss", action="store_true", help="exit with status 1 if any run misses a deadline")
+    lib = commands.add_parser("ingest", help="parse a task library (directories, .zip / .tar archives) in parallel, with diagnostics")
+    lib.add_argument("paths", nargs="+")
+    lib.add_argument("--cache", default=None, metavar="DIR", help="keep the parsed sets in a binary cache in DIR")
+    lib.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    lib.add_argument("--chunk", type=int, default=256, help="sets per work item")
+    lib.add_argument("--format", choices=["json", "csv"], default="json")
+    lib.add_argument("-o", "--output", default="-", help="per-set summary (default: stdout)")
+    lib.add_argument("--strict", action="store_true", help="exit with status 1 on any diagnostic")
+    commands.add_parser("experiments", add_help=False, help="acceptance-ratio experiments (python -m rtss experiments -h)")
+    commands.add_parser("bench", add_help=False, help="benchmark suite with baseline comparison (python -m rtss bench -h)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["experiments"]:
+        from rtss.experiments import main as experiments_main
+        experiments_main(argv[1:]); return 0
+    if argv[:1] == ["bench"]:
+        from rtss.benchmark import main as bench_main
+        return bench_main(argv[1:])
+    args = build_parser().parse_args(argv)
+    if args.command == "ingest": return ingest_library(args)
+    if args.partition and (args.profile or args.pstats): build_parser().error("--profile and --pstats apply to global runs only")
+    if args.charts: os.makedirs(args.charts, exist_ok=True)
+    if args.pstats: os.makedirs(args.pstats, exist_ok=True)
+    if args.schedules: os.makedirs(args.schedules, exist_ok=True)
+    rows = []
+    if args.library_cache:
+        from rtss.library import ingest
+        library = ingest(args.paths, args.library_cache)
+        print_diagnostics(library.diagnostics)
+        sets = library.sets
+    else: sets = [(path, None) for path in task_files(args.paths)]
+    for path, tasks in sets:
+        rows.extend(simulate_file(path, args.algorithms or ALGORITHMS, args.cores, args.trace, args.max_horizon, args.charts,
+                                  args.partition, args.fit_test, args.profile, args.memory, args.pstats, args.schedules, tasks))
+    if args.output == "-": write_rows(rows, sys.stdout, args.format)
+    else:
+        with open(args.output, "w", newline="") as f: write_rows(rows, f, args.format)
+    if args.fail_on_miss and any(row.get('missed_deadlines') for row in rows): return 1
+    return 0
@@ -0,0 +1,47 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from rtss.analysis import analyze, describe
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.engine import ALGORITHMS, DEFAULT_MAX_HORIZON, run_simulation
+
+# =============================================================================
+# ALL-ALGORITHMS COMPARISON
+# =============================================================================
+# Runs every policy on the same task set and core count, one policy per worker
+# process. Each worker simulates, takes the engine's streaming statistics and
+# renders its own small Gantt chart to PNG, so only a summary row and the image
+# bytes travel back. Rows come back in the order of the algorithms argument.
+
+
+def compare_one(job):
+    tasks, algorithm, num_cores, trace, max_horizon, render = job
+    arrivals = read_arrival_trace(trace, next_free_id(tasks)) if trace else None
+    schedule, horizon, stats = run_simulation(tasks, algorithm, num_cores, arrivals, max_horizon)
+    row = {'algorithm': algorithm, 'analysis': describe(analyze(tasks, algorithm, num_cores))}
+    if 'error' in stats:
+        row['error'] = stats['error']
+        return row, None
+    periodic = stats['tasks']; aperiodic = stats['aperiodic_response']
+    row.update({'missed_deadlines': stats['missed_deadlines'], 'total_jobs': stats['total_jobs'],
+                'aperiodic_done': stats['aperiodic_done'], 'horizon': horizon, 'truncated': stats['truncated'],
+                'preemptions': stats['preemptions'], 'migrations': stats['migrations'],
+                'worst_response': max((p['max_response'] for p in periodic.values()), default=None),
+                'avg_response': round(sum(p['mean_response'] for p in periodic.values()) / len(periodic), 2) if periodic else None,
+                'avg_aperiodic_response': round(aperiodic['mean'], 2) if aperiodic['count'] else None,
+                'p95_aperiodic_response': aperiodic['p95']})
+    png = None
+    if render:
+        from rtss.gantt import render_png
+        png = render_png(schedule, tasks, horizon, num_cores, algorithm)
+    return row, png
+
+
+# Returns [(row, png bytes or None)] in algorithm order; rows of server policies
+# on sets without a server carry 'error' instead of the counters
+def compare_algorithms(tasks, num_cores, algorithms=None, trace=None, max_horizon=DEFAULT_MAX_HORIZON,
+                       render=True, max_workers=None):
+    jobs = [(list(tasks), algorithm, num_cores, trace, max_horizon, render) for algorithm in (algorithms or ALGORITHMS)]
+    if max_workers == 1: return [compare_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+        return list(pool.map(compare_one, jobs))
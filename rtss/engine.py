@@ -0,0 +1,423 @@
+import heapq
+import math
+from collections import deque
+
+from rtss.arrivals import merge_arrivals, task_arrivals
+from rtss.model import Job
+from rtss.ready_queue import LLF, make_ready_queue
+from rtss.stats import QuantileSketch, RunningStats
+
+# =============================================================================
+# EVENT-DRIVEN SIMULATION ENGINE
+# =============================================================================
+# Time still advances in 1 ms ticks, but only "interesting" ticks are executed
+# one by one: releases, aperiodic arrivals, replenishments, completions and
+# priority changes. Between two such ticks the schedule is identical tick after
+# tick, so the engine applies the whole stretch in one go.
+#
+# Horizon: the exact hyperperiod H (no cap), starting at the largest offset O.
+# The engine snapshots its state (ready jobs, budgets, pending replenishments)
+# at every boundary O + kH; once a snapshot equals the previous one the
+# schedule provably repeats and the run stops. Otherwise it stops at O + 2H,
+# the feasibility interval for offset sets. max_horizon is the only cut and is
+# reported in stats['truncated'].
+#
+# Response times, jitter, preemptions and migrations are accumulated as jobs
+# run and complete (rtss.stats), in memory that does not grow with the run.
+# missed_deadlines counts the ticks run past a deadline; a job starved until
+# the end of the run never has one, so stats['overdue_jobs'] counts the
+# periodic jobs left unfinished after their deadline.
+
+ALGORITHMS = ["Rate Monotonic (RM)", "Deadline Monotonic (DM)", "Earliest Deadline First (EDF)", "Least Laxity First (LLF)",
+              "Background", "Poller", "Deferrable Server", "Sporadic Server", "RM Baseline"]
+SERVER_ALGORITHMS = ["Poller", "Deferrable Server", "Sporadic Server"]
+APERIODIC_DEADLINE = 99999
+DEFAULT_MAX_HORIZON = 100000
+
+
+def hyperperiod(tasks):
+    # Exact lcm of the periods (Python ints, no overflow), None without periods
+    periods = [t.period for t in tasks if t.period > 0]
+    return math.lcm(*periods) if periods else None
+
+
+def _next_release(task, t):
+    # First release strictly after t
+    if task.period <= 0: return None
+    if t < task.arrival_time: return task.arrival_time
+    return task.arrival_time + ((t - task.arrival_time) // task.period + 1) * task.period
+
+
+class Simulator:
+    def __init__(self, tasks, algorithm, num_cores, arrivals=None, max_horizon=DEFAULT_MAX_HORIZON, min_horizon=0):
+        # Id order, not list order, decides every tie: the server is the S task
+        # with the lowest id, same-time releases and arrivals come in id order
+        tasks = sorted(tasks, key=lambda t: t.id)
+        self.algorithm = algorithm
+        self.num_cores = num_cores
+        self.server_task = next((t for t in tasks if t.task_type == 'S'), None)
+        # Aperiodic requests are pulled lazily; only the next pending one is held
+        source = task_arrivals(tasks)
+        if arrivals is not None: source = merge_arrivals(source, arrivals)
+        self.arrivals = iter(source)
+        self.next_arrival = next(self.arrivals, None)
+        self.active_periodic = [t for t in tasks if t.task_type == 'P']
+        if self.server_task and algorithm != "Background":
+            self.active_periodic.append(self.server_task)
+        self.hyperperiod = hyperperiod(self.active_periodic)
+        if self.hyperperiod is None:
+            # Nothing repeats: run until the aperiodic work is over
+            self.next_boundary = None
+            horizon = math.inf
+        else:
+            self.next_boundary = max(t.arrival_time for t in self.active_periodic if t.period > 0)
+            # min_horizon: run at least that long unless the schedule repeats earlier
+            horizon = max(self.next_boundary + 2 * self.hyperperiod, min_horizon)
+        self.truncated = horizon > max_horizon
+        self.horizon = min(horizon, max_horizon)
+        self.boundary_state = None
+        self.t = 0
+
+        # Release calendar: min-heap of (next release time, list position, task)
+        self.releases = [(_next_release(task, -1), order, task) for order, task in enumerate(self.active_periodic) if task.period > 0]
+        heapq.heapify(self.releases)
+
+        # One run-length segment list per core; the last one stays open while it grows
+        self.core_segments = [[] for _ in range(num_cores + 1)]
+        self.open_segments = [None] * (num_cores + 1)
+        self.ready = make_ready_queue(algorithm)
+        self.server_jobs = deque()  # server jobs in release order; [0] is the live handle
+        self.server_budget = self.server_task.server_capacity if self.server_task else 0
+        self.aperiodic_queue = deque()
+        # Sporadic Server: (start, units) chunks, one unit comes back per tick from start on
+        self.sporadic_replenishments = deque()
+        self.stats = {'total_jobs': 0, 'missed_deadlines': 0, 'aperiodic_done': 0,
+                      'hyperperiod': self.hyperperiod, 'steady_state': False, 'truncated': False,
+                      'preemptions': 0, 'migrations': 0}
+        # task id -> (response time, start latency) of its completed periodic jobs
+        self.task_times = {}
+        self.aperiodic_times = QuantileSketch()
+
+    def run(self):
+        for _ in self.iter_run(): pass
+        return self.result()
+
+    def iter_run(self, window=math.inf):
+        # Same run, pausing after every `window` simulated ms: yields the time
+        # reached so far; result() then holds the schedule up to that time
+        t = 0; pause = window
+        while t < self.horizon:
+            if t == self.next_boundary and self._boundary(t): break
+            if self._drained():
+                self.horizon = max(t, 1); self.truncated = False; break
+            dispatched, steady = self._tick(t)
+            skip = self._steady_ticks(t, dispatched) if steady else 0
+            if skip > 0: self._apply_ticks(t, skip, dispatched)
+            t += skip + 1
+            if t >= pause:
+                self.t = t; pause = t + window
+                yield t
+        self.t = t
+        self.stats['truncated'] = self.truncated and t >= self.horizon and not self.stats['steady_state']
+
+    def _drained(self):
+        # Without periodic tasks the run ends once no aperiodic work is left
+        # that can still run (only Background serves it without a server)
+        return self.hyperperiod is None and self.next_arrival is None and (not self.aperiodic_queue or self.algorithm != "Background")
+
+    def result(self):
+        schedule_log = [seg for segments in self.core_segments for seg in segments]
+        stats = self.stats
+        stats['tasks'] = {tid: {'jobs': resp.count, 'min_response': resp.min, 'mean_response': resp.mean(),
+                                'max_response': resp.max, 'release_jitter': start.spread(), 'finishing_jitter': resp.spread()}
+                          for tid, (resp, start) in sorted(self.task_times.items())}
+        stats['aperiodic_response'] = self.aperiodic_times.summary()
+        # Periodic jobs still unfinished (started or not) whose deadline has passed:
+        # missed, though missed_deadlines only counts the ticks that ran late
+        stats['overdue_jobs'] = sum(1 for job in self.ready.snapshot() if job.task.task_type == 'P' and job.abs_deadline <= self.t)
+        return schedule_log, self.horizon, stats
+
+    # -------------------------------------------------------------------------
+    # Steady-state detection at the boundaries O + kH
+    # -------------------------------------------------------------------------
+    def _boundary(self, t):
+        self.next_boundary = t + self.hyperperiod
+        state = self._snapshot(t)
+        if state is not None and state == self.boundary_state:
+            self.horizon = t; self.stats['steady_state'] = True
+            return True
+        self.boundary_state = state
+        return False
+
+    def _snapshot(self, t):
+        # Everything the future schedule depends on, relative to t. Pending
+        # aperiodic work makes every period different, so no snapshot then.
+        if self.next_arrival is not None or self.aperiodic_queue: return None
+        server = self.server_task
+        # A Deferrable Server released right now drops its jobs and refills its budget
+        ds_reset = self.algorithm == "Deferrable Server" and server is not None and (t - server.arrival_time) % server.period == 0
+        jobs = tuple((job.task.id, job.remaining, job.abs_deadline - t) for job in self.ready.snapshot()
+                     if not (ds_reset and job.task == server))
+        budget = None if ds_reset else self.server_budget
+        reps = tuple((start - t, units) for start, units in self.sporadic_replenishments)
+        releases = tuple(sorted((r - t, order) for r, order, _ in self.releases))
+        return jobs, budget, reps, releases
+
+    # -------------------------------------------------------------------------
+    # One exact tick (same semantics as the original per-tick loop)
+    # -------------------------------------------------------------------------
+    def _tick(self, t):
+        # Each phase is a method (rtss.profiling times them one by one); the
+        # guards skip the call when the phase has nothing to do at t
+        if self.releases and self.releases[0][0] == t: self._release(t)
+        if self.sporadic_replenishments and self.sporadic_replenishments[0][0] <= t: self._replenish(t)
+        if self.next_arrival is not None and self.next_arrival.arrival_time == t: self._admit(t)
+        return self._dispatch(t)
+
+    def _release(self, t):
+        # 1. Arrivals (only the tasks whose next release is due; same-time
+        #    releases come out in task list order)
+        algorithm = self.algorithm; server_task = self.server_task
+        stats = self.stats; ready = self.ready
+        releases = self.releases
+        while releases and releases[0][0] == t:
+            _, order, task = releases[0]
+            heapq.heapreplace(releases, (t + task.period, order, task))
+            new_job = Job(task, task.burst_time, t + task.deadline, t)
+            stats['total_jobs'] += 1
+            if task == server_task:
+                if algorithm == "Deferrable Server":
+                    self.server_budget = task.server_capacity
+                    self._drop_server_jobs()
+                    new_job.remaining = self.server_budget
+                    self._push_server_job(new_job)
+                elif algorithm == "Sporadic Server":
+                    if self.server_budget > 0:
+                        new_job.remaining = self.server_budget
+                        self._drop_server_jobs()
+                        self._push_server_job(new_job)
+                else: self._push_server_job(new_job)
+            else: ready.push(new_job)
+
+    def _replenish(self, t):
+        # 2. Sporadic Replenishment (chunks are only queued under the Sporadic Server)
+        server_task = self.server_task
+        reps = self.sporadic_replenishments
+        amount = 0
+        while reps and reps[0][0] <= t:
+            start, units = reps[0]
+            due = min(units, t - start + 1)
+            amount += due
+            if due == units: reps.popleft()
+            else: reps[0] = (start + due, units - due)
+        if amount:
+            self.server_budget = min(server_task.server_capacity, self.server_budget + amount)
+            server_job = self._server_job()
+            if server_job is None and self.server_budget > 0:
+                self._push_server_job(Job(server_task, self.server_budget, t + server_task.period, t))
+            elif server_job is not None: server_job.remaining = self.server_budget
+
+    def _admit(self, t):
+        # 3. Aperiodic Arrivals
+        while self.next_arrival is not None and self.next_arrival.arrival_time == t:
+            ap_task = self.next_arrival
+            self.aperiodic_queue.append(Job(ap_task, ap_task.burst_time, APERIODIC_DEADLINE, t))
+            self.next_arrival = next(self.arrivals, None)
+
+    def _dispatch(self, t):
+        algorithm = self.algorithm; server_task = self.server_task
+        stats = self.stats; aperiodic_queue = self.aperiodic_queue; ready = self.ready
+
+        # 4. Poller Check (the oldest server job is the first one in queue order)
+        if algorithm == "Poller" and server_task and not aperiodic_queue:
+            server_job = self._server_job()
+            if server_job is not None: server_job.remaining = 0
+
+        # 5-6. Dispatching in priority order: the top num_cores jobs are popped
+        ready.prepare(t)
+        # dispatched: (core_id, job or None, label, status, task_id, serves_aperiodic)
+        dispatched = []
+        held = []
+        steady = True
+        self._waiting = None
+        cores_available = self.num_cores
+        while cores_available > 0 or (algorithm == LLF and self._waiting is None):
+            current_job = ready.pop()
+            if current_job is None: break
+            held.append(current_job)
+            if current_job.task == server_task and not aperiodic_queue and algorithm in ["Deferrable Server", "Sporadic Server"]:
+                continue
+            if cores_available == 0:
+                self._waiting = current_job; break
+
+            core_id = self.num_cores - cores_available + 1
+            label = f"T{current_job.task.id}"; status = 'OK'; serves = False
+            if current_job.task == server_task and aperiodic_queue and algorithm != "RM Baseline":
+                ap_job = aperiodic_queue[0]
+                label = f"T{ap_job.task.id}"; serves = True
+                ap_job.remaining -= 1
+                if ap_job.remaining == 0: self._aperiodic_done(t + 1); steady = False
+            elif current_job.task == server_task and algorithm != "RM Baseline": label = ""
+
+            if t >= current_job.abs_deadline: status = 'MISS'; stats['missed_deadlines'] += 1
+
+            self._emit(core_id, t, label, status, current_job.task.id)
+            dispatched.append((core_id, current_job, label, status, current_job.task.id, serves))
+            current_job.remaining -= 1
+            # Resuming after a gap is a preemption, on another core also a migration
+            if current_job.start is None: current_job.start = t
+            elif current_job.last_end != t: stats['preemptions'] += 1
+            if current_job.core and current_job.core != core_id: stats['migrations'] += 1
+            current_job.core = core_id; current_job.last_end = t + 1
+
+            if algorithm == "Sporadic Server" and current_job.task == server_task:
+                self.server_budget -= 1; self._queue_replenishment(t + server_task.period, 1)
+
+            if current_job.remaining == 0: self._job_done(current_job, t + 1); steady = False
+            cores_available -= 1
+        for job in held:
+            if job.remaining > 0: ready.push_back(job)
+
+        while cores_available > 0 and algorithm == "Background" and aperiodic_queue:
+            core_id = self.num_cores - cores_available + 1
+            ap_job = aperiodic_queue[0]
+            label = f"T{ap_job.task.id}"
+            self._emit(core_id, t, label, 'OK', ap_job.task.id)
+            dispatched.append((core_id, None, label, 'OK', ap_job.task.id, True))
+            ap_job.remaining -= 1
+            if ap_job.remaining == 0: self._aperiodic_done(t + 1); steady = False
+            cores_available -= 1
+
+        # A Poller with an empty aperiodic queue drops one server job per tick
+        if algorithm == "Poller" and server_task and not aperiodic_queue and self._server_job() is not None:
+            steady = False
+        return dispatched, steady
+
+    def _emit(self, core_id, t, label, status, task_id):
+        # Extend the open segment of the core, or close it by starting a new one
+        seg = self.open_segments[core_id]
+        if seg is not None and seg['end'] == t and seg['task_id'] == task_id and seg['label'] == label and seg['status'] == status:
+            seg['end'] = t + 1; return
+        seg = {'core': core_id, 'task_id': task_id, 'start': t, 'end': t + 1, 'status': status, 'label': label}
+        self.open_segments[core_id] = seg
+        self.core_segments[core_id].append(seg)
+
+    def _job_done(self, job, end):
+        # Periodic jobs only: server jobs stand for aperiodic work, measured below
+        if job.task.task_type != 'P': return
+        times = self.task_times.get(job.task.id)
+        if times is None: times = self.task_times[job.task.id] = (RunningStats(), RunningStats())
+        times[0].add(end - job.release); times[1].add(job.start - job.release)
+
+    def _aperiodic_done(self, end):
+        job = self.aperiodic_queue.popleft()
+        self.stats['aperiodic_done'] += 1
+        self.aperiodic_times.add(end - job.release)
+
+    def _push_server_job(self, job):
+        self.ready.push(job)
+        self.server_jobs.append(job)
+
+    def _drop_server_jobs(self):
+        for job in self.server_jobs: self.ready.discard(job)
+        self.server_jobs.clear()
+
+    def _server_job(self):
+        # Oldest live server job (the first one in queue order), or None
+        jobs = self.server_jobs
+        while jobs and not (jobs[0].queued and jobs[0].remaining > 0): jobs.popleft()
+        return jobs[0] if jobs else None
+
+    def _queue_replenishment(self, start, units):
+        # Contiguous consumption extends the last chunk instead of adding entries
+        reps = self.sporadic_replenishments
+        if reps and reps[-1][0] + reps[-1][1] == start: reps[-1] = (reps[-1][0], reps[-1][1] + units)
+        else: reps.append((start, units))
+
+    # -------------------------------------------------------------------------
+    # How many following ticks repeat the dispatch of tick t exactly
+    # -------------------------------------------------------------------------
+    def _steady_ticks(self, t, dispatched):
+        if self._drained(): return 0  # the loop stops at t + 1
+        limit = self.horizon - t - 1
+        if self.next_boundary is not None:
+            limit = min(limit, self.next_boundary - t - 1)
+        if self.releases:
+            limit = min(limit, self.releases[0][0] - t - 1)
+        if self.next_arrival is not None:
+            nxt = self.next_arrival.arrival_time
+            if nxt > t: limit = min(limit, nxt - t - 1)
+        if self.sporadic_replenishments:
+            limit = min(limit, self.sporadic_replenishments[0][0] - t - 1)
+
+        consumers = 0
+        last_running = None
+        for core_id, job, label, status, task_id, serves in dispatched:
+            if serves: consumers += 1
+            if job is None: continue
+            last_running = job
+            limit = min(limit, job.remaining)
+            if status == 'OK': limit = min(limit, job.abs_deadline - t - 1)
+        if consumers:
+            head = self.aperiodic_queue[0].remaining
+            if head > 0: limit = min(limit, head // consumers)
+
+        # LLF: laxity of waiting jobs shrinks by one per tick while running jobs keep theirs
+        # (the first waiting job is always the first one to overtake)
+        job = self._waiting
+        if self.algorithm == LLF and job is not None and last_running is not None:
+            run_lax = last_running.abs_deadline - (t + 1) - last_running.remaining
+            lax = job.abs_deadline - (t + 1) - job.remaining
+            limit = min(limit, lax - run_lax + (0 if job.task.id < last_running.task.id else 1))
+        return max(limit, 0)
+
+    def _apply_ticks(self, t, count, dispatched):
+        consumers = 0
+        for core_id, job, label, status, task_id, serves in dispatched:
+            self.open_segments[core_id]['end'] += count
+            if serves: consumers += 1
+            if job is None: continue
+            job.remaining -= count; job.last_end = t + 1 + count
+            if job.remaining == 0: self._job_done(job, t + 1 + count)
+            if status == 'MISS': self.stats['missed_deadlines'] += count
+            if self.algorithm == "Sporadic Server" and job.task == self.server_task:
+                self.server_budget -= count
+                self._queue_replenishment(t + 1 + self.server_task.period, count)
+        if consumers:
+            head = self.aperiodic_queue[0]
+            head.remaining -= count * consumers
+            if head.remaining == 0: self._aperiodic_done(t + 1 + count)
+
+
+# schedule_log is a list of run-length segments, ordered by core and then time:
+#   {'core', 'task_id', 'start', 'end', 'status', 'label'}   (end is exclusive)
+# Contiguous ticks on a core with the same task, label and status form one segment.
+# arrivals: optional extra aperiodic source (see rtss.arrivals), merged with the 'A' tasks
+# stats: counters plus 'hyperperiod' (exact, None without periodic tasks), 'steady_state'
+# (the schedule repeats from the end on) and 'truncated' (stopped by max_horizon).
+# min_horizon: a floor for the O + 2H cut (partitioned cores share one horizon)
+# Streaming metrics: 'preemptions', 'migrations', 'tasks' (per periodic task id:
+# jobs, min/mean/max_response, release_jitter = spread of the start latency,
+# finishing_jitter = spread of the response time) and 'aperiodic_response'
+# (count, min, mean, max and p50/p90/p95/p99 from a fixed-size sketch)
+def run_simulation(tasks, algorithm, num_cores, arrivals=None, max_horizon=DEFAULT_MAX_HORIZON, min_horizon=0):
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks):
+        return [], 0, {'error': f"Error: {algorithm} requires a Server (S) task definition."}
+    return Simulator(tasks, algorithm, num_cores, arrivals, max_horizon, min_horizon).run()
+
+
+# Progressive version of run_simulation: yields (time reached, schedule so far,
+# horizon, stats so far) about every `window` simulated ms (default: 1/100 of
+# the horizon) and once more at the end. Each stats dict is a copy; stop
+# iterating to cancel the run.
+def stream_simulation(tasks, algorithm, num_cores, arrivals=None, max_horizon=DEFAULT_MAX_HORIZON, window=None):
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks):
+        yield 0, [], 0, {'error': f"Error: {algorithm} requires a Server (S) task definition."}
+        return
+    sim = Simulator(tasks, algorithm, num_cores, arrivals, max_horizon)
+    window = window or max(1, (sim.horizon if sim.horizon != math.inf else max_horizon) // 100)
+    for t in sim.iter_run(window):
+        schedule, horizon, stats = sim.result()
+        yield t, schedule, horizon, dict(stats)
+    schedule, horizon, stats = sim.result()
+    yield sim.t, schedule, horizon, stats
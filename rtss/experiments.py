@@ -0,0 +1,202 @@
+import argparse
+import csv
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rtss.analysis import analyze
+from rtss.engine import ALGORITHMS, DEFAULT_MAX_HORIZON, SERVER_ALGORITHMS, run_simulation
+from rtss.model import generate_smart_random_tasks
+
+# =============================================================================
+# MONTE CARLO SCHEDULABILITY EXPERIMENTS
+# =============================================================================
+# For every target utilization, random task sets are generated and simulated
+# under every (algorithm, core count) pair; a set is accepted when it finishes
+# its horizon without a deadline miss, counting jobs still unfinished past
+# their deadline at the end (stats['overdue_jobs']) as misses. The work is cut into chunks that are
+# generated *and* simulated inside worker processes. Every chunk gets its own
+# seed drawn up front from the base seed, so results do not depend on how the
+# chunks are scheduled over the pool.
+# With use_analysis, sets that rtss.analysis already decides are not simulated:
+# the analytical verdict counts and the job counters cover simulated sets only.
+# Runs longer than max_horizon are cut there and counted as 'truncated'.
+
+
+class ExperimentConfig:
+    def __init__(self, utilizations, algorithms=None, core_counts=(1,), sets_per_point=1000,
+                 total_tasks=8, num_aperiodic=0, include_server=False, seed=0, chunk_size=50,
+                 generator="smart", period_range=(10, 1000), use_analysis=False,
+                 max_horizon=DEFAULT_MAX_HORIZON):
+        self.utilizations = list(utilizations)
+        self.algorithms = list(algorithms or ALGORITHMS)
+        if not include_server:
+            self.algorithms = [a for a in self.algorithms if a not in SERVER_ALGORITHMS]
+        self.core_counts = list(core_counts)
+        self.sets_per_point = sets_per_point
+        self.total_tasks = total_tasks
+        self.num_aperiodic = num_aperiodic
+        self.include_server = include_server
+        self.seed = seed
+        self.chunk_size = chunk_size
+        # "smart": generate_smart_random_tasks, one set at a time
+        # "uunifast": rtss.generator, the whole chunk as NumPy arrays (UUniFast-Discard,
+        #             log-uniform periods in period_range, Poisson aperiodic arrivals)
+        self.generator = generator
+        self.period_range = tuple(period_range)
+        self.use_analysis = use_analysis
+        self.max_horizon = max_horizon
+
+    def chunks(self):
+        seeds = random.Random(self.seed)
+        for util in self.utilizations:
+            for start in range(0, self.sets_per_point, self.chunk_size):
+                count = min(self.chunk_size, self.sets_per_point - start)
+                yield (util, count, seeds.getrandbits(64), self)
+
+
+def _new_counter():
+    return {'sets': 0, 'schedulable': 0, 'analytic': 0, 'truncated': 0, 'missed_deadlines': 0, 'overdue_jobs': 0, 'total_jobs': 0, 'aperiodic_done': 0}
+
+
+def _uunifast_sets(cfg, util, count, seed):
+    from rtss.generator import generate_task_sets, poisson_arrivals
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    server = None
+    if cfg.include_server:
+        # Same server sizing as generate_smart_random_tasks
+        server_util = min(0.2, util * 0.25)
+        server = (max(1, int(50 * server_util)), 50)
+        util -= server_util
+    n = max(1, cfg.total_tasks - cfg.num_aperiodic - (1 if server else 0))
+    batch = generate_task_sets(count, n, util, seed=rng, period_range=cfg.period_range)
+    for i in range(count):
+        arrivals = poisson_arrivals(100, cfg.num_aperiodic / 100, seed=rng) if cfg.num_aperiodic else None
+        yield batch.to_tasks(i, server, arrivals)
+
+
+def _task_sets(cfg, util, count, seed):
+    if cfg.generator == "uunifast":
+        yield from _uunifast_sets(cfg, util, count, seed)
+        return
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_smart_random_tasks(cfg.total_tasks, cfg.num_aperiodic, util, cfg.include_server, rng)
+
+
+def run_chunk(chunk):
+    util, count, seed, cfg = chunk
+    counts = {}
+    for tasks in _task_sets(cfg, util, count, seed):
+        for algorithm in cfg.algorithms:
+            for cores in cfg.core_counts:
+                verdict = analyze(tasks, algorithm, cores)['verdict'] if cfg.use_analysis else None
+                if verdict is not None and (algorithm not in SERVER_ALGORITHMS or any(t.task_type == 'S' for t in tasks)):
+                    c = counts.setdefault((algorithm, cores, util), _new_counter())
+                    c['sets'] += 1; c['analytic'] += 1
+                    c['schedulable'] += verdict
+                    continue
+                _, _, stats = run_simulation(tasks, algorithm, cores, max_horizon=cfg.max_horizon)
+                if 'error' in stats: continue
+                c = counts.setdefault((algorithm, cores, util), _new_counter())
+                c['sets'] += 1
+                c['schedulable'] += stats['missed_deadlines'] == 0 and stats['overdue_jobs'] == 0
+                c['truncated'] += stats['truncated']
+                c['missed_deadlines'] += stats['missed_deadlines']
+                c['overdue_jobs'] += stats['overdue_jobs']
+                c['total_jobs'] += stats['total_jobs']
+                c['aperiodic_done'] += stats['aperiodic_done']
+    return counts
+
+
+class ExperimentResult:
+    def __init__(self):
+        self.counts = {}
+        self.chunks_done = 0
+
+    def add(self, partial):
+        for key, c in partial.items():
+            total = self.counts.setdefault(key, _new_counter())
+            for k, v in c.items(): total[k] += v
+        self.chunks_done += 1
+
+    def acceptance_ratio(self, algorithm, cores, util):
+        c = self.counts.get((algorithm, cores, util))
+        return c['schedulable'] / c['sets'] if c and c['sets'] else None
+
+    def rows(self):
+        for (algorithm, cores, util), c in sorted(self.counts.items(), key=lambda kv: (kv[0][0], kv[0][1], kv[0][2])):
+            yield {'algorithm': algorithm, 'cores': cores, 'utilization': util, 'sets': c['sets'],
+                   'schedulable': c['schedulable'], 'acceptance_ratio': round(c['schedulable'] / c['sets'], 6),
+                   'analytic': c['analytic'], 'truncated': c['truncated'], 'missed_deadlines': c['missed_deadlines'], 'overdue_jobs': c['overdue_jobs'], 'total_jobs': c['total_jobs'], 'aperiodic_done': c['aperiodic_done']}
+
+
+# progress: optional callback(result, chunks_done, chunks_total), called as chunks finish
+def run_experiment(cfg, max_workers=None, progress=None):
+    chunks = list(cfg.chunks())
+    result = ExperimentResult()
+    if max_workers == 1:
+        for chunk in chunks:
+            result.add(run_chunk(chunk))
+            if progress: progress(result, result.chunks_done, len(chunks))
+        return result
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        for future in as_completed([pool.submit(run_chunk, chunk) for chunk in chunks]):
+            result.add(future.result())
+            if progress: progress(result, result.chunks_done, len(chunks))
+    return result
+
+
+def write_csv(result, out):
+    rows = list(result.rows())
+    writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()) if rows else ['algorithm'])
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(prog="python -m rtss.experiments", description="Acceptance-ratio experiments over random task sets")
+    parser.add_argument("--util", type=float, nargs=3, metavar=("START", "STOP", "STEP"), default=[0.1, 1.0, 0.1], help="target utilization grid (inclusive)")
+    parser.add_argument("--algorithms", nargs="*", choices=ALGORITHMS, metavar="NAME", default=None, help="policies to compare (default: all)")
+    parser.add_argument("--cores", type=int, nargs="*", default=[1])
+    parser.add_argument("--sets", type=int, default=1000, help="task sets per utilization point")
+    parser.add_argument("--tasks", type=int, default=8, help="tasks per set")
+    parser.add_argument("--aperiodic", type=int, default=0)
+    parser.add_argument("--server", action="store_true", help="add a server task (enables the server policies)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=50, help="task sets per work item")
+    parser.add_argument("--generator", choices=["smart", "uunifast"], default="smart", help="task-set generator")
+    parser.add_argument("--periods", type=int, nargs=2, metavar=("MIN", "MAX"), default=[10, 1000], help="period range for the uunifast generator (log-uniform)")
+    parser.add_argument("--analysis", action="store_true", help="skip simulating sets that the analytical tests already decide")
+    parser.add_argument("--max-horizon", type=int, default=DEFAULT_MAX_HORIZON, help="cut longer simulations (ms), see the 'truncated' column")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-o", "--output", default="-", help="CSV file (default: stdout)")
+    return parser
+
+
+def utilization_grid(start, stop, step):
+    n = int(round((stop - start) / step))
+    return [round(start + i * step, 6) for i in range(n + 1)]
+
+
+def main(argv=None, args=None):
+    args = args or build_parser().parse_args(argv)
+    cfg = ExperimentConfig(utilization_grid(*args.util), args.algorithms, args.cores, args.sets, args.tasks,
+                           args.aperiodic, args.server, args.seed, args.chunk, args.generator, args.periods, args.analysis,
+                           args.max_horizon)
+
+    def progress(result, done, total):
+        print(f"\r{done}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    result = run_experiment(cfg, args.workers, progress)
+    print(file=sys.stderr)
+    if args.output == "-": write_csv(result, sys.stdout)
+    else:
+        with open(args.output, "w", newline="") as f: write_csv(result, f)
+    return result
+
+
+if __name__ == "__main__":
+    main()
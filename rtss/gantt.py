@@ -0,0 +1,324 @@
+import bisect
+import heapq
+import io
+import time
+
+from rtss.model import MISS_COLOR
+
+# =============================================================================
+# GANTT RENDERING
+# =============================================================================
+# Shared by both frontends and the headless renderers. Bars are batched into
+# one PolyCollection per colour (a handful of artists instead of one per
+# segment), with rows and colours looked up in precomputed id maps. Labels are
+# culled: only bars that are wide enough on screen at the current zoom get
+# their text, recomputed whenever the x-range changes. For long schedules the
+# desktop viewer goes one step further (SegmentStore + WindowedGantt): only the
+# visible time range is drawn, aggregated per pixel when zoomed out.
+# matplotlib is imported inside the functions so importing this module is free.
+
+
+def row_of(tasks, num_cores):
+    # job -> y position: one row per task (id order) on one core, one per core otherwise
+    if num_cores == 1:
+        rows = {t.id: 10 * (i + 1) for i, t in enumerate(sorted(tasks, key=lambda x: x.id))}
+        return lambda job: rows.get(job['task_id'], 10)
+    return lambda job: 10 * job['core']
+
+
+def draw_bars(ax, schedule, tasks, num_cores, edgecolor='black', linewidth=0.5):
+    # Returns [(start, end, y, job)] in schedule order
+    from matplotlib.collections import PolyCollection
+    row = row_of(tasks, num_cores)
+    colors = {t.id: t.color for t in tasks}
+    groups = {}; bars = []
+    for job in schedule:
+        y = row(job); s = job['start']; e = job['end']
+        color = MISS_COLOR if job['status'] == 'MISS' else colors.get(job['task_id'], 'gray')
+        groups.setdefault(color, []).append(((s, y - 4), (s, y + 4), (e, y + 4), (e, y - 4)))
+        bars.append((s, e, y, job))
+    for color, verts in groups.items():
+        ax.add_collection(PolyCollection(verts, facecolors=color, edgecolors=edgecolor, linewidths=linewidth))
+    return bars
+
+
+class BarLabels:
+    # Text for the bars that are at least min_px wide (plus room for the label)
+    # inside the visible x-range, at most max_labels of them (the widest first)
+    def __init__(self, ax, bars, min_px=6, char_px=6, max_labels=400, **text_kw):
+        self.ax = ax
+        self.bars = sorted((s, e, y, job['label']) for s, e, y, job in bars if job['label'])
+        self.starts = [b[0] for b in self.bars]
+        self.longest = max((e - s for s, e, _, _ in self.bars), default=0)
+        self.min_px = min_px; self.char_px = char_px; self.max_labels = max_labels
+        self.text_kw = dict(ha='center', va='center', color='white', fontsize=8, fontweight='bold', clip_on=True)
+        self.text_kw.update(text_kw)
+        self.texts = []
+        ax.callbacks.connect('xlim_changed', self.update)
+        ax.figure.canvas.mpl_connect('resize_event', lambda event: self.update())
+        self.update(ax)
+
+    def update(self, ax=None):
+        for text in self.texts: text.remove()
+        self.texts = []
+        x0, x1 = self.ax.get_xlim()
+        if x1 <= x0 or not self.bars: return
+        px = self.ax.get_window_extent().width / (x1 - x0)
+        lo = bisect.bisect_left(self.starts, x0 - self.longest)
+        hi = bisect.bisect_right(self.starts, x1)
+        fits = label_fits((b for b in self.bars[lo:hi] if b[1] > x0), px, self.min_px, self.char_px, self.max_labels)
+        self.texts = [self.ax.text((s + e) / 2, y, label, **self.text_kw) for s, e, y, label in fits]
+
+
+def label_fits(bars, px, min_px=6, char_px=6, max_labels=400):
+    # (start, end, y, label) bars wide enough at px pixels per ms for their label
+    fits = [b for b in bars if (b[1] - b[0]) * px >= min_px + char_px * len(b[3])]
+    if len(fits) > max_labels: fits = heapq.nlargest(max_labels, fits, key=lambda b: b[1] - b[0])
+    return fits
+
+
+class SegmentStore:
+    # Time-indexed, columnar copy of a schedule (about 60 bytes per segment):
+    # NumPy arrays sorted by (row, start), so the segments inside any x-range are two searchsorted calls per
+    # row away. Bars in a row do not overlap (one core, or one task), except
+    # unknown ids that share the first row.
+    def __init__(self, schedule, tasks, num_cores):
+        import numpy as np
+        row = row_of(tasks, num_cores)
+        task_colors = {t.id: t.color for t in tasks}
+        colors = []; color_index = {}
+        n = len(schedule)
+        start = np.empty(n, np.int64); end = np.empty(n, np.int64); y = np.empty(n, np.int64); color = np.empty(n, np.int32)
+        for i, job in enumerate(schedule):
+            c = MISS_COLOR if job['status'] == 'MISS' else task_colors.get(job['task_id'], 'gray')
+            if c not in color_index: color_index[c] = len(colors); colors.append(c)
+            start[i] = job['start']; end[i] = job['end']; y[i] = row(job); color[i] = color_index[c]
+        self._index(schedule, start, end, y, color, colors)
+
+    @classmethod
+    def from_trace(cls, trace):
+        # Same store from a saved run (rtss.trace), column by column: the
+        # segments are never turned into dicts, except the ones hovered or
+        # labelled. The order is computed from the memory-mapped columns and
+        # each sorted column is gathered from them in one step, so no unsorted
+        # full-length copy is kept alongside the sorted one.
+        import numpy as np
+        seg = trace.segments
+        if trace.num_cores == 1:
+            task_id = seg['task_id']
+            ids = np.array(sorted(t.id for t in trace.tasks), np.int64)
+            k = np.minimum(np.searchsorted(ids, task_id), max(len(ids) - 1, 0))
+            y = np.where(ids[k] == task_id, 10 * (k + 1), 10).astype(np.int32) if len(ids) else np.full(len(seg), 10, np.int32)
+            del k
+        else:
+            y = 10 * seg['core'].astype(np.int32)
+        order = np.lexsort((seg['start'], y))
+        y = y[order]
+        start = seg['start'][order].astype(np.int64, copy=False)
+        end = start + seg['duration'][order]
+        # Colour per (task, missed): one lookup per distinct pair
+        miss = trace.statuses.index('MISS') if 'MISS' in trace.statuses else -1
+        task_id = seg['task_id'][order]
+        pairs, inverse = np.unique(np.where(seg['status'][order] == miss, -1, task_id), return_inverse=True)
+        del task_id
+        task_colors = {t.id: t.color for t in trace.tasks}
+        colors = []; color_index = {}; codes = []
+        for tid in pairs.tolist():
+            c = MISS_COLOR if tid == -1 else task_colors.get(tid, 'gray')
+            if c not in color_index: color_index[c] = len(colors); colors.append(c)
+            codes.append(color_index[c])
+        color = np.array(codes, np.int32)[inverse.ravel()] if len(seg) else np.empty(0, np.int32)
+        store = cls.__new__(cls)
+        store._index(trace, start, end, y, color, colors, order)
+        return store
+
+    def _index(self, schedule, start, end, y, color, colors, order=None):
+        # order: the (row, start) order when the columns are already sorted by it
+        import numpy as np
+        self.colors = colors
+        n = len(start)
+        if order is None:
+            order = np.lexsort((start, y))
+            start = start[order]; end = end[order]; y = y[order]; color = color[order]
+        self.schedule = schedule; self.order = order
+        self.start = start; self.end = end; self.y = y; self.color = color
+        self.ys = np.unique(self.y)
+        bounds = np.searchsorted(self.y, np.append(self.ys, self.ys[-1] + 1 if n else 0))
+        self.rows = {}
+        for k, yv in enumerate(self.ys.tolist()):
+            lo, hi = int(bounds[k]), int(bounds[k + 1])
+            self.rows[yv] = (lo, hi, int((self.end[lo:hi] - self.start[lo:hi]).max()))
+        # Per (row, colour) prefix sums of busy time, for the zoomed-out view
+        self.groups = {}
+        for yv, (lo, hi, _) in self.rows.items():
+            colors = self.color[lo:hi]
+            for c in np.unique(colors).tolist():
+                pick = np.flatnonzero(colors == c) + lo
+                s = self.start[pick]; length = self.end[pick] - s
+                self.groups.setdefault(yv, []).append((c, s, length, np.concatenate(([0], np.cumsum(length)))))
+        self.half = 4
+
+    def __len__(self):
+        return len(self.start)
+
+    def job(self, i):
+        return self.schedule[self.order[i]]
+
+    def visible(self, x0, x1):
+        # Indices (in store order) of the segments that intersect [x0, x1]
+        import numpy as np
+        parts = []
+        for lo, hi, longest in self.rows.values():
+            a = lo + int(np.searchsorted(self.start[lo:hi], x0 - longest, 'left'))
+            b = lo + int(np.searchsorted(self.start[lo:hi], x1, 'right'))
+            if b > a: parts.append(np.arange(a, b)[self.end[a:b] > x0])
+        return np.concatenate(parts) if parts else np.empty(0, np.int64)
+
+    def coverage(self, x0, x1, bins):
+        # Level of detail: [x0, x1] cut into bins; per row, runs of bins with
+        # the same dominant colour (most busy time) become one bar.
+        # Returns [(start, end, y, colour index)]
+        import numpy as np
+        edges = np.linspace(x0, x1, bins + 1)
+        runs = []
+        for yv, groups in self.groups.items():
+            busy = np.empty((len(groups), bins))
+            for g, (c, s, length, cum) in enumerate(groups):
+                k = np.searchsorted(s, edges, 'right') - 1
+                kk = np.maximum(k, 0)
+                f = np.where(k >= 0, cum[kk] + np.clip(edges - s[kk], 0, length[kk]), 0.0)
+                busy[g] = np.diff(f)
+            best = busy.argmax(axis=0)
+            key = np.where(busy.max(axis=0) > 0, best, -1)
+            cuts = np.concatenate(([0], np.flatnonzero(np.diff(key)) + 1, [bins]))
+            for a, b in zip(cuts[:-1].tolist(), cuts[1:].tolist()):
+                if key[a] >= 0: runs.append((float(edges[a]), float(edges[b]), yv, groups[int(key[a])][0]))
+        return runs
+
+    def find(self, x, y):
+        # The bar under (x, y), as (start, end, job), or None
+        import numpy as np
+        i = int(np.searchsorted(self.ys, y - self.half, 'left'))
+        if i == len(self.ys) or self.ys[i] > y + self.half: return None
+        lo, hi, _ = self.rows[int(self.ys[i])]
+        j = lo + int(np.searchsorted(self.start[lo:hi], x, 'right')) - 1
+        for k in (j, j - 1):
+            if lo <= k < hi and self.start[k] <= x <= self.end[k]: return int(self.start[k]), int(self.end[k]), self.job(k)
+        return None
+
+
+class WindowedGantt:
+    # Draws only what intersects the current x-range, re-rendered on every
+    # xlim change (pan, zoom, scrolling) and resize. Up to max_bars visible
+    # segments are drawn exactly, with labels; past that the range is drawn
+    # from SegmentStore.coverage at about px_per_bin screen pixels per bin.
+    # Either way the axes hold a bounded number of artists.
+    def __init__(self, ax, store, horizon, max_bars=3000, px_per_bin=2, edgecolor='black', linewidth=0.5, **text_kw):
+        self.ax = ax; self.store = store; self.horizon = max(horizon, 1)
+        self.max_bars = max_bars; self.px_per_bin = px_per_bin
+        self.edgecolor = edgecolor; self.linewidth = linewidth
+        self.text_kw = dict(ha='center', va='center', color='white', fontsize=8, fontweight='bold', clip_on=True)
+        self.text_kw.update(text_kw)
+        self.artists = []; self.detailed = True
+        ax.callbacks.connect('xlim_changed', self.update)
+        ax.figure.canvas.mpl_connect('resize_event', lambda event: self.update())
+        self.update()
+
+    def update(self, ax=None):
+        from matplotlib.collections import PolyCollection
+        for artist in self.artists: artist.remove()
+        self.artists = []
+        x0, x1 = self.ax.get_xlim()
+        if x1 <= x0 or not len(self.store): return
+        store = self.store
+        width = max(self.ax.get_window_extent().width, 1)
+        idx = store.visible(x0, x1)
+        self.detailed = len(idx) <= self.max_bars
+        if self.detailed:
+            bars = list(zip(store.start[idx].tolist(), store.end[idx].tolist(), store.y[idx].tolist(), store.color[idx].tolist()))
+        else:
+            lo, hi = max(x0, 0), min(x1, self.horizon)
+            bins = max(int(width * (hi - lo) / (x1 - x0) / self.px_per_bin), 1)
+            bars = store.coverage(lo, hi, bins) if hi > lo else []
+        groups = {}
+        for s, e, y, c in bars: groups.setdefault(c, []).append(((s, y - 4), (s, y + 4), (e, y + 4), (e, y - 4)))
+        edge = self.edgecolor if self.detailed else 'none'
+        for c, verts in groups.items():
+            self.artists.append(self.ax.add_collection(PolyCollection(verts, facecolors=store.colors[c], edgecolors=edge, linewidths=self.linewidth)))
+        if self.detailed:
+            labeled = ((s, e, y, store.job(i)['label']) for i, (s, e, y, _) in zip(idx.tolist(), bars))
+            fits = label_fits((b for b in labeled if b[3]), width / (x1 - x0))
+            self.artists += [self.ax.text((s + e) / 2, y, label, **self.text_kw) for s, e, y, label in fits]
+
+    def span(self):
+        # Visible range as fractions of [0, horizon] (for a scrollbar)
+        x0, x1 = self.ax.get_xlim()
+        return max(x0 / self.horizon, 0.0), min(x1 / self.horizon, 1.0)
+
+    def pan_to(self, fraction):
+        x0, x1 = self.ax.get_xlim(); w = x1 - x0
+        x0 = min(max(fraction * self.horizon, 0), max(self.horizon - w, 0))
+        self.ax.set_xlim(x0, x0 + w)
+
+    def zoom(self, x, factor):
+        # Zoom around x; factor > 1 zooms in. Never wider than the full run
+        x0, x1 = self.ax.get_xlim()
+        w = min((x1 - x0) / factor, self.horizon)
+        x0 = min(max(x - (x - x0) / factor, 0), self.horizon - w)
+        self.ax.set_xlim(x0, x0 + w)
+
+
+class DrawThrottle:
+    # Coalesces redraw requests to at most one per interval; a request that
+    # changes what is shown (force) always goes through. A dropped request
+    # leaves one single-shot timer behind, so the last state still gets drawn.
+    def __init__(self, canvas, interval=1 / 30):
+        self.canvas = canvas; self.interval = interval; self.last = 0.0
+        self.timer = None
+
+    def request(self, force=False):
+        now = time.monotonic()
+        if force or now - self.last >= self.interval:
+            self._draw(now)
+        elif self.timer is None:
+            self.timer = self.canvas.new_timer(interval=max(1, int(1000 * (self.interval - (now - self.last)))))
+            self.timer.single_shot = True
+            self.timer.add_callback(self._trailing)
+            self.timer.start()
+
+    def _trailing(self):
+        self.timer = None
+        self._draw(time.monotonic())
+
+    def _draw(self, now):
+        if self.timer is not None:
+            self.timer.stop(); self.timer = None
+        self.last = now
+        self.canvas.draw_idle()
+
+
+def render_png(schedule, tasks, simulation_time, num_cores, algorithm, width=6.0, dpi=80):
+    # Straight to PNG bytes with the Agg canvas: no pyplot, no GUI backend and
+    # no global figure state, so it is safe inside worker processes
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    is_single_core = (num_cores == 1)
+    tasks = sorted(tasks, key=lambda x: x.id)
+    n_rows = len(tasks) if is_single_core else num_cores
+
+    fig = Figure(figsize=(width, 0.9 + 0.22 * n_rows), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(0, max(simulation_time, 1))
+    ax.set_ylim(0, 10 * (n_rows + 1))
+    ax.set_yticks([10 * (i + 1) for i in range(n_rows)])
+    ax.set_yticklabels([f"T{t.id}" for t in tasks] if is_single_core else [f"C{i + 1}" for i in range(n_rows)], fontsize=6)
+    ax.tick_params(axis='x', labelsize=6)
+    ax.set_title(algorithm, fontsize=8, fontweight='bold')
+    draw_bars(ax, schedule, tasks, num_cores, linewidth=0)
+
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
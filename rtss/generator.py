@@ -0,0 +1,97 @@
+import numpy as np
+
+from rtss.model import APERIODIC_COLOR, PERIODIC_COLOR, SERVER_COLOR, Task
+
+# =============================================================================
+# VECTORIZED TASK-SET GENERATOR
+# =============================================================================
+# Generates K periodic task sets of n tasks at once as (K, n) NumPy arrays.
+#   utilizations : UUniFast (uniform over the simplex sum = U), or
+#                  UUniFast-Discard for multicore totals (U up to m) where every
+#                  task must stay below max_task_util
+#   periods      : log-uniform (or uniform) integers in [t_min, t_max]
+#   C = round(u * T) clipped to [1, T]; D = T (implicit) or uniform in [C, T]
+# Everything is reproducible from one seed (np.random.default_rng).
+
+
+def uunifast(rng, k, n, total_util):
+    # Normalized exponentials are uniform over the simplex, which is exactly the
+    # UUniFast distribution, in one vectorized draw instead of n-1 steps
+    e = rng.exponential(size=(k, n))
+    return total_util * e / e.sum(axis=1, keepdims=True)
+
+
+def uunifast_discard(rng, k, n, total_util, max_task_util=1.0, max_rounds=10000):
+    if total_util > n * max_task_util:
+        raise ValueError(f"U={total_util} cannot be split over {n} tasks with u <= {max_task_util}")
+    util = uunifast(rng, k, n, total_util)
+    bad = util.max(axis=1) > max_task_util
+    rounds = 0
+    while bad.any():
+        rounds += 1
+        if rounds > max_rounds:
+            raise ValueError(f"UUniFast-Discard did not converge for U={total_util}, n={n}")
+        util[bad] = uunifast(rng, int(bad.sum()), n, total_util)
+        bad = util.max(axis=1) > max_task_util
+    return util
+
+
+def draw_periods(rng, k, n, t_min, t_max, log_uniform=True, granularity=1):
+    if log_uniform:
+        periods = np.exp(rng.uniform(np.log(t_min), np.log(t_max + granularity), size=(k, n)))
+    else:
+        periods = rng.uniform(t_min, t_max + granularity, size=(k, n))
+    periods = np.floor(periods / granularity) * granularity
+    return np.clip(periods, t_min, t_max).astype(np.int64)
+
+
+class TaskSetBatch:
+    def __init__(self, C, T, D, O, util):
+        self.C = C; self.T = T; self.D = D; self.O = O
+        self.util = util
+
+    def __len__(self):
+        return self.C.shape[0]
+
+    def total_utilization(self):
+        return (self.C / self.T).sum(axis=1)
+
+    def to_tasks(self, index, server=None, arrivals=None):
+        # server: optional (capacity, period); arrivals: optional (N, 2) array of (arrival, exec)
+        tasks = []
+        if server is not None:
+            tasks.append(Task('S', list(server), 'S', color=SERVER_COLOR))
+        for o, c, t, d in zip(self.O[index].tolist(), self.C[index].tolist(), self.T[index].tolist(), self.D[index].tolist()):
+            tasks.append(Task('P', [o, c, t, d], 'P', color=PERIODIC_COLOR))
+        if arrivals is not None:
+            for r, e in np.asarray(arrivals).tolist():
+                tasks.append(Task('A', [r, e], 'A', color=APERIODIC_COLOR))
+        return [t.replace(id=i + 1) for i, t in enumerate(tasks)]
+
+
+def generate_task_sets(k, n, total_util, seed=None, max_task_util=1.0,
+                       period_range=(10, 1000), log_uniform=True, granularity=1,
+                       constrained_deadlines=False, offsets=False):
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    if total_util > max_task_util:
+        util = uunifast_discard(rng, k, n, total_util, max_task_util)
+    else:
+        util = uunifast(rng, k, n, total_util)
+    T = draw_periods(rng, k, n, period_range[0], period_range[1], log_uniform, granularity)
+    C = np.clip(np.rint(util * T), 1, T).astype(np.int64)
+    if constrained_deadlines:
+        D = np.floor(rng.uniform(C, T + 1)).astype(np.int64)
+    else:
+        D = T.copy()
+    O = np.floor(rng.uniform(0, T)).astype(np.int64) if offsets else np.zeros_like(T)
+    return TaskSetBatch(C, T, D, O, util)
+
+
+def poisson_arrivals(horizon, rate, exec_range=(1, 5), seed=None):
+    # Aperiodic requests with exponential inter-arrival times (rate per ms);
+    # returns an (N, 2) int64 array of (arrival, exec), sorted by arrival
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    count = rng.poisson(rate * horizon)
+    arrivals = np.sort(np.floor(rng.uniform(0, horizon, size=count))).astype(np.int64)
+    execs = rng.integers(exec_range[0], exec_range[1] + 1, size=count)
+    return np.column_stack([arrivals, execs])
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rtss.model import TASK_COLORS, _restore_task, parse_checked
+
+# =============================================================================
+# TASK LIBRARIES
+# =============================================================================
+# Bulk ingestion of many task-set files: directories (searched recursively),
+# multi-set archives (.zip, .tar, .tar.gz / .tgz, .tar.bz2, .tar.xz; every .txt
+# member is one set) and single files. Sets are parsed in worker processes,
+# chunk_size at a time, with rtss.model.parse_checked: nothing stops at the
+# first bad line, every skipped token or line ends up in the diagnostics.
+# With a cache directory the parsed sets are kept in binary form:
+#   tasks.npy  : int64 rows (letter, id, arrival, burst, period, deadline,
+#                relative deadline, server capacity), all sets back to back
+#   index.json : per file its (mtime_ns, size, SHA-256 of the content), per
+#                content hash its rows and diagnostics, the letter table
+# A file whose size and mtime are unchanged is not even read; a touched file
+# whose content hash is still the one recorded for it is read and hashed but
+# not parsed again. Archive members count with the mtime and size of their
+# archive. Files and archives the current scan no longer finds are dropped
+# from the index, and their rows with them.
+
+CACHE_VERSION = 1
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+ROW_FIELDS = ('id', 'arrival_time', 'burst_time', 'period', 'deadline', 'relative_deadline', 'server_capacity')
+
+
+def is_archive(path):
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _task_type(letter):
+    return letter if letter in ('A', 'S') else 'P'
+
+
+def pack_tasks(tasks, letters):
+    # (n, 8) int64 rows; letters is the table the first column points into (extended in place)
+    rows = []
+    for t in tasks:
+        if t.original_char not in letters: letters.append(t.original_char)
+        rows.append([letters.index(t.original_char)] + [getattr(t, f) for f in ROW_FIELDS])
+    return np.array(rows, np.int64).reshape(len(rows), 1 + len(ROW_FIELDS))
+
+
+def unpack_tasks(rows, letters):
+    tasks = []
+    for row in rows.tolist():
+        letter = letters[row[0]]; task_type = _task_type(letter)
+        # Same field order as Task.__slots__
+        tasks.append(_restore_task(task_type, letter, row[1], TASK_COLORS[task_type], *row[2:]))
+    return tasks
+
+
+def parse_bytes(data):
+    try: text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        tasks, notes = parse_checked(data.decode('utf-8', errors='replace'))
+        return tasks, [(0, "not valid UTF-8, undecodable bytes replaced")] + notes
+    return parse_checked(text)
+
+
+def parse_chunk(chunk):
+    # [(name, source, known digest)] -> [(name, digest, packed, letters, diagnostics)]; source
+    # is a path or the content. packed is pack_tasks' rows, or the Task list itself (letters
+    # None) when a value does not fit int64; digest is None when the file could not be read.
+    # Content matching the known digest (the cached one) is not parsed: packed is None.
+    out = []
+    for name, source, known in chunk:
+        if isinstance(source, str):
+            try:
+                with open(source, 'rb') as f: source = f.read()
+            except OSError as e:
+                out.append((name, None, None, None, [(0, f"cannot read: {e.strerror or e}")])); continue
+        digest = hashlib.sha256(source).hexdigest()
+        if digest == known:
+            out.append((name, digest, None, None, None)); continue
+        tasks, notes = parse_bytes(source)
+        letters = []
+        try: out.append((name, digest, pack_tasks(tasks, letters), letters, notes))
+        except OverflowError: out.append((name, digest, tasks, None, [(0, "values beyond 64 bits, set kept out of the cache")] + notes))
+    return out
+
+
+def _parse_all(chunks, max_workers):
+    if max_workers == 1 or len(chunks) <= 1:
+        yield from map(parse_chunk, chunks); return
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(chunks), os.cpu_count() or 1)) as pool:
+        yield from pool.map(parse_chunk, chunks)
+
+
+def library_sources(paths):
+    # Every plain set file and archive under paths, directories in sorted order
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path; continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith('.txt') or is_archive(name): yield os.path.join(root, name)
+
+
+def archive_members(path):
+    # (member name, content) of every .txt member
+    if path.lower().endswith('.zip'):
+        with zipfile.ZipFile(path) as z:
+            for info in z.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.txt'): yield info.filename, z.read(info)
+        return
+    with tarfile.open(path) as tar:
+        for member in tar:
+            if member.isfile() and member.name.lower().endswith('.txt'): yield member.name, tar.extractfile(member).read()
+
+
+class LibraryCache:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.files = {}; self.archives = {}; self.sets = {}; self.letters = []
+        self.rows = np.empty((0, 1 + len(ROW_FIELDS)), np.int64)
+        self.new_rows = []; self.size = 0
+        try:
+            with open(os.path.join(directory, 'index.json')) as f: index = json.load(f)
+            if index.get('version') == CACHE_VERSION:
+                self.rows = np.load(os.path.join(directory, 'tasks.npy'), mmap_mode='r')
+                self.files = index['files']; self.archives = index['archives']; self.sets = index['sets']; self.letters = index['letters']
+        except (OSError, ValueError, KeyError): pass  # no cache yet, or an unreadable one: start over
+        self.size = len(self.rows)
+
+    def lookup(self, key, stat):
+        # Content hash of an unchanged file, or None
+        entry = self.files.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size and entry[2] in self.sets: return entry[2]
+        return None
+
+    def known(self, key):
+        # Content hash last recorded for key, whatever its stat
+        entry = self.files.get(key)
+        return entry[2] if entry and entry[2] in self.sets else None
+
+    def prune(self, keys, archives):
+        # Forgets the files and archives outside the current scan; True if any
+        gone = [k for k in self.files if k not in keys] + [a for a in self.archives if a not in archives]
+        self.files = {k: v for k, v in self.files.items() if k in keys}
+        self.archives = {a: v for a, v in self.archives.items() if a in archives}
+        return bool(gone)
+
+    def get(self, digest):
+        offset, count, notes = self.sets[digest]
+        return unpack_tasks(self._rows(offset, count), self.letters), [tuple(n) for n in notes]
+
+    def _rows(self, offset, count):
+        # Saved rows come from the memory map, the ones added since from new_rows
+        if not count or offset + count <= len(self.rows): return np.asarray(self.rows[offset:offset + count])
+        start = len(self.rows)
+        for rows in self.new_rows:
+            if start == offset and len(rows): return rows
+            start += len(rows)
+        raise KeyError(offset)
+
+    def add(self, key, stat, digest, rows, letters, notes):
+        self.files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        if digest in self.sets: return
+        remap = []
+        for letter in letters:
+            if letter not in self.letters: self.letters.append(letter)
+            remap.append(self.letters.index(letter))
+        rows = rows.copy()
+        if len(rows): rows[:, 0] = np.array(remap, np.int64)[rows[:, 0]]
+        self.sets[digest] = [self.size, len(rows), [list(n) for n in notes]]
+        self.new_rows.append(rows); self.size += len(rows)
+
+    def save(self):
+        # Rewrites both files (atomically), keeping only the sets some file still points to
+        used = {entry[2] for entry in self.files.values()}
+        parts = []; sets = {}; offset = 0
+        for digest, (start, count, notes) in self.sets.items():
+            if digest not in used: continue
+            parts.append(self._rows(start, count))
+            sets[digest] = [offset, count, notes]; offset += count
+        rows = np.concatenate(parts) if parts else np.empty((0, 1 + len(ROW_FIELDS)), np.int64)
+        self.rows = rows; del parts  # drop the old memory map before replacing its file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f: np.save(f, rows)
+        os.replace(tmp, os.path.join(self.directory, 'tasks.npy'))
+        index = {'version': CACHE_VERSION, 'letters': self.letters, 'files': self.files, 'archives': self.archives, 'sets': sets}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f: json.dump(index, f)
+        os.replace(tmp, os.path.join(self.directory, 'index.json'))
+        self.sets = sets; self.new_rows = []; self.size = len(rows)
+
+
+class IngestResult:
+    def __init__(self):
+        self.sets = []          # (name, tasks) in source order
+        self.diagnostics = []   # (name, line, message); line 0: about the whole file
+        self.parsed = 0
+        self.cached = 0
+        self.failed = 0
+
+    def rows(self):
+        # One summary row per set that could be read
+        counts = {}
+        for name, _, _ in self.diagnostics: counts[name] = counts.get(name, 0) + 1
+        for name, tasks in self.sets: yield {'file': name, 'tasks': len(tasks), 'diagnostics': counts.get(name, 0)}
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size): yield items[i:i + size]
+
+
+# paths: directories, archives and files; cache_dir: optional LibraryCache
+# directory; progress: optional callback(sets done, sets to parse)
+def ingest(paths, cache_dir=None, max_workers=None, chunk_size=256, progress=None):
+    cache = LibraryCache(cache_dir) if cache_dir else None
+    result = IngestResult()
+    order = []; done = {}; pending = []; stats = {}; archives = set()
+    for path in library_sources(paths):
+        try: stat = os.stat(path)
+        except OSError as e:
+            order.append(path); done[path] = None; result.diagnostics.append((path, 0, f"cannot read: {e.strerror or e}")); continue
+        if not is_archive(path):
+            order.append(path); stats[path] = stat
+            digest = cache.lookup(path, stat) if cache else None
+            if digest: done[path] = digest
+            else: pending.append((path, path, cache.known(path) if cache else None))
+            continue
+        archives.add(path)
+        listed = cache.archives.get(path) if cache else None
+        if listed and listed[0] == stat.st_mtime_ns and listed[1] == stat.st_size and all(cache.lookup(f"{path}::{m}", stat) for m in listed[2]):
+            for m in listed[2]:
+                key = f"{path}::{m}"; order.append(key); done[key] = cache.lookup(key, stat)
+            continue
+        try: members = list(archive_members(path))
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            order.append(path); done[path] = None; result.diagnostics.append((path, 0, f"cannot read archive: {e}")); continue
+        if cache: cache.archives[path] = [stat.st_mtime_ns, stat.st_size, [m for m, _ in members]]
+        for member, data in members:
+            key = f"{path}::{member}"; order.append(key); stats[key] = stat; pending.append((key, data, cache.known(key) if cache else None))
+
+    parsed = {}
+    for out in _parse_all(list(_chunks(pending, chunk_size)), max_workers):
+        for name, digest, packed, letters, notes in out:
+            parsed[name] = (digest, packed, letters, notes)
+            if cache and digest and letters is not None: cache.add(name, stats[name], digest, packed, letters, notes)
+            elif cache and digest and packed is None: cache.add(name, stats[name], digest, None, None, None)
+        if progress: progress(len(parsed), len(pending))
+
+    for name in order:
+        if name in parsed:
+            digest, packed, letters, notes = parsed[name]
+            if digest is None:
+                result.failed += 1; result.diagnostics.extend((name, line, msg) for line, msg in notes); continue
+            if packed is None:
+                tasks, notes = cache.get(digest); result.cached += 1
+            else:
+                tasks = packed if letters is None else unpack_tasks(packed, letters)
+                result.parsed += 1
+        elif done.get(name):
+            tasks, notes = cache.get(done[name]); result.cached += 1
+        else:
+            result.failed += 1; continue
+        result.sets.append((name, tasks))
+        result.diagnostics.extend((name, line, msg) for line, msg in notes)
+    pruned = cache.prune(set(order), archives) if cache else False
+    if cache and (pending or pruned): cache.save()
+    return result
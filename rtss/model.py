@@ -0,0 +1,188 @@
+import random
+
+# =============================================================================
+# DATA STRUCTURES (MODEL)
+# =============================================================================
+# Task is an immutable spec: once parsed, a task set can be shared between
+# runs, threads and Streamlit sessions without copying. Everything that changes
+# during a simulation (remaining work, server budget) lives in the engine.
+
+PERIODIC_COLOR = '#89b4fa'
+SERVER_COLOR = '#a6e3a1'
+APERIODIC_COLOR = '#fab387'
+MISS_COLOR = '#f38ba8'
+TASK_COLORS = {'P': PERIODIC_COLOR, 'S': SERVER_COLOR, 'A': APERIODIC_COLOR}
+
+
+class Task:
+    __slots__ = ('task_type', 'original_char', 'id', 'color', 'arrival_time', 'burst_time',
+                 'period', 'deadline', 'relative_deadline', 'server_capacity')
+
+    def __init__(self, task_type, args, original_char, id=0, color=""):
+        arrival_time = burst_time = period = deadline = relative_deadline = server_capacity = 0
+        n = len(args)
+        if task_type == 'P':
+            if original_char == 'P':
+                if n == 4: arrival_time, burst_time, period, deadline = args
+                elif n == 3: arrival_time, burst_time, period = args; deadline = period
+                elif n == 2: burst_time, period = args; deadline = period
+            elif original_char == 'D':
+                if n == 3: burst_time, period, deadline = args
+                elif n == 4: arrival_time, burst_time, period, deadline = args
+            relative_deadline = deadline
+        elif task_type == 'S':
+            burst_time = args[0]
+            period = args[1]
+            deadline = args[1]
+            relative_deadline = period
+            server_capacity = burst_time
+        elif task_type == 'A':
+            if n >= 2:
+                arrival_time = args[0]
+                burst_time = args[1]
+                deadline = 99999
+                relative_deadline = 99999
+
+        init = object.__setattr__
+        init(self, 'task_type', task_type); init(self, 'original_char', original_char)
+        init(self, 'id', id); init(self, 'color', color)
+        init(self, 'arrival_time', arrival_time); init(self, 'burst_time', burst_time)
+        init(self, 'period', period); init(self, 'deadline', deadline)
+        init(self, 'relative_deadline', relative_deadline); init(self, 'server_capacity', server_capacity)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Task is immutable, use replace({name}=...)")
+
+    def __delattr__(self, name):
+        raise AttributeError("Task is immutable")
+
+    def __reduce__(self):
+        return (_restore_task, tuple(getattr(self, f) for f in Task.__slots__))
+
+    def replace(self, **changes):
+        new = object.__new__(Task)
+        for f in Task.__slots__: object.__setattr__(new, f, changes.get(f, getattr(self, f)))
+        return new
+
+    def __repr__(self):
+        return f"T{self.id}"
+
+
+def _restore_task(*values):
+    task = object.__new__(Task)
+    for f, v in zip(Task.__slots__, values): object.__setattr__(task, f, v)
+    return task
+
+
+class Job:
+    # Runtime record of one released job (or one aperiodic request). start,
+    # core and last_end track its execution for the response-time statistics.
+    __slots__ = ('task', 'remaining', 'abs_deadline', 'seq', 'queued', 'release', 'start', 'core', 'last_end')
+
+    def __init__(self, task, remaining, abs_deadline, release=0):
+        self.task = task
+        self.remaining = remaining
+        self.abs_deadline = abs_deadline
+        self.seq = 0
+        self.queued = False
+        self.release = release
+        self.start = None
+        self.core = 0
+        self.last_end = None
+
+
+# =============================================================================
+# PARSING & GENERATION
+# =============================================================================
+
+def calculate_utilization(tasks):
+    u = 0.0
+    for t in tasks:
+        if t.task_type in ['P', 'S'] and t.period > 0:
+            u += t.burst_time / t.period
+    return u
+
+def parse_content(content):
+    return parse_checked(content, strict=True)[0]
+
+# Value counts the Task constructor understands, per letter
+ARG_COUNTS = {'P': (2, 3, 4), 'D': (3, 4), 'S': (2,), 'A': (2,)}
+
+# parse_content plus diagnostics: (tasks, [(line number, message)]) for every
+# token or line that was skipped or guessed. strict: raise on a line the Task
+# constructor cannot take (parse_content); otherwise skip it with a diagnostic.
+def parse_checked(content, strict=False):
+    tasks = []
+    notes = []
+    task_counter = 1
+    lines = content.split('\n')
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'): continue
+        parts = line.split()
+        if not parts: continue
+
+        char_code = parts[0].upper()
+        clean_args = []; ignored = []
+        for p in parts[1:]:
+            if p.startswith('('): break
+            if p.isdecimal(): clean_args.append(int(p)); continue  # common case, no exception
+            try: clean_args.append(int(p))
+            except ValueError: ignored.append(p)
+        if ignored: notes.append((n, f"ignored non-integer value(s): {' '.join(ignored)}"))
+
+        if not clean_args:
+            notes.append((n, "no integer values, line skipped")); continue
+        t_type = 'P'
+        if char_code == 'A': t_type = 'A'
+        elif char_code == 'S': t_type = 'S'
+        elif char_code == 'D': t_type = 'P'
+        expected = ARG_COUNTS.get(char_code); problem = None
+        if expected is None: notes.append((n, f"unknown task type '{parts[0]}', read as periodic"))
+        elif len(clean_args) not in expected: problem = f"{char_code} takes {' or '.join(map(str, expected))} values, got {len(clean_args)}"
+        try: task = Task(t_type, clean_args, char_code, id=task_counter, color=TASK_COLORS[t_type])
+        except (IndexError, ValueError):
+            if strict: raise
+            notes.append((n, f"{problem or 'not a task'}, line skipped")); continue
+        if problem: notes.append((n, problem))
+        tasks.append(task)
+        task_counter += 1
+    return tasks, notes
+
+# rng: optional random.Random for reproducible sets (defaults to the global generator)
+def generate_smart_random_tasks(total_tasks, num_aperiodic, target_util, include_server, rng=None):
+    rng = rng or random
+    tasks = []
+    current_util_budget = target_util
+    server_task = None
+
+    if include_server:
+        server_util = min(0.2, current_util_budget * 0.25)
+        current_util_budget -= server_util
+        s_period = rng.choice([20, 40, 50])
+        s_cap = max(1, int(s_period * server_util))
+        server_task = Task('S', [s_cap, s_period], 'S', color=SERVER_COLOR)
+
+    num_periodic = total_tasks - num_aperiodic
+    if include_server: num_periodic -= 1
+    if num_periodic < 0: num_periodic = 0
+
+    if num_periodic > 0 and current_util_budget > 0:
+        points = [0.0] + sorted([rng.uniform(0, current_util_budget) for _ in range(num_periodic - 1)]) + [current_util_budget]
+        utilizations = [points[i+1] - points[i] for i in range(num_periodic)]
+        periods_pool = [20, 40, 50, 60, 80, 100, 200]
+        for i in range(num_periodic):
+            p = rng.choice(periods_pool)
+            u = utilizations[i]
+            c = max(1, int(p * u))
+            if c >= p: c = p - 1
+            tasks.append(Task('P', [0, c, p, p], 'P', color=PERIODIC_COLOR))
+
+    if server_task: tasks.insert(0, server_task)
+
+    for i in range(num_aperiodic):
+        arrival = rng.randint(0, 100)
+        exec_time = rng.randint(1, 5)
+        tasks.append(Task('A', [arrival, exec_time], 'A', color=APERIODIC_COLOR))
+
+    return [t.replace(id=i + 1) for i, t in enumerate(tasks)]
@@ -0,0 +1,49 @@
+import numpy as np
+
+# =============================================================================
+# STREAMED .NPY WRITER
+# =============================================================================
+# Writes a 1-D (or N x k) .npy file chunk by chunk without knowing the final
+# length up front: a header sized for the largest possible length is reserved
+# and rewritten with the real shape on close. The result is a plain .npy file,
+# so np.load(path, mmap_mode='r') opens it without reading it into memory.
+
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _header(dtype, shape, size=None):
+    d = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': shape}
+    body = repr(d).encode('latin1')
+    if size is None:
+        size = len(_MAGIC) + 2 + len(body) + 1
+        size += -size % 64
+    pad = size - (len(_MAGIC) + 2 + len(body) + 1)
+    return _MAGIC + (size - len(_MAGIC) - 2).to_bytes(2, 'little') + body + b' ' * pad + b'\n'
+
+
+class NpyStreamWriter:
+    def __init__(self, path, dtype, row_shape=()):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.count = 0
+        self.f = open(path, 'wb')
+        self.header_size = len(_header(self.dtype, (10 ** 18,) + self.row_shape))
+        self.f.write(_header(self.dtype, (0,) + self.row_shape, self.header_size))
+
+    def write(self, rows):
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if rows.size == 0: return
+        self.f.write(rows.tobytes())
+        self.count += rows.shape[0]
+
+    def close(self):
+        if self.f.closed: return
+        self.f.seek(0)
+        self.f.write(_header(self.dtype, (self.count,) + self.row_shape, self.header_size))
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,177 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from rtss.analysis import EDF, analyze, liu_layland_bound
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.engine import DEFAULT_MAX_HORIZON, SERVER_ALGORITHMS, hyperperiod, run_simulation
+from rtss.ready_queue import LLF
+from rtss.stats import QuantileSketch
+
+# =============================================================================
+# PARTITIONED MULTIPROCESSOR SCHEDULING
+# =============================================================================
+# Instead of one global ready queue, every task is bound to one core and each
+# core runs the policy on its own. Tasks are packed in decreasing utilization
+# order (first-fit, best-fit or worst-fit decreasing); a task fits on a core
+# when the core still passes the admission test with it:
+#   utilization : density sum <= 1 (EDF, LLF) or <= the Liu-Layland bound
+#   rta         : rtss.analysis on one core says schedulable (RTA for fixed
+#                 priorities, QPA for EDF / LLF)
+# Tasks that fit nowhere go to the least loaded core and are reported in
+# stats['unassigned']. Zero-load tasks (aperiodic requests, the server under
+# Background) and the arrival trace follow the server, or the least loaded core.
+# Every core is then an independent single-core run, simulated in worker
+# processes and merged into one core-view log (tasks never migrate). Every core
+# runs at least up to the common horizon (largest offset + 2 * lcm of all the
+# periods); cores that reached steady state earlier are repeated (schedule and
+# counters) up to the end of the longest run, and at least over one common
+# hyperperiod once every core repeats. The response-time
+# statistics cover the simulated part, which the repetitions only copy.
+
+HEURISTICS = ("first-fit", "best-fit", "worst-fit")
+FIT_TESTS = ("utilization", "rta")
+RM = "Rate Monotonic (RM)"
+
+
+def load(task, algorithm):
+    # Share of one core the task can claim (density, for constrained deadlines)
+    if task.period <= 0 or task.task_type == 'A': return 0.0
+    if task.task_type == 'S' and algorithm == "Background": return 0.0
+    return task.burst_time / min(task.deadline, task.period) if task.deadline > 0 else math.inf
+
+
+def core_algorithm(algorithm, tasks):
+    # Server policies schedule periodic work with RM; a core without the server runs plain RM
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks): return RM
+    return algorithm
+
+
+def fits(tasks, algorithm, test):
+    algorithm = core_algorithm(algorithm, tasks)
+    if test == "rta": return analyze(tasks, algorithm, 1)['verdict'] is True
+    loaded = [load(t, algorithm) for t in tasks if load(t, algorithm) > 0]
+    return sum(loaded) <= (1 if algorithm in (EDF, LLF) else liu_layland_bound(len(loaded)))
+
+
+# Returns ([tasks of core 1, ..., core m] in id order, ids of the tasks that fit nowhere, home core index)
+def partition_tasks(tasks, num_cores, algorithm, heuristic="first-fit", test="utilization"):
+    if heuristic not in HEURISTICS: raise ValueError(f"Unknown heuristic: {heuristic} (expected one of {', '.join(HEURISTICS)})")
+    if test not in FIT_TESTS: raise ValueError(f"Unknown admission test: {test} (expected one of {', '.join(FIT_TESTS)})")
+    bins = [[] for _ in range(num_cores)]; loads = [0.0] * num_cores
+    unassigned = []
+    heavy = sorted((t for t in tasks if load(t, algorithm) > 0), key=lambda t: (-load(t, algorithm), t.id))
+    for task in heavy:
+        ok = [k for k in range(num_cores) if fits(bins[k] + [task], algorithm, test)]
+        if not ok: k = min(range(num_cores), key=lambda k: loads[k]); unassigned.append(task.id)
+        elif heuristic == "first-fit": k = ok[0]
+        elif heuristic == "best-fit": k = max(ok, key=lambda k: loads[k])
+        else: k = min(ok, key=lambda k: loads[k])
+        bins[k].append(task); loads[k] += load(task, algorithm)
+    # Aperiodic work goes to the core of the server the engine picks (lowest id)
+    servers = sorted((t.id, k) for k, b in enumerate(bins) for t in b if t.task_type == 'S')
+    home = servers[0][1] if servers else min(range(num_cores), key=lambda k: loads[k])
+    bins[home].extend(t for t in tasks if load(t, algorithm) == 0)
+    return [sorted(b, key=lambda t: t.id) for b in bins], unassigned, home
+
+
+def analyze_partitions(bins, algorithm):
+    # Per-core verdicts combined: schedulable when every core is, not when any core is not
+    result = {'verdict': True, 'test': "partitioned", 'utilization': 0.0, 'tests': {}, 'response_times': {}}
+    for k, core_tasks in enumerate(bins):
+        r = analyze(core_tasks, core_algorithm(algorithm, core_tasks), 1)
+        result['tests'][f"Core {k + 1}: {r['test']}"] = r['verdict']
+        result['utilization'] += r['utilization']; result['response_times'].update(r['response_times'])
+        if r['verdict'] is False: result['verdict'] = False
+        elif r['verdict'] is None and result['verdict'] is True: result['verdict'] = None
+    return result
+
+
+def simulate_partition(job):
+    tasks, algorithm, trace, first_id, max_horizon, min_horizon = job
+    arrivals = read_arrival_trace(trace, first_id) if trace else None
+    return run_simulation(tasks, algorithm, 1, arrivals, max_horizon, min_horizon)
+
+
+def common_horizon(tasks, algorithm):
+    # Largest offset + 2 * lcm of every periodic task (and the server), None without periods:
+    # every core runs at least this long unless it repeats earlier
+    periodic = [t for t in tasks if t.period > 0 and (t.task_type == 'P' or (t.task_type == 'S' and algorithm != "Background"))]
+    period = hyperperiod(periodic)
+    return max(t.arrival_time for t in periodic) + 2 * period if period else None
+
+
+def _releases(task, t):
+    # Releases of a periodic task before t
+    return max(0, -(-(t - task.arrival_time) // task.period))
+
+
+def _repeat(schedule, tasks, algorithm, horizon, stats, until):
+    # Tiles the last hyperperiod of a steady-state run over [horizon, until)
+    period = stats['hyperperiod']; base = horizon - period
+    last = [dict(seg) for seg in schedule if seg['end'] > base]  # copies: the tail below may grow in place
+    out = list(schedule); misses = 0
+    start = horizon
+    while start < until:
+        for seg in last:
+            s = max(seg['start'], base) - base + start; e = min(seg['end'] - base + start, until)
+            if s >= e: break
+            prev = out[-1] if out else None
+            if prev is not None and prev['end'] == s and all(prev[k] == seg[k] for k in ('task_id', 'label', 'status')): prev['end'] = e
+            else: out.append(dict(seg, start=s, end=e))
+            if seg['status'] == 'MISS': misses += e - s
+        start += period
+    periodic = [t for t in tasks if t.period > 0 and (t.task_type == 'P' or (t.task_type == 'S' and algorithm != "Background"))]
+    jobs = sum(_releases(t, until) - _releases(t, horizon) for t in periodic)
+    return out, jobs, misses
+
+
+# Same contract as rtss.engine.run_simulation, cores in the schedule are the
+# partitions. trace is a path (read in the worker that needs it). Extra stats:
+#   'partitions': per core {'core', 'tasks' (ids), 'algorithm', 'utilization',
+#                 'horizon', 'missed_deadlines', 'steady_state', 'truncated'}
+#   'unassigned': ids of the tasks that failed the admission test everywhere
+def run_partitioned(tasks, algorithm, num_cores, heuristic="first-fit", test="utilization", trace=None,
+                    max_horizon=DEFAULT_MAX_HORIZON, max_workers=None):
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks):
+        return [], 0, {'error': f"Error: {algorithm} requires a Server (S) task definition."}
+    bins, unassigned, home = partition_tasks(tasks, num_cores, algorithm, heuristic, test)
+    cores = [k for k, b in enumerate(bins) if b or (trace and k == home)]
+    full = common_horizon(tasks, algorithm)
+    floor = min(full, max_horizon) if full else 0
+    jobs = [(bins[k], core_algorithm(algorithm, bins[k]), trace if k == home else None, next_free_id(tasks), max_horizon, floor) for k in cores]
+    if max_workers == 1 or len(jobs) <= 1: runs = [simulate_partition(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+            runs = list(pool.map(simulate_partition, jobs))
+
+    horizon = max((h for _, h, _ in runs), default=0)
+    periods = [s['hyperperiod'] for _, _, s in runs if s['hyperperiod'] is not None]
+    # Once every core repeats, one common hyperperiod after the last one started repeating is enough
+    timed = [(h, s) for _, h, s in runs if s['hyperperiod'] is not None]
+    repeats_from = max((h - s['hyperperiod'] for h, s in timed), default=0)
+    steady = bool(timed) and all(s['steady_state'] for _, s in timed)
+    if steady: horizon = min(max(horizon, repeats_from + math.lcm(*periods)), max_horizon)
+    stats = {'total_jobs': 0, 'missed_deadlines': 0, 'aperiodic_done': 0, 'overdue_jobs': 0,
+             'hyperperiod': math.lcm(*periods) if periods else None, 'steady_state': False, 'truncated': False,
+             'preemptions': 0, 'migrations': 0, 'tasks': {}, 'aperiodic_response': QuantileSketch().summary(),
+             'partitions': [], 'unassigned': unassigned}
+    schedule = []
+    for k, job, (segments, h, s) in zip(cores, jobs, runs):
+        jobs_done, misses = s['total_jobs'], s['missed_deadlines']
+        if s['steady_state'] and h < horizon:
+            segments, extra_jobs, extra_misses = _repeat(segments, job[0], job[1], h, s, horizon)
+            jobs_done += extra_jobs; misses += extra_misses
+        for seg in segments: seg['core'] = k + 1
+        schedule.extend(segments)
+        stats['total_jobs'] += jobs_done; stats['missed_deadlines'] += misses; stats['aperiodic_done'] += s['aperiodic_done']
+        stats['truncated'] = stats['truncated'] or s['truncated']
+        stats['preemptions'] += s['preemptions']; stats['overdue_jobs'] += s['overdue_jobs']; stats['tasks'].update(s['tasks'])
+        if k == home: stats['aperiodic_response'] = s['aperiodic_response']  # all aperiodic work runs there
+        stats['partitions'].append({'core': k + 1, 'tasks': [t.id for t in job[0]], 'algorithm': job[1],
+                                    'utilization': round(sum(load(t, job[1]) for t in job[0]), 4), 'horizon': h,
+                                    'missed_deadlines': misses, 'steady_state': s['steady_state'], 'truncated': s['truncated']})
+    stats['tasks'] = dict(sorted(stats['tasks'].items()))
+    stats['steady_state'] = steady and horizon - stats['hyperperiod'] >= repeats_from
+    stats['truncated'] = stats['truncated'] or (steady and not stats['steady_state']) or (not steady and full is not None and full > horizon)
+    return schedule, horizon, stats
@@ -0,0 +1,132 @@
+import time
+
+from rtss.engine import DEFAULT_MAX_HORIZON, SERVER_ALGORITHMS, Simulator
+
+# =============================================================================
+# ENGINE INSTRUMENTATION
+# =============================================================================
+# Opt-in: run_instrumented() runs the same simulation with every hot-path
+# phase of the engine wrapped in a timer, so run_simulation itself carries no
+# instrumentation at all. Phases (exclusive wall-clock time, nested phases are
+# not counted twice):
+#   release      periodic releases            replenish  Sporadic Server budget
+#   admit        aperiodic arrivals           dispatch   picking and running jobs
+#   ready_queue  prepare / pop / push         log        run-length segment appends
+#   fast_forward steady stretches applied at once
+#   boundary     steady-state snapshots at the hyperperiod boundaries
+# stats['profile'] also holds the event (executed tick) count and rate, the
+# peak ready-queue length, optionally tracemalloc totals, and the path of a
+# cProfile dump (pstats format) when one was asked for. The dump comes from a
+# second, uninstrumented run of the same (deterministic) simulation, so it shows
+# the engine's own functions rather than the timers.
+
+PHASES = ('release', 'replenish', 'admit', 'dispatch', 'ready_queue', 'log', 'fast_forward', 'boundary')
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.stack = []
+
+    def wrap(self, name, fn):
+        clock = time.perf_counter; seconds = self.seconds; calls = self.calls; stack = self.stack
+
+        def timed(*args):
+            start = clock(); stack.append(0.0)
+            try: return fn(*args)
+            finally:
+                elapsed = clock() - start
+                seconds[name] += elapsed - stack.pop(); calls[name] += 1
+                if stack: stack[-1] += elapsed
+        return timed
+
+
+class TimedReadyQueue:
+    # Times the ready queue operations and records its peak length (taken
+    # after prepare, when stale entries are gone)
+    def __init__(self, queue, timer):
+        self.queue = queue
+        self.peak = 0
+        self.push = timer.wrap('ready_queue', queue.push)
+        self.push_back = timer.wrap('ready_queue', queue.push_back)
+        self.pop = timer.wrap('ready_queue', queue.pop)
+        self.discard = timer.wrap('ready_queue', queue.discard)
+        self.snapshot = queue.snapshot
+        prepare = timer.wrap('ready_queue', queue.prepare)
+
+        def prepare_and_measure(t):
+            prepare(t)
+            self.peak = max(self.peak, len(queue))
+        self.prepare = prepare_and_measure
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class ProfiledSimulator(Simulator):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timer = timer = PhaseTimer()
+        self.ready = TimedReadyQueue(self.ready, timer)
+        for name, method in (('release', '_release'), ('replenish', '_replenish'), ('admit', '_admit'),
+                             ('dispatch', '_dispatch'), ('log', '_emit'), ('boundary', '_boundary')):
+            setattr(self, method, timer.wrap(name, getattr(self, method)))
+        self._steady_ticks = timer.wrap('fast_forward', self._steady_ticks)
+        self._apply_ticks = timer.wrap('fast_forward', self._apply_ticks)
+
+    def profile(self, wall):
+        events = self.timer.calls['dispatch']
+        return {'wall_seconds': wall, 'events': events, 'events_per_second': events / wall if wall > 0 else None,
+                'simulated_ms_per_second': self.t / wall if wall > 0 else None, 'peak_ready_queue': self.ready.peak,
+                'phases': {name: {'seconds': self.timer.seconds[name], 'calls': self.timer.calls[name]} for name in PHASES}}
+
+
+# Same contract as rtss.engine.run_simulation, plus stats['profile'].
+# arrivals: a source, or a function returning a fresh one; with pstats_path
+#   both runs need their own, so pass a function for a long streamed trace
+#   (a one-shot iterator is otherwise read into a list first)
+# memory: also trace allocations (tracemalloc; slows the run down a lot)
+# pstats_path: also profile a plain run with cProfile and dump its statistics there
+def run_instrumented(tasks, algorithm, num_cores, arrivals=None, max_horizon=DEFAULT_MAX_HORIZON, memory=False, pstats_path=None):
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks):
+        return [], 0, {'error': f"Error: {algorithm} requires a Server (S) task definition."}
+    if not callable(arrivals):
+        if pstats_path and arrivals is not None and iter(arrivals) is arrivals: arrivals = list(arrivals)
+        source = arrivals; arrivals = lambda: source
+    if pstats_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.runcall(Simulator(tasks, algorithm, num_cores, arrivals(), max_horizon).run)
+        profiler.dump_stats(pstats_path)
+    sim = ProfiledSimulator(tasks, algorithm, num_cores, arrivals(), max_horizon)
+    if memory:
+        import tracemalloc
+        started = not tracemalloc.is_tracing()
+        if started: tracemalloc.start()
+        tracemalloc.reset_peak(); before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    schedule, horizon, stats = sim.run()
+    wall = time.perf_counter() - start
+    profile = sim.profile(wall)
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if started: tracemalloc.stop()
+        profile['memory'] = {'retained_bytes': current - before, 'peak_bytes': peak - before}
+    if pstats_path: profile['pstats'] = pstats_path
+    stats['profile'] = profile
+    return schedule, horizon, stats
+
+
+def format_profile(profile):
+    # Plain-text report, slowest phase first
+    lines = [f"{profile['events']} events in {profile['wall_seconds'] * 1000:.1f} ms"
+             + (f" ({profile['events_per_second']:,.0f} events/s, {profile['simulated_ms_per_second']:,.0f} simulated ms/s)" if profile['events_per_second'] else ""),
+             f"Peak ready queue: {profile['peak_ready_queue']} jobs"]
+    if 'memory' in profile:
+        lines.append(f"Allocations: {profile['memory']['peak_bytes'] / 1024:,.1f} KiB peak, {profile['memory']['retained_bytes'] / 1024:,.1f} KiB retained")
+    total = sum(p['seconds'] for p in profile['phases'].values()) or 1
+    for name, p in sorted(profile['phases'].items(), key=lambda kv: -kv[1]['seconds']):
+        lines.append(f"  {name:<13}{p['seconds'] * 1000:9.2f} ms {100 * p['seconds'] / total:5.1f}%  {p['calls']:>9} calls")
+    if 'pstats' in profile: lines.append(f"cProfile dump: {profile['pstats']}")
+    return "\n".join(lines)
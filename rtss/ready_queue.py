@@ -0,0 +1,114 @@
+import heapq
+
+# =============================================================================
+# READY QUEUES
+# =============================================================================
+# Both queues hand out jobs one at a time in priority order (pop) and take back
+# the ones that are still unfinished after the tick (push_back). Jobs are never
+# searched for: a removed job is flagged with job.queued = False and a
+# finished one has job.remaining <= 0; both are dropped when they surface.
+# Equal keys keep FIFO order, exactly like the stable sort of the old loop.
+
+LLF = "Least Laxity First (LLF)"
+
+
+def priority_key(algorithm):
+    if algorithm == "Earliest Deadline First (EDF)":
+        return lambda job: (job.abs_deadline, job.task.id)
+    if algorithm == "Deadline Monotonic (DM)":
+        return lambda job: (job.task.relative_deadline, job.task.id)
+    # Rate Monotonic (default for the server policies too)
+    return lambda job: (job.task.period if job.task.period > 0 else 9999, job.task.id)
+
+
+class HeapReadyQueue:
+    # Static priorities (RM, DM, EDF): the key of a job never changes
+    def __init__(self, algorithm):
+        self.key = priority_key(algorithm)
+        self.heap = []
+        self.seq = 0
+        self.live = 0
+        self.dead = 0
+
+    def __len__(self):
+        return self.live
+
+    def push(self, job):
+        job.seq = self.seq; job.queued = True
+        self.seq += 1
+        self.live += 1
+        heapq.heappush(self.heap, (self.key(job), job.seq, job))
+
+    def push_back(self, job):
+        self.live += 1
+        heapq.heappush(self.heap, (self.key(job), job.seq, job))
+
+    def discard(self, job):
+        if not job.queued: return
+        job.queued = False
+        self.live -= 1; self.dead += 1
+        # Rebuild once lazily deleted entries dominate the heap
+        if self.dead > 64 and self.dead > self.live:
+            self.heap = [e for e in self.heap if e[2].queued and e[2].remaining > 0]
+            heapq.heapify(self.heap)
+            self.live = len(self.heap); self.dead = 0
+
+    def prepare(self, t):
+        pass
+
+    def snapshot(self):
+        # Live jobs in pop order
+        return [e[2] for e in sorted(self.heap, key=lambda e: e[:2]) if e[2].queued and e[2].remaining > 0]
+
+    def pop(self):
+        heap = self.heap
+        while heap:
+            job = heapq.heappop(heap)[2]
+            if not job.queued:
+                self.dead -= 1; continue
+            self.live -= 1
+            if job.remaining > 0: return job
+            job.queued = False
+        return None
+
+
+class LaxityReadyQueue:
+    # LLF: laxity = (abs_deadline - t) - remaining changes every tick for waiting
+    # jobs, so the queue is re-sorted at each event. The list keeps the previous
+    # order, which decides ties just like the old per-tick sort did.
+    def __init__(self):
+        self.jobs = []
+        self.index = 0
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def push(self, job):
+        job.queued = True
+        self.jobs.append(job)
+
+    def push_back(self, job):
+        pass
+
+    def discard(self, job):
+        job.queued = False
+
+    def prepare(self, t):
+        self.jobs = [j for j in self.jobs if j.queued and j.remaining > 0]
+        self.jobs.sort(key=lambda x: ((x.abs_deadline - t - x.remaining), x.task.id))
+        self.index = 0
+
+    def snapshot(self):
+        # Live jobs in list order (it decides laxity ties)
+        return [j for j in self.jobs if j.queued and j.remaining > 0]
+
+    def pop(self):
+        jobs = self.jobs
+        while self.index < len(jobs):
+            job = jobs[self.index]; self.index += 1
+            if job.queued and job.remaining > 0: return job
+        return None
+
+
+def make_ready_queue(algorithm):
+    return LaxityReadyQueue() if algorithm == LLF else HeapReadyQueue(algorithm)
@@ -0,0 +1,92 @@
+import math
+
+# =============================================================================
+# STREAMING STATISTICS
+# =============================================================================
+# Fixed-memory summaries that the engine updates as jobs complete, so response
+# times and jitter are known without keeping (or re-reading) the schedule:
+#   RunningStats  : count, min, mean and max of a stream of numbers
+#   QuantileSketch: quantiles with a bounded relative error (DDSketch-style
+#                   logarithmic buckets), at most max_buckets counters
+
+
+class RunningStats:
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        if self.min is None or x < self.min: self.min = x
+        if self.max is None or x > self.max: self.max = x
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def spread(self):
+        # max - min: the jitter of the stream
+        return self.max - self.min if self.count else None
+
+
+class QuantileSketch:
+    # Bucket i counts the values in (gamma^(i-1), gamma^i]; a quantile is
+    # reported as the middle of its bucket, within relative_accuracy of a real
+    # sample. Once there are more than max_buckets buckets the two lowest are
+    # merged, so only the lowest quantiles lose accuracy.
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zeros = 0
+        self.stats = RunningStats()
+
+    def __len__(self):
+        return self.stats.count
+
+    def add(self, x):
+        self.stats.add(x)
+        if x <= 0:
+            self.zeros += 1; return
+        i = math.ceil(math.log(x) / self.log_gamma)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        if len(self.buckets) > self.max_buckets: self._collapse()
+
+    def _collapse(self):
+        low, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(low)
+
+    def merge(self, other):
+        for i, n in other.buckets.items(): self.buckets[i] = self.buckets.get(i, 0) + n
+        while len(self.buckets) > self.max_buckets: self._collapse()
+        self.zeros += other.zeros
+        s, o = self.stats, other.stats
+        if o.count:
+            s.min = o.min if s.min is None else min(s.min, o.min)
+            s.max = o.max if s.max is None else max(s.max, o.max)
+            s.count += o.count; s.total += o.total
+
+    def quantile(self, q):
+        n = self.stats.count
+        if not n: return None
+        rank = max(math.ceil(q * n) - 1, 0)  # nearest rank
+        if rank < self.zeros: return 0
+        seen = self.zeros
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                value = 2 * self.gamma ** i / (self.gamma + 1)
+                return min(max(value, self.stats.min), self.stats.max)
+        return self.stats.max
+
+    def summary(self, quantiles=(0.5, 0.9, 0.95, 0.99)):
+        # Estimates are rounded to 2 decimals (they are only within 1% anyway)
+        s = self.stats
+        out = {'count': s.count, 'min': s.min, 'mean': s.mean(), 'max': s.max}
+        for q in quantiles: out[f"p{round(q * 100):g}"] = self.quantile(q)
+        return {k: round(v, 2) if isinstance(v, float) else v for k, v in out.items()}
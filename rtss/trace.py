@@ -0,0 +1,146 @@
+import json
+import os
+import zipfile
+from itertools import islice
+
+import numpy as np
+
+from rtss.model import Task, _restore_task
+from rtss.npy_stream import NpyStreamWriter
+
+# =============================================================================
+# BINARY SCHEDULE TRACES
+# =============================================================================
+# A finished run saved as one uncompressed .npz archive:
+#   segments.npy : structured array, one packed 23-byte row per segment
+#                  (core, start, duration, task_id, status code, label id)
+#   meta.json    : format version, algorithm, cores, horizon, stats, the task
+#                  set and the status / label tables the codes point into
+# Segments are written in chunks of CHUNK_ROWS through a temporary .npy next
+# to the target, so a long run never needs a second in-memory copy. Members
+# are stored, not deflated: open_trace() memory maps segments.npy straight out
+# of the archive, and np.load() still reads the file like any other .npz.
+
+TRACE_VERSION = 1
+CHUNK_ROWS = 65536
+STATUSES = ('OK', 'MISS')
+SEGMENT_DTYPE = np.dtype([('core', np.int16), ('start', np.int64), ('duration', np.uint32),
+                          ('task_id', np.int32), ('status', np.uint8), ('label', np.int32)])
+
+
+class TraceWriter:
+    def __init__(self, path, tasks, algorithm, num_cores):
+        self.path = path
+        self.tasks = list(tasks); self.algorithm = algorithm; self.num_cores = num_cores
+        self.statuses = list(STATUSES); self.labels = []
+        self._status = {s: i for i, s in enumerate(self.statuses)}; self._label = {}
+        self.tmp = path + ".segments.tmp"
+        self.writer = NpyStreamWriter(self.tmp, SEGMENT_DTYPE)
+
+    def _code(self, table, index, value):
+        if value not in index: index[value] = len(table); table.append(value)
+        return index[value]
+
+    def write(self, segments):
+        # Appends engine segments (dicts, any iterable), CHUNK_ROWS at a time
+        segments = iter(segments)
+        while True:
+            part = list(islice(segments, CHUNK_ROWS))
+            if not part: return
+            rows = np.empty(len(part), SEGMENT_DTYPE)
+            rows['core'] = [s['core'] for s in part]
+            rows['start'] = [s['start'] for s in part]
+            rows['duration'] = [s['end'] - s['start'] for s in part]
+            rows['task_id'] = [s['task_id'] for s in part]
+            rows['status'] = [self._code(self.statuses, self._status, s['status']) for s in part]
+            rows['label'] = [self._code(self.labels, self._label, s['label']) for s in part]
+            self.writer.write(rows)
+
+    def close(self, horizon, stats):
+        self.writer.close()
+        meta = {'version': TRACE_VERSION, 'algorithm': self.algorithm, 'num_cores': self.num_cores,
+                'horizon': horizon, 'segments': self.writer.count, 'stats': stats,
+                'tasks': [[getattr(t, f) for f in Task.__slots__] for t in self.tasks],
+                'statuses': self.statuses, 'labels': self.labels}
+        try:
+            with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True) as z:
+                z.write(self.tmp, 'segments.npy')
+                z.writestr('meta.json', json.dumps(meta, default=str))
+        finally:
+            os.remove(self.tmp)
+
+    def abort(self):
+        self.writer.close()
+        if os.path.exists(self.tmp): os.remove(self.tmp)
+
+
+def save_trace(path, schedule, tasks, algorithm, num_cores, horizon, stats):
+    writer = TraceWriter(path, tasks, algorithm, num_cores)
+    try: writer.write(schedule)
+    except BaseException:
+        writer.abort(); raise
+    writer.close(horizon, stats)
+    return path
+
+
+def _member_array(path, info):
+    # Memory map a stored .npy member in place
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local = f.read(30)
+        if local[:4] != b'PK\x03\x04': raise ValueError(f"{path}: corrupt archive")
+        f.seek(info.header_offset + 30 + int.from_bytes(local[26:28], 'little') + int.from_bytes(local[28:30], 'little'))
+        version = np.lib.format.read_magic(f)
+        shape, fortran, dtype = (np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0)(f)
+        offset = f.tell()
+    if not shape[0]: return np.empty(0, dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order='F' if fortran else 'C')
+
+
+class Trace:
+    # A saved run, segments memory mapped. schedule() turns a time window back
+    # into engine segments for the Gantt views and reports.
+    def __init__(self, path):
+        self.path = path
+        try:
+            with zipfile.ZipFile(path) as z:
+                meta = json.loads(z.read('meta.json'))
+                info = z.getinfo('segments.npy')
+        except (KeyError, zipfile.BadZipFile): raise ValueError(f"{path}: not a schedule trace") from None
+        if meta.get('version') != TRACE_VERSION: raise ValueError(f"{path}: unsupported trace version {meta.get('version')}")
+        if info.compress_type != zipfile.ZIP_STORED: raise ValueError(f"{path}: compressed traces cannot be memory mapped")
+        self.meta = meta
+        self.algorithm = meta['algorithm']; self.num_cores = meta['num_cores']; self.horizon = meta['horizon']
+        self.tasks = [_restore_task(*values) for values in meta['tasks']]
+        self.statuses = meta['statuses']; self.labels = meta['labels']
+        self.stats = dict(meta['stats'])
+        if 'tasks' in self.stats: self.stats['tasks'] = {int(k): v for k, v in self.stats['tasks'].items()}
+        self.segments = _member_array(path, info)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __getitem__(self, i):
+        # Segment i as an engine segment dict
+        core, start, duration, task_id, status, label = self.segments[i].tolist()
+        return {'core': core, 'task_id': task_id, 'start': start, 'end': start + duration,
+                'status': self.statuses[status], 'label': self.labels[label]}
+
+    def schedule(self, start=0, end=None):
+        # Engine segments intersecting [start, end), in file order, built CHUNK_ROWS at a time
+        end = self.horizon if end is None else end
+        out = []
+        for lo in range(0, len(self.segments), CHUNK_ROWS):
+            rows = self.segments[lo:lo + CHUNK_ROWS]
+            s = rows['start'].astype(np.int64); e = s + rows['duration']
+            pick = np.flatnonzero((s < end) & (e > start))
+            if not len(pick): continue
+            for core, s0, e0, task_id, status, label in zip(rows['core'][pick].tolist(), s[pick].tolist(), e[pick].tolist(),
+                                                            rows['task_id'][pick].tolist(), rows['status'][pick].tolist(), rows['label'][pick].tolist()):
+                out.append({'core': core, 'task_id': task_id, 'start': s0, 'end': e0,
+                            'status': self.statuses[status], 'label': self.labels[label]})
+        return out
+
+
+def open_trace(path):
+    return Trace(path)
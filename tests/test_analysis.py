@@ -0,0 +1,125 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from rtss.analysis import (_rows, analyze, bcl_test, gfb_test, hyperbolic_test, liu_layland_bound, liu_layland_test,
+                           qpa_test, response_times)
+from rtss.engine import run_simulation
+from rtss.model import parse_content
+
+RM = "Rate Monotonic (RM)"
+DM = "Deadline Monotonic (DM)"
+EDF = "Earliest Deadline First (EDF)"
+LLF = "Least Laxity First (LLF)"
+
+
+def rows(content, algorithm=RM):
+    return _rows(parse_content(content), algorithm)
+
+
+def test_liu_layland_bound():
+    assert liu_layland_bound(1) == 1
+    assert liu_layland_bound(2) == pytest.approx(0.828427, abs=1e-6)
+    assert liu_layland_bound(3) == pytest.approx(0.779763, abs=1e-6)
+
+
+def test_liu_layland_at_the_bound():
+    # One task at U = 1 sits exactly on the n = 1 bound
+    assert liu_layland_test(rows("P 0 5 5")) is True
+    # U = 0.8 and U = 0.85 on either side of the n = 2 bound
+    assert liu_layland_test(rows("P 0 2 5\nP 0 4 10")) is True
+    assert liu_layland_test(rows("P 0 1 2\nP 0 7 20")) is None
+
+
+def test_hyperbolic_at_the_bound_where_liu_layland_fails():
+    # U = 1/2 + 1/3 = 0.833 > 0.828, but (1 + 1/2)(1 + 1/3) = 2 exactly
+    r = rows("P 0 1 2\nP 0 1 3")
+    assert liu_layland_test(r) is None
+    assert hyperbolic_test(r) is True
+    assert analyze(parse_content("P 0 1 2\nP 0 1 3"), RM, 1)['test'] == "Hyperbolic"
+
+
+def test_rta_pass_where_the_bounds_fail():
+    # Harmonic set at U = 1: only the exact test accepts it
+    tasks = parse_content("P 0 2 4\nP 0 4 8")
+    result = analyze(tasks, RM, 1)
+    assert result['tests']['Liu-Layland'] is None and result['tests']['Hyperbolic'] is None
+    assert (result['verdict'], result['test']) == (True, "RTA")
+    assert result['response_times'] == {1: 2, 2: 8}
+
+
+def test_rta_fail():
+    # R2 = 3 + ceil(R2 / 4) * 2 exceeds D2 = 6
+    tasks = parse_content("P 0 2 4\nP 0 3 6")
+    assert response_times(_rows(tasks, RM)) == {1: 2, 2: None}
+    assert (analyze(tasks, RM, 1)['verdict'], analyze(tasks, RM, 1)['test']) == (False, "RTA")
+
+
+def test_rta_with_offsets_is_only_sufficient():
+    # The synchronous worst case fails, but with offsets that does not prove a miss
+    assert analyze(parse_content("P 0 2 4\nP 1 3 6"), RM, 1)['verdict'] is None
+
+
+def test_deadline_monotonic_order():
+    # RM order misses T2's short deadline, DM order meets it
+    tasks = parse_content("P 0 2 5 5\nP 0 1 10 2")
+    assert analyze(tasks, RM, 1)['verdict'] is False
+    assert analyze(tasks, DM, 1)['verdict'] is True
+
+
+def test_qpa_constrained_deadlines():
+    assert qpa_test(rows("P 0 1 4 2\nP 0 1 5 3\nP 0 2 10 8", EDF), True) is True
+    # h(3) = 2 + 2 > 3
+    assert qpa_test(rows("P 0 2 4 2\nP 0 2 6 3", EDF), True) is False
+    assert qpa_test(rows("P 0 2 4 2\nP 0 2 6 3", EDF), False) is None
+    assert analyze(parse_content("P 0 2 4 2\nP 0 2 6 3"), EDF, 1)['test'] == "QPA"
+
+
+def test_qpa_full_utilization():
+    assert qpa_test(rows("P 0 2 4\nP 0 3 6", EDF), True) is True
+
+
+def test_gfb_two_cores():
+    r = rows("P 0 1 2\nP 0 1 2\nP 0 1 4", EDF)
+    # Densities 1/2 + 1/2 + 1/4 <= 2 - 1/2
+    assert gfb_test(r, 2) is True
+    assert gfb_test(rows("P 0 9 10\nP 0 9 10\nP 0 1 10", EDF), 2) is None
+    assert analyze(parse_content("P 0 1 2\nP 0 1 2\nP 0 1 4"), EDF, 2)['test'] == "GFB"
+
+
+def test_bcl_two_cores():
+    assert bcl_test(rows("P 0 1 4\nP 0 1 4\nP 0 1 4"), 2) is True
+    # Dhall's set: two light tasks and one heavy one
+    assert bcl_test(rows("P 0 1 10\nP 0 1 10\nP 0 11 12"), 2) is None
+    assert analyze(parse_content("P 0 1 4\nP 0 1 4\nP 0 1 4"), RM, 2)['test'] == "BCL"
+
+
+def test_necessary_conditions():
+    assert analyze(parse_content("P 0 5 10 4"), EDF, 1)['test'] == "C > D"
+    assert analyze(parse_content("P 0 3 4\nP 0 3 4\nP 0 3 4"), EDF, 2)['test'] == "U > m"
+    assert analyze(parse_content("P 0 3 4\nP 0 3 4"), RM, 2)['test'] == "n <= m"
+
+
+def random_set(rng):
+    lines = []
+    for _ in range(rng.randint(2, 5)):
+        period = rng.choice([4, 5, 6, 8, 10, 12, 15, 20])
+        c = rng.randint(1, max(1, period // 3))
+        lines.append(f"P {rng.choice([0, 0, 0, rng.randint(1, 5)])} {c} {period} {rng.randint(c, period)}")
+    return parse_content("\n".join(lines))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_verdicts_agree_with_the_simulation(seed):
+    # True: no simulated miss. False on one core (exact tests, synchronous
+    # releases): the simulation finds a miss as well
+    rng = random.Random(seed)
+    tasks = random_set(rng)
+    for algorithm in (RM, DM, EDF, LLF):
+        for cores in (1, 2):
+            verdict = analyze(tasks, algorithm, cores)['verdict']
+            _, _, stats = run_simulation(tasks, algorithm, cores)
+            missed = stats['missed_deadlines'] + stats['overdue_jobs'] > 0
+            if verdict is True: assert not missed, (algorithm, cores)
+            if verdict is False and cores == 1 and not stats['truncated']: assert missed, (algorithm, cores)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from rtss import arrivals
+from rtss.arrivals import next_free_id, read_arrival_trace, write_arrival_trace
+from rtss.engine import ALGORITHMS, run_simulation
+from rtss.model import parse_content
+
+SET = "P 0 1 4\nP 1 2 6\nS 1 5\nA 3 2"
+# Includes a request at the same time as the inline 'A 3 2' (that one goes first)
+ROWS = [(0, 1), (3, 1), (3, 2), (8, 3), (8, 1), (20, 2), (41, 4), (70, 1)]
+
+
+def write_text(path, rows):
+    path.write_text("# arrival exec\n" + "".join(f"A {r} {e}\n" if i % 2 else f"{r} {e}  # plain\n" for i, (r, e) in enumerate(rows)))
+    return path
+
+
+@pytest.mark.parametrize("kind", ["txt", "npy"])
+def test_unsorted_trace_raises(tmp_path, kind, monkeypatch):
+    monkeypatch.setattr(arrivals, 'CHUNK_ROWS', 2)
+    rows = [(0, 1), (5, 1), (9, 2), (4, 1), (12, 1)]
+    path = tmp_path / f"trace.{kind}"
+    if kind == "npy": write_arrival_trace(path, rows)
+    else: write_text(path, rows)
+    stream = read_arrival_trace(path)
+    # Streamed: the rows before the bad one are yielded first
+    assert [next(stream).arrival_time for _ in range(3)] == [0, 5, 9]
+    with pytest.raises(ValueError, match="arrivals must be sorted by time.*row 4: 4 < 9"):
+        next(stream)
+
+
+@pytest.mark.parametrize("kind", ["txt", "npy"])
+def test_trace_reads_back(tmp_path, kind, monkeypatch):
+    monkeypatch.setattr(arrivals, 'CHUNK_ROWS', 3)
+    path = tmp_path / f"trace.{kind}"
+    if kind == "npy":
+        assert write_arrival_trace(path, iter(ROWS)) == len(ROWS)
+        assert np.load(path).tolist() == [list(r) for r in ROWS]
+    else: write_text(path, ROWS)
+    stream = list(read_arrival_trace(path, 7))
+    assert [(a.id, a.arrival_time, a.burst_time) for a in stream] == [(7 + i, r, e) for i, (r, e) in enumerate(ROWS)]
+    assert all(a.task_type == 'A' for a in stream)
+
+
+@pytest.mark.parametrize("kind", ["txt", "npy"])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("cores", [1, 2])
+def test_trace_runs_like_inline_arrivals(tmp_path, kind, algorithm, cores):
+    tasks = parse_content(SET)
+    path = tmp_path / f"trace.{kind}"
+    if kind == "npy": write_arrival_trace(path, ROWS)
+    else: write_text(path, ROWS)
+    # Inline lines after the set get the same ids as next_free_id hands out
+    inline = parse_content(SET + "".join(f"\nA {r} {e}" for r, e in ROWS))
+    assert run_simulation(tasks, algorithm, cores, read_arrival_trace(path, next_free_id(tasks))) == run_simulation(inline, algorithm, cores)
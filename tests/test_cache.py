@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from rtss.cache import ResultCache
+from rtss.engine import ALGORITHMS, run_simulation
+from rtss.model import parse_content
+
+# Real periodic load with an equal-period pair (T2, T3: ties broken by id), two
+# servers (the engine uses the lower id) and aperiodic jobs released together
+SET = "P 0 1 4\nP 0 2 6\nP 0 1 6\nP 2 3 12 10\nS 1 5\nS 2 8\nA 3 2\nA 3 1\nA 3 3\nA 10 2"
+POLICIES = ["Rate Monotonic (RM)", "Earliest Deadline First (EDF)", "Least Laxity First (LLF)", "Poller", "Deferrable Server", "Sporadic Server"]
+
+
+def relabeled(schedule, ids):
+    return [dict(seg, task_id=ids.get(seg['task_id'], seg['task_id']), label=f"T{ids[int(seg['label'][1:])]}" if seg['label'] else "")
+            for seg in schedule]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_hit_matches_direct_run(algorithm):
+    tasks = parse_content(SET)
+    cache = ResultCache()
+    for _ in range(2):
+        assert cache.run(tasks, algorithm, 1) == run_simulation(tasks, algorithm, 1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fixture_exercises_the_periodic_tasks():
+    schedule, _, stats = run_simulation(parse_content(SET), "Deferrable Server", 1)
+    assert {seg['task_id'] for seg in schedule} >= {1, 2, 3, 4, 5}
+    assert stats['aperiodic_done'] == 4 and stats['preemptions'] > 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("cores", [1, 2])
+def test_permuted_and_renumbered_sets_hit(seed, cores):
+    rng = random.Random(seed)
+    base = parse_content(SET)
+    cache = ResultCache()
+    for algorithm in POLICIES:
+        expected = cache.run(base, algorithm, cores)
+        # Reordered: the same entry and the same schedule
+        tasks = list(base); rng.shuffle(tasks)
+        hits = cache.hits
+        assert cache.run(tasks, algorithm, cores) == expected == run_simulation(tasks, algorithm, cores)
+        # Renumbered (same relative order) and reordered: the entry mapped to the new ids
+        ids = {t.id: 10 * t.id + rng.randint(0, 9) for t in base}
+        renumbered = [t.replace(id=ids[t.id]) for t in tasks]
+        schedule, horizon, stats = cache.run(renumbered, algorithm, cores)
+        assert cache.hits == hits + 2
+        assert (schedule, horizon) == run_simulation(renumbered, algorithm, cores)[:2]
+        assert schedule == relabeled(expected[0], ids)
+        assert stats['tasks'] == {ids[tid]: v for tid, v in expected[2]['tasks'].items()}
+
+
+def test_reordered_set_runs_the_same():
+    # The engine works in id order: list order changes nothing
+    base = parse_content(SET)
+    for algorithm in ALGORITHMS:
+        for cores in (1, 3):
+            assert run_simulation(base[::-1], algorithm, cores) == run_simulation(base, algorithm, cores)
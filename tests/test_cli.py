@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from rtss import cli, partition
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "Test_sample", "multicore_dhall_effect.txt")
+
+
+def test_startup_imports_stay_light():
+    code = "import sys, rtss.cli; print(sorted(m for m in ('rtss.partition', 'concurrent.futures.process', 'numpy', 'matplotlib') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_partition_choices_match():
+    assert cli.HEURISTICS == partition.HEURISTICS and cli.FIT_TESTS == partition.FIT_TESTS
+
+
+def test_partitioned_run(tmp_path, capsys):
+    out = tmp_path / "rows.json"
+    assert cli.main(["simulate", SAMPLE, "--cores", "2", "--partition", "first-fit", "--fit-test", "rta",
+                     "--algorithms", "Rate Monotonic (RM)", "-o", str(out)]) == 0
+    row, = json.loads(out.read_text())
+    assert (row['partition'], row['missed_deadlines'], row['analysis']) == ("first-fit", 0, "schedulable (partitioned)")
+
+
+def test_unknown_algorithm_is_rejected(capsys):
+    with pytest.raises(SystemExit) as exit: cli.main(["simulate", SAMPLE, "--algorithms", "EDF"])
+    assert exit.value.code == 2 and "invalid choice: 'EDF'" in capsys.readouterr().err
@@ -0,0 +1,59 @@
+import pytest
+
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.compare import compare_algorithms
+from rtss.engine import ALGORITHMS, run_simulation
+from rtss.model import parse_content
+
+SET = "P 0 1 4\nP 1 2 6\nP 0 3 20 15\nS 1 5\nA 3 2\nA 3 1\nA 11 4"
+
+
+def check_row(row, tasks, algorithm, cores, arrivals=None):
+    schedule, horizon, stats = run_simulation(tasks, algorithm, cores, arrivals)
+    assert row['algorithm'] == algorithm
+    if 'error' in stats:
+        assert row['error'] == stats['error']; return
+    periodic = stats['tasks']
+    assert (row['missed_deadlines'], row['total_jobs'], row['aperiodic_done'], row['horizon'], row['truncated'],
+            row['preemptions'], row['migrations']) == (stats['missed_deadlines'], stats['total_jobs'], stats['aperiodic_done'],
+                                                       horizon, stats['truncated'], stats['preemptions'], stats['migrations'])
+    assert row['worst_response'] == max(p['max_response'] for p in periodic.values())
+    assert row['p95_aperiodic_response'] == stats['aperiodic_response']['p95']
+
+
+@pytest.mark.parametrize("cores", [1, 2])
+def test_pool_matches_serial_runs(cores):
+    tasks = parse_content(SET)
+    results = compare_algorithms(tasks, cores, render=False, max_workers=3)
+    assert [row['algorithm'] for row, _ in results] == ALGORITHMS
+    for row, png in results:
+        assert png is None
+        check_row(row, tasks, row['algorithm'], cores)
+    # The in-process path gives the same rows
+    assert compare_algorithms(tasks, cores, render=False, max_workers=1) == results
+
+
+def test_trace_and_order(tmp_path):
+    tasks = parse_content(SET)
+    trace = tmp_path / "arrivals.txt"
+    trace.write_text("".join(f"A {5 * i} {1 + i % 3}\n" for i in range(40)))
+    algorithms = ["Sporadic Server", "Earliest Deadline First (EDF)", "Background"]
+    results = compare_algorithms(tasks, 1, algorithms, trace=str(trace), render=False, max_workers=2)
+    assert [row['algorithm'] for row, _ in results] == algorithms
+    for row, _ in results:
+        check_row(row, tasks, row['algorithm'], 1, read_arrival_trace(str(trace), next_free_id(tasks)))
+
+
+def test_server_policies_without_a_server():
+    tasks = parse_content("P 0 1 4\nP 1 2 6\nA 3 2")
+    rows = {row['algorithm']: row for row, _ in compare_algorithms(tasks, 1, render=False, max_workers=2)}
+    for algorithm in ("Poller", "Deferrable Server", "Sporadic Server"):
+        assert set(rows[algorithm]) == {'algorithm', 'analysis', 'error'}
+    assert 'error' not in rows["Rate Monotonic (RM)"]
+
+
+def test_render():
+    pytest.importorskip("matplotlib")
+    tasks = parse_content(SET)
+    (row, png), = compare_algorithms(tasks, 1, ["Deferrable Server"], max_workers=1)
+    assert png.startswith(b'\x89PNG') and 'error' not in row
@@ -0,0 +1,154 @@
+import glob
+import os
+import random
+
+import pytest
+
+from rtss.engine import ALGORITHMS, SERVER_ALGORITHMS, run_simulation
+from rtss.model import parse_content
+
+SAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test_sample", "*.txt")))
+# The original loop had no LLF: it fell through to the RM order
+TICK_ALGORITHMS = [a for a in ALGORITHMS if a != "Least Laxity First (LLF)"]
+
+
+def tick_loop(tasks, algorithm, num_cores, horizon):
+    # The per-tick loop run_simulation started from, with the server budget
+    # kept locally instead of on the Task. Returns ([(core, t, task_id, label,
+    # status)], stats)
+    periodic_tasks = [t for t in tasks if t.task_type == 'P']
+    server_task = next((t for t in tasks if t.task_type == 'S'), None)
+    aperiodic_tasks = sorted((t for t in tasks if t.task_type == 'A'), key=lambda x: x.arrival_time)
+    active_periodic = periodic_tasks[:]
+    if server_task and algorithm != "Background": active_periodic.append(server_task)
+    budget = server_task.server_capacity if server_task else 0
+    log = []; ready_queue = []; aperiodic_queue = []; replenishments = []; ap_index = 0
+    stats = {'total_jobs': 0, 'missed_deadlines': 0, 'aperiodic_done': 0}
+    for t in range(horizon):
+        for task in active_periodic:
+            if t >= task.arrival_time and (t - task.arrival_time) % task.period == 0:
+                new_job = {'task': task, 'remaining': task.burst_time, 'abs_deadline': t + task.deadline}
+                stats['total_jobs'] += 1
+                if task is server_task and algorithm == "Deferrable Server":
+                    budget = task.server_capacity
+                    ready_queue = [j for j in ready_queue if j['task'] is not server_task]
+                    new_job['remaining'] = budget; ready_queue.append(new_job)
+                elif task is server_task and algorithm == "Sporadic Server":
+                    if budget > 0:
+                        new_job['remaining'] = budget
+                        ready_queue = [j for j in ready_queue if j['task'] is not server_task]
+                        ready_queue.append(new_job)
+                else: ready_queue.append(new_job)
+        if algorithm == "Sporadic Server" and server_task:
+            while replenishments and replenishments[0][0] <= t:
+                _, amount = replenishments.pop(0)
+                budget = min(server_task.server_capacity, budget + amount)
+                queued = [j for j in ready_queue if j['task'] is server_task]
+                if not queued and budget > 0:
+                    ready_queue.append({'task': server_task, 'remaining': budget, 'abs_deadline': t + server_task.period})
+                for j in queued: j['remaining'] = budget
+        while ap_index < len(aperiodic_tasks) and aperiodic_tasks[ap_index].arrival_time == t:
+            aperiodic_queue.append({'task': aperiodic_tasks[ap_index], 'remaining': aperiodic_tasks[ap_index].burst_time})
+            ap_index += 1
+        if algorithm == "Poller" and server_task and not aperiodic_queue:
+            for job in ready_queue:
+                if job['task'] is server_task: job['remaining'] = 0; break
+        ready_queue = [j for j in ready_queue if j['remaining'] > 0]
+        if algorithm == "Earliest Deadline First (EDF)": ready_queue.sort(key=lambda x: (x['abs_deadline'], x['task'].id))
+        elif algorithm == "Deadline Monotonic (DM)": ready_queue.sort(key=lambda x: (x['task'].relative_deadline, x['task'].id))
+        else: ready_queue.sort(key=lambda x: (x['task'].period if x['task'].period > 0 else 9999, x['task'].id))
+        free = num_cores; i = 0
+        while free > 0 and i < len(ready_queue):
+            job = ready_queue[i]; task = job['task']
+            if task is server_task and not aperiodic_queue and algorithm in ("Deferrable Server", "Sporadic Server"):
+                i += 1; continue
+            label = f"T{task.id}"; status = 'OK'
+            if task is server_task and algorithm != "RM Baseline":
+                label = ""
+                if aperiodic_queue:
+                    ap = aperiodic_queue[0]; label = f"T{ap['task'].id}"; ap['remaining'] -= 1
+                    if ap['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
+            if t >= job['abs_deadline']: status = 'MISS'; stats['missed_deadlines'] += 1
+            log.append((num_cores - free + 1, t, task.id, label, status))
+            job['remaining'] -= 1
+            if algorithm == "Sporadic Server" and task is server_task:
+                budget -= 1; replenishments.append((t + server_task.period, 1))
+            if job['remaining'] == 0: ready_queue.pop(i)
+            else: i += 1
+            free -= 1
+        while free > 0 and algorithm == "Background" and aperiodic_queue:
+            ap = aperiodic_queue[0]
+            log.append((num_cores - free + 1, t, ap['task'].id, f"T{ap['task'].id}", 'OK'))
+            ap['remaining'] -= 1
+            if ap['remaining'] == 0: aperiodic_queue.pop(0); stats['aperiodic_done'] += 1
+            free -= 1
+    return log, stats
+
+
+def ticks(schedule):
+    return sorted((s['core'], t, s['task_id'], s['label'], s['status']) for s in schedule for t in range(s['start'], s['end']))
+
+
+def random_set(rng):
+    lines = [f"P {rng.randint(0, 6)} {rng.randint(1, 4)} {rng.choice([5, 6, 8, 10, 12, 15, 20])} {rng.randint(4, 20)}" for _ in range(rng.randint(1, 5))]
+    lines.append(f"S {rng.randint(1, 3)} {rng.choice([5, 8, 10])}")
+    lines += [f"A {rng.randint(0, 40)} {rng.randint(1, 5)}" for _ in range(rng.randint(0, 4))]
+    return parse_content("\n".join(lines))
+
+
+def check_against_tick_loop(tasks, algorithm, cores):
+    schedule, horizon, stats = run_simulation(tasks, algorithm, cores)
+    log, expected = tick_loop(tasks, algorithm, cores, horizon)
+    assert ticks(schedule) == sorted(log)
+    assert {k: stats[k] for k in expected} == expected
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+@pytest.mark.parametrize("algorithm", TICK_ALGORITHMS)
+def test_samples_match_tick_loop(path, algorithm):
+    with open(path) as f: tasks = parse_content(f.read())
+    if algorithm in SERVER_ALGORITHMS and not any(t.task_type == 'S' for t in tasks): pytest.skip("no server")
+    for cores in (1, 2):
+        check_against_tick_loop(tasks, algorithm, cores)
+
+
+@pytest.mark.parametrize("algorithm", TICK_ALGORITHMS)
+def test_preempting_set_matches_tick_loop(algorithm):
+    # T3 (offset, D < T) is preempted by T1 and T2; the server and the
+    # aperiodic jobs interleave with them
+    tasks = parse_content("P 0 1 4\nP 1 2 6\nP 2 4 12 10\nS 1 5\nA 3 2\nA 3 1\nA 11 4")
+    assert run_simulation(tasks, "Rate Monotonic (RM)", 1)[2]['preemptions'] > 0
+    for cores in (1, 2):
+        check_against_tick_loop(tasks, algorithm, cores)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_random_sets_match_tick_loop(seed):
+    rng = random.Random(seed)
+    tasks = random_set(rng)
+    for algorithm in TICK_ALGORITHMS:
+        check_against_tick_loop(tasks, algorithm, rng.randint(1, 3))
+
+
+def test_aperiodic_only_set_under_background():
+    schedule, horizon, stats = run_simulation(parse_content("A 2 3\nA 4 2"), "Background", 1)
+    assert [(s['start'], s['end']) for s in schedule] == [(2, 5), (5, 7)]
+    assert horizon == 7 and stats['aperiodic_done'] == 2 and not stats['truncated']
+
+
+@pytest.mark.parametrize("algorithm", ["Rate Monotonic (RM)", "Earliest Deadline First (EDF)", "Least Laxity First (LLF)"])
+def test_aperiodic_only_set_stops_after_the_last_arrival(algorithm):
+    # Nothing serves aperiodic work without a server: the run ends, it does not idle to max_horizon
+    schedule, horizon, stats = run_simulation(parse_content("A 2 3\nA 40 2"), algorithm, 1)
+    assert schedule == [] and horizon == 41 and not stats['truncated']
+
+
+def test_background_truncated_by_max_horizon():
+    _, horizon, stats = run_simulation(parse_content("A 0 500"), "Background", 1, max_horizon=100)
+    assert horizon == 100 and stats['truncated']
+
+
+def test_starved_job_counts_as_overdue():
+    # T2 never gets the processor: no tick runs late, but both of its jobs are missed
+    _, horizon, stats = run_simulation(parse_content("P 0 2 2\nP 0 1 10"), "Rate Monotonic (RM)", 1)
+    assert horizon == 20 and stats['missed_deadlines'] == 0 and stats['overdue_jobs'] == 2
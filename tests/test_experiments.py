@@ -0,0 +1,26 @@
+import pytest
+
+from rtss.experiments import ExperimentConfig, run_experiment
+
+RM = "Rate Monotonic (RM)"
+
+
+@pytest.mark.parametrize("use_analysis", [False, True])
+def test_overloaded_sets_are_rejected(use_analysis):
+    cfg = ExperimentConfig([1.6], [RM, "Earliest Deadline First (EDF)"], sets_per_point=40, chunk_size=10, use_analysis=use_analysis)
+    result = run_experiment(cfg, max_workers=1)
+    for algorithm in cfg.algorithms:
+        assert result.acceptance_ratio(algorithm, 1, 1.6) == 0
+
+
+def test_simulated_and_analytic_modes_agree_on_rm():
+    # Liu & Layland / RTA decide exactly for synchronous implicit-deadline sets
+    runs = [run_experiment(ExperimentConfig([0.7, 1.0, 1.2], [RM], sets_per_point=60, chunk_size=20, use_analysis=mode), max_workers=1)
+            for mode in (False, True)]
+    for util in (0.7, 1.0, 1.2):
+        assert runs[0].acceptance_ratio(RM, 1, util) == runs[1].acceptance_ratio(RM, 1, util)
+
+
+def test_same_seed_same_counts():
+    cfg = ExperimentConfig([0.8], [RM], sets_per_point=30, chunk_size=10, seed=7)
+    assert run_experiment(cfg, max_workers=1).counts == run_experiment(cfg, max_workers=2).counts
@@ -0,0 +1,149 @@
+import random
+
+import pytest
+
+from rtss.engine import run_simulation
+from rtss.gantt import DrawThrottle, SegmentStore, WindowedGantt, row_of
+from rtss.model import MISS_COLOR, parse_content
+
+# Preempting periodic load that overruns now and then (MISS segments), a
+# server and aperiodic work: long, short and split bars in every row
+SET = "P 0 2 5\nP 1 3 7\nP 0 4 11 9\nP 2 5 30 20\nS 1 6\nA 3 2\nA 40 6\nA 41 3\nA 90 5"
+
+
+class Timer:
+    def __init__(self, interval):
+        self.interval = interval; self.callbacks = []; self.running = False
+
+    def add_callback(self, fn):
+        self.callbacks.append(fn)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def fire(self):
+        self.running = False
+        for fn in self.callbacks: fn()
+
+
+class Canvas:
+    def __init__(self):
+        self.draws = 0; self.timers = []
+
+    def draw_idle(self):
+        self.draws += 1
+
+    def new_timer(self, interval):
+        self.timers.append(Timer(interval))
+        return self.timers[-1]
+
+
+def test_dropped_requests_leave_one_trailing_draw():
+    canvas = Canvas()
+    throttle = DrawThrottle(canvas, interval=60)
+    throttle.request()
+    for _ in range(5): throttle.request()
+    assert canvas.draws == 1 and len(canvas.timers) == 1
+    assert 0 < canvas.timers[0].interval <= 60000
+    canvas.timers[0].fire()
+    assert canvas.draws == 2 and throttle.timer is None
+
+
+def test_forced_draw_cancels_the_pending_timer():
+    canvas = Canvas()
+    throttle = DrawThrottle(canvas, interval=60)
+    throttle.request(); throttle.request()
+    timer = canvas.timers[0]
+    throttle.request(force=True)
+    assert canvas.draws == 2 and not timer.running and throttle.timer is None
+
+
+def store_for(cores):
+    tasks = parse_content(SET)
+    schedule, horizon, _ = run_simulation(tasks, "Sporadic Server", cores)
+    return SegmentStore(schedule, tasks, cores), schedule, tasks, horizon
+
+
+def busy_by_row(schedule, tasks, cores, store, x0, x1):
+    # Brute force: busy time per (row, colour) inside [x0, x1]
+    row = row_of(tasks, cores); colors = {t.id: t.color for t in tasks}
+    busy = {}
+    for seg in schedule:
+        c = MISS_COLOR if seg['status'] == 'MISS' else colors[seg['task_id']]
+        key = (row(seg), store.colors.index(c))
+        busy[key] = busy.get(key, 0) + max(min(seg['end'], x1) - max(seg['start'], x0), 0)
+    return {k: v for k, v in busy.items() if v}
+
+
+def test_fixture_has_misses():
+    _, schedule, _, horizon = store_for(1)
+    assert any(seg['status'] == 'MISS' for seg in schedule) and horizon > 100
+
+
+@pytest.mark.parametrize("cores", [1, 2])
+def test_visible_is_exactly_the_overlapping_segments(cores):
+    store, schedule, _, horizon = store_for(cores)
+    assert len(store) == len(schedule)
+    rng = random.Random(cores)
+    windows = [(0, horizon), (-5, 0.5), (horizon - 0.5, horizon + 5), (horizon + 1, horizon + 9)]
+    windows += [sorted((rng.uniform(-3, horizon + 3), rng.uniform(-3, horizon + 3))) for _ in range(200)]
+    windows += [(x, x) for x in range(0, horizon, 7)]
+    for x0, x1 in windows:
+        found = [store.job(i) for i in store.visible(x0, x1).tolist()]
+        expected = [seg for seg in schedule if seg['start'] <= x1 and seg['end'] > x0]
+        assert sorted(map(id, found)) == sorted(map(id, expected)), (x0, x1)
+        # The store order is the same segment: the columns agree with the job
+        for i in store.visible(x0, x1).tolist():
+            assert (store.start[i], store.end[i]) == (store.job(i)['start'], store.job(i)['end'])
+
+
+@pytest.mark.parametrize("cores", [1, 2])
+def test_coverage_at_one_tick_per_bin_is_the_busy_time(cores):
+    # Segments start and end on ticks, so a one-tick bin holds at most one
+    # segment per row: the runs add up to the busy time of each row and colour
+    store, schedule, tasks, horizon = store_for(cores)
+    for x0, x1 in [(0, horizon), (13, 57), (horizon - 20, horizon)]:
+        covered = {}
+        for s, e, y, c in store.coverage(x0, x1, x1 - x0):
+            assert x0 <= s < e <= x1
+            covered[(y, c)] = covered.get((y, c), 0) + e - s
+        assert covered == pytest.approx(busy_by_row(schedule, tasks, cores, store, x0, x1))
+
+
+def test_coverage_of_coarse_bins():
+    store, schedule, tasks, horizon = store_for(1)
+    runs = store.coverage(0, horizon, 7)
+    # Each row gets runs within the window that never overlap
+    for y in {y for _, _, y, _ in runs}:
+        row = sorted((s, e) for s, e, yy, _ in runs if yy == y)
+        assert all(e1 <= s2 for (_, e1), (s2, _) in zip(row, row[1:]))
+    assert {y for _, _, y, _ in runs} == {y for y, _ in busy_by_row(schedule, tasks, 1, store, 0, horizon)}
+    assert store.coverage(horizon + 1, horizon + 9, 4) == []
+
+
+def test_windowed_gantt_draws_the_visible_bars():
+    pytest.importorskip("matplotlib")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    store, schedule, _, horizon = store_for(2)
+    fig = Figure(figsize=(8, 2), dpi=50)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_xlim(0, horizon)
+    gantt = WindowedGantt(ax, store, horizon, max_bars=len(schedule))
+
+    def bars():
+        return sum(len(a.get_paths()) for a in gantt.artists if hasattr(a, 'get_paths'))
+    assert gantt.detailed and bars() == len(schedule)
+    ax.set_xlim(20.5, 40)
+    assert gantt.detailed and bars() == len(store.visible(20.5, 40))
+    # Past max_bars: level-of-detail runs, still only inside the window
+    gantt.max_bars = 5
+    ax.set_xlim(0, horizon)
+    assert not gantt.detailed and 0 < bars()
+    for artist in gantt.artists:
+        for path in artist.get_paths():
+            assert 0 <= path.vertices[:, 0].min() and path.vertices[:, 0].max() <= horizon
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from rtss.generator import draw_periods, generate_task_sets, poisson_arrivals, uunifast, uunifast_discard
+
+
+@pytest.mark.parametrize("total", [0.3, 0.9, 1.0])
+def test_uunifast_sums_to_target(total):
+    util = uunifast(np.random.default_rng(1), 500, 6, total)
+    assert util.shape == (500, 6) and (util > 0).all()
+    assert np.allclose(util.sum(axis=1), total)
+
+
+@pytest.mark.parametrize("total,n", [(1.5, 2), (3.2, 4), (3.6, 4), (6.0, 16)])
+def test_discard_keeps_every_task_at_most_one(total, n):
+    util = uunifast_discard(np.random.default_rng(2), 300, n, total)
+    assert np.allclose(util.sum(axis=1), total)
+    assert util.max() <= 1.0
+
+
+def test_discard_rejects_impossible_totals():
+    with pytest.raises(ValueError):
+        uunifast_discard(np.random.default_rng(0), 1, 3, 3.5)
+
+
+@pytest.mark.parametrize("log_uniform", [True, False])
+def test_periods_in_range(log_uniform):
+    periods = draw_periods(np.random.default_rng(3), 200, 10, 10, 1000, log_uniform, granularity=10)
+    assert periods.min() >= 10 and periods.max() <= 1000
+    assert (periods % 10 == 0).all()
+    # Both ends are reachable
+    assert periods.min() < 20 and periods.max() > 900
+
+
+def test_task_sets():
+    batch = generate_task_sets(100, 8, 2.5, seed=4, period_range=(20, 500), constrained_deadlines=True, offsets=True)
+    assert len(batch) == 100
+    assert np.allclose(batch.util.sum(axis=1), 2.5) and batch.util.max() <= 1.0
+    assert batch.T.min() >= 20 and batch.T.max() <= 500
+    assert ((1 <= batch.C) & (batch.C <= batch.T)).all()
+    assert ((batch.C <= batch.D) & (batch.D <= batch.T)).all()
+    assert ((0 <= batch.O) & (batch.O < batch.T)).all()
+    # C = round(u * T): the realised utilization stays close to the target
+    assert np.abs(batch.total_utilization() - 2.5).max() < 8 * 0.5 / 20
+
+
+def test_same_seed_same_sets():
+    a = generate_task_sets(20, 5, 0.8, seed=11, constrained_deadlines=True, offsets=True)
+    b = generate_task_sets(20, 5, 0.8, seed=11, constrained_deadlines=True, offsets=True)
+    c = generate_task_sets(20, 5, 0.8, seed=12, constrained_deadlines=True, offsets=True)
+    for field in ('C', 'T', 'D', 'O', 'util'):
+        assert np.array_equal(getattr(a, field), getattr(b, field))
+    assert not np.array_equal(a.T, c.T)
+
+
+def test_to_tasks():
+    batch = generate_task_sets(3, 4, 0.6, seed=5)
+    tasks = batch.to_tasks(1, server=(2, 20), arrivals=np.array([[3, 1], [7, 2]]))
+    assert [t.task_type for t in tasks] == ['S', 'P', 'P', 'P', 'P', 'A', 'A']
+    assert [t.id for t in tasks] == list(range(1, 8))
+    assert [(t.burst_time, t.period, t.deadline) for t in tasks[1:5]] == list(zip(batch.C[1].tolist(), batch.T[1].tolist(), batch.D[1].tolist()))
+    assert (tasks[0].server_capacity, tasks[0].period) == (2, 20)
+    assert [(t.arrival_time, t.burst_time) for t in tasks[5:]] == [(3, 1), (7, 2)]
+
+
+def test_poisson_arrivals():
+    a = poisson_arrivals(10000, 0.05, seed=6)
+    assert np.array_equal(a, poisson_arrivals(10000, 0.05, seed=6))
+    assert (np.diff(a[:, 0]) >= 0).all() and a[:, 0].min() >= 0 and a[:, 0].max() < 10000
+    assert a[:, 1].min() >= 1 and a[:, 1].max() <= 5
+    assert abs(len(a) - 500) < 100
@@ -0,0 +1,100 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from rtss.library import ingest
+from rtss.model import parse_checked, parse_content
+
+GOOD = "P 0 1 4\nP 0 2 6\nS 1 5\nA 3 2\n"
+
+
+def fields(tasks):
+    return [(t.task_type, t.original_char, t.id, t.arrival_time, t.burst_time, t.period, t.deadline) for t in tasks]
+
+
+def test_parse_checked_diagnostics():
+    tasks, notes = parse_checked("# comment\nP 0 1 4\nP 0 x 2 6\nX 1 5\nS 1\nP\nA 1 2 (note)\n")
+    # The unknown letter keeps the original parser's behaviour: an empty periodic task
+    assert [(t.task_type, t.original_char, t.burst_time) for t in tasks] == [('P', 'P', 1), ('P', 'P', 2), ('P', 'X', 0), ('A', 'A', 2)]
+    assert notes == [(3, "ignored non-integer value(s): x"),
+                     (4, "unknown task type 'X', read as periodic"),
+                     (5, "S takes 2 values, got 1, line skipped"),
+                     (6, "no integer values, line skipped")]
+
+
+def test_parse_checked_matches_parse_content_on_clean_input():
+    tasks, notes = parse_checked(GOOD)
+    assert notes == [] and fields(tasks) == fields(parse_content(GOOD))
+
+
+def test_strict_parse_raises():
+    with pytest.raises((IndexError, ValueError)): parse_content("S 1")
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "lib"; (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text(GOOD)
+    (root / "sub" / "b.txt").write_text("P 0 1 4\nQ 0 1 5\n")
+    with zipfile.ZipFile(root / "sets.zip", "w") as z:
+        z.writestr("one.txt", "P 0 2 8\n"); z.writestr("two.txt", "P 0 3 9\nA 1 1\n")
+    return root
+
+
+def run(root, cache):
+    return ingest([str(root)], cache_dir=str(cache), max_workers=1)
+
+
+def test_ingest(library, tmp_path):
+    result = ingest([str(library)], max_workers=1)
+    names = [os.path.relpath(name, library) for name, _ in result.sets]
+    assert names == ["a.txt", "sets.zip::one.txt", "sets.zip::two.txt", os.path.join("sub", "b.txt")]
+    assert fields(result.sets[0][1]) == fields(parse_content(GOOD))
+    assert [(os.path.relpath(n, library), line, msg) for n, line, msg in result.diagnostics] == [
+        (os.path.join("sub", "b.txt"), 2, "unknown task type 'Q', read as periodic")]
+    assert (result.parsed, result.cached, result.failed) == (4, 0, 0)
+
+
+def test_cache_round_trip(library, tmp_path):
+    first = run(library, tmp_path / "cache")
+    second = run(library, tmp_path / "cache")
+    assert (second.parsed, second.cached) == (0, 4)
+    assert [(n, fields(t)) for n, t in second.sets] == [(n, fields(t)) for n, t in first.sets]
+    assert second.diagnostics == first.diagnostics
+
+
+def test_edited_file_is_parsed_again(library, tmp_path):
+    run(library, tmp_path / "cache")
+    (library / "a.txt").write_text(GOOD + "P 0 1 20\n")
+    result = run(library, tmp_path / "cache")
+    assert (result.parsed, result.cached) == (1, 3)
+    assert len(dict(result.sets)[str(library / "a.txt")]) == 5
+
+
+def test_touched_file_is_hashed_not_parsed(library, tmp_path):
+    run(library, tmp_path / "cache")
+    stat = os.stat(library / "a.txt")
+    os.utime(library / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    result = run(library, tmp_path / "cache")
+    assert (result.parsed, result.cached) == (0, 4)
+    # The new mtime is recorded: the next run does not even read the file
+    with open(tmp_path / "cache" / "index.json") as f:
+        assert json.load(f)['files'][str(library / "a.txt")][0] == stat.st_mtime_ns + 10 ** 9
+
+
+def test_deleted_files_leave_the_cache(library, tmp_path):
+    run(library, tmp_path / "cache")
+    os.remove(library / "a.txt"); os.remove(library / "sets.zip")
+    result = run(library, tmp_path / "cache")
+    assert [os.path.relpath(n, library) for n, _ in result.sets] == [os.path.join("sub", "b.txt")]
+    with open(tmp_path / "cache" / "index.json") as f: index = json.load(f)
+    assert list(index['files']) == [str(library / "sub" / "b.txt")]
+    assert index['archives'] == {} and len(index['sets']) == 1
+
+
+def test_unreadable_archive(tmp_path):
+    (tmp_path / "bad.zip").write_bytes(b"not a zip")
+    result = ingest([str(tmp_path / "bad.zip")], max_workers=1)
+    assert result.failed == 1 and result.diagnostics[0][2].startswith("cannot read archive")
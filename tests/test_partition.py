@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from rtss.engine import SERVER_ALGORITHMS, Simulator
+from rtss.model import parse_content
+from rtss.partition import HEURISTICS, core_algorithm, partition_tasks, run_partitioned
+
+ALGORITHMS = ["Rate Monotonic (RM)", "Earliest Deadline First (EDF)", "Background", "Deferrable Server", "Sporadic Server"]
+
+
+class FullRun(Simulator):
+    # Never stops at a steady state: the plain tick-by-tick reference up to the horizon
+    def _boundary(self, t):
+        self.next_boundary = t + self.hyperperiod
+        return False
+
+
+def random_set(rng):
+    lines = []
+    for _ in range(rng.randint(2, 6)):
+        period = rng.choice([5, 10, 12, 15, 20, 25, 30])
+        burst = rng.randint(1, max(1, period // 3))
+        lines.append(f"P {rng.randint(0, 4)} {burst} {period} {rng.randint(burst, period)}")
+    lines.append(f"S {rng.randint(1, 3)} {rng.choice([10, 20])}")
+    lines += [f"A {rng.randint(0, 60)} {rng.randint(1, 5)}" for _ in range(rng.randint(0, 3))]
+    return parse_content("\n".join(lines))
+
+
+def check_against_direct_runs(tasks, algorithm, cores, heuristic, test):
+    schedule, horizon, stats = run_partitioned(tasks, algorithm, cores, heuristic, test, max_workers=1)
+    bins = partition_tasks(tasks, cores, algorithm, heuristic, test)[0]
+    jobs = misses = 0
+    for k, core_tasks in enumerate(bins):
+        if not core_tasks: continue
+        sim = FullRun(core_tasks, core_algorithm(algorithm, core_tasks), 1, max_horizon=horizon, min_horizon=horizon)
+        direct, _, direct_stats = sim.run()
+        expected = [dict(seg, core=k + 1) for seg in direct if seg['start'] < horizon]
+        assert [seg for seg in schedule if seg['core'] == k + 1] == expected, f"core {k + 1}"
+        jobs += direct_stats['total_jobs']; misses += direct_stats['missed_deadlines']
+    assert stats['total_jobs'] == jobs
+    assert stats['missed_deadlines'] == misses
+
+
+def test_core_that_stops_early_runs_to_the_common_horizon():
+    tasks = parse_content("P 4 1 15 5\nP 2 7 20 19\nP 1 6 20 15\nP 1 3 25 12\nP 2 2 5 3\nS 1 10\nA 30 5\nA 6 3")
+    schedule, horizon, stats = run_partitioned(tasks, "Deferrable Server", 3, "first-fit", "rta", max_workers=1)
+    assert stats['aperiodic_done'] == 2
+    assert all(p['horizon'] >= 100 or p['steady_state'] for p in stats['partitions'])
+    check_against_direct_runs(tasks, "Deferrable Server", 3, "first-fit", "rta")
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_merged_cores_match_direct_runs(seed):
+    rng = random.Random(seed)
+    tasks = random_set(rng)
+    algorithm = rng.choice(ALGORITHMS)
+    if algorithm in SERVER_ALGORITHMS: assert any(t.task_type == 'S' for t in tasks)
+    check_against_direct_runs(tasks, algorithm, rng.randint(2, 3), rng.choice(HEURISTICS), rng.choice(["utilization", "rta"]))
+
+
+@pytest.mark.parametrize("heuristic", HEURISTICS)
+def test_list_order_does_not_matter(heuristic):
+    tasks = random_set(random.Random(3))
+    for algorithm in ("Rate Monotonic (RM)", "Deferrable Server"):
+        assert run_partitioned(tasks[::-1], algorithm, 3, heuristic, "rta", max_workers=1) == run_partitioned(tasks, algorithm, 3, heuristic, "rta", max_workers=1)
@@ -0,0 +1,43 @@
+from rtss.arrivals import next_free_id, read_arrival_trace
+from rtss.engine import run_simulation
+from rtss.model import parse_content
+from rtss.profiling import run_instrumented
+
+# Periodic tasks that release and preempt each other, a Sporadic Server and
+# aperiodic work within the horizon, so every engine phase has work to do
+SET = "P 0 1 4\nP 1 2 6\nP 0 3 20 15\nS 1 5\nA 3 2"
+
+
+def write_trace(path):
+    path.write_text("".join(f"A {3 * i} {1 + i % 3}\n" for i in range(200)))
+    return str(path)
+
+
+def test_same_result_as_a_plain_run(tmp_path):
+    tasks = parse_content(SET)
+    trace = write_trace(tmp_path / "arrivals.txt")
+    opened = []
+
+    def source():
+        opened.append(1)
+        return read_arrival_trace(trace, next_free_id(tasks))
+    schedule, horizon, stats = run_instrumented(tasks, "Sporadic Server", 1, source, memory=True, pstats_path=str(tmp_path / "run.pstats"))
+    expected = run_simulation(tasks, "Sporadic Server", 1, read_arrival_trace(trace, next_free_id(tasks)))
+    assert (schedule, horizon) == expected[:2]
+    assert {k: v for k, v in stats.items() if k != 'profile'} == expected[2]
+    # Each run reads the trace again instead of sharing a list
+    assert len(opened) == 2
+    assert (tmp_path / "run.pstats").exists()
+    profile = stats['profile']
+    for name, phase in profile['phases'].items():
+        assert phase['calls'] > 0 and phase['seconds'] > 0, name
+    assert profile['events'] == profile['phases']['dispatch']['calls'] and profile['peak_ready_queue'] > 1
+    assert profile['memory']['peak_bytes'] > 0
+
+
+def test_one_shot_iterator_with_pstats(tmp_path):
+    tasks = parse_content(SET)
+    trace = write_trace(tmp_path / "arrivals.txt")
+    schedule, horizon, _ = run_instrumented(tasks, "Poller", 1, read_arrival_trace(trace, next_free_id(tasks)),
+                                            pstats_path=str(tmp_path / "run.pstats"))
+    assert (schedule, horizon) == run_simulation(tasks, "Poller", 1, read_arrival_trace(trace, next_free_id(tasks)))[:2]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from rtss.stats import QuantileSketch, RunningStats
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 1]
+
+
+def sketch_of(values, **kwargs):
+    sketch = QuantileSketch(**kwargs)
+    for x in values: sketch.add(x)
+    return sketch
+
+
+def assert_within(sketch, values, accuracy, quantiles=QUANTILES):
+    for q in quantiles:
+        # Nearest rank, as the sketch reports it
+        exact = np.quantile(values, q, method='inverted_cdf')
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact + 1e-9, q
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+@pytest.mark.parametrize("seed", range(3))
+def test_quantiles_within_relative_accuracy(accuracy, seed):
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([rng.lognormal(3, 1.5, 5000), rng.integers(1, 50, 2000)])
+    rng.shuffle(values)
+    sketch = sketch_of(values.tolist(), relative_accuracy=accuracy)
+    assert len(sketch) == len(values)
+    assert_within(sketch, values, accuracy)
+
+
+def test_zeros_are_exact():
+    values = [0] * 30 + list(range(1, 71))
+    sketch = sketch_of(values)
+    assert sketch.quantile(0.1) == 0 and sketch.quantile(0.3) == 0
+    assert_within(sketch, np.array(values), 0.01)
+
+
+def test_collapse_keeps_the_high_quantiles():
+    # 300 buckets of 2% cover a factor of e^6: about the top tenth of this stream
+    values = np.random.default_rng(7).lognormal(0, 3, 5000)
+    sketch = sketch_of(values.tolist(), max_buckets=300)
+    assert len(sketch.buckets) == 300
+    assert_within(sketch, values, 0.01, [0.95, 0.99, 1])
+    # The merged low buckets report their upper neighbour
+    low = np.quantile(values, 0.01, method='inverted_cdf')
+    assert sketch.quantile(0.01) > 1.01 * low
+
+
+def test_merge_equals_one_sketch():
+    rng = np.random.default_rng(3)
+    parts = [rng.lognormal(2, 1, n).tolist() for n in (1000, 0, 1, 2500)]
+    parts[1:1] = [[0, 0, 5]]
+    merged = QuantileSketch()
+    for part in parts: merged.merge(sketch_of(part))
+    whole = sketch_of([x for part in parts for x in part])
+    assert merged.buckets == whole.buckets and merged.zeros == whole.zeros
+    assert len(merged) == len(whole)
+    assert (merged.stats.min, merged.stats.max) == (whole.stats.min, whole.stats.max)
+    assert merged.stats.total == pytest.approx(whole.stats.total)
+    assert merged.summary() == whole.summary()
+
+
+def test_merge_respects_max_buckets():
+    rng = np.random.default_rng(4)
+    merged = sketch_of(rng.lognormal(0, 3, 2000).tolist(), max_buckets=32)
+    merged.merge(sketch_of(rng.lognormal(5, 3, 2000).tolist(), max_buckets=32))
+    assert len(merged.buckets) <= 32
+
+
+def test_empty():
+    sketch = QuantileSketch()
+    assert len(sketch) == 0 and sketch.quantile(0.5) is None
+    assert sketch.summary() == {'count': 0, 'min': None, 'mean': None, 'max': None,
+                                'p50': None, 'p90': None, 'p95': None, 'p99': None}
+    # Merging an empty sketch changes nothing
+    other = sketch_of([3, 4])
+    other.merge(sketch)
+    assert other.summary() == sketch_of([3, 4]).summary()
+    sketch.merge(other)
+    assert sketch.summary() == other.summary()
+
+
+@pytest.mark.parametrize("value", [0, 1, 7, 1234.5])
+def test_one_sample(value):
+    sketch = sketch_of([value])
+    # Clamped to [min, max]: a single sample is reported exactly
+    assert all(sketch.quantile(q) == value for q in QUANTILES)
+    assert sketch.summary() == {'count': 1, 'min': value, 'mean': value, 'max': value,
+                                'p50': value, 'p90': value, 'p95': value, 'p99': value}
+
+
+def test_running_stats():
+    stats = RunningStats()
+    assert (stats.mean(), stats.spread()) == (None, None)
+    for x in (4, 1, 7): stats.add(x)
+    assert (stats.count, stats.min, stats.max, stats.mean(), stats.spread()) == (3, 1, 7, 4, 6)
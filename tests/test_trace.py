@@ -0,0 +1,74 @@
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from rtss import trace as trace_module
+from rtss.engine import run_simulation
+from rtss.gantt import SegmentStore
+from rtss.model import Task, parse_content
+from rtss.trace import open_trace, save_trace
+
+# Three periodic tasks that preempt each other (one with an offset and D < T),
+# a server and aperiodic jobs
+SET = "P 0 1 4\nP 1 2 6\nP 0 3 10 7\nS 1 5\nA 3 2\nA 3 1\nA 11 4"
+
+
+def saved(tmp_path, tasks, algorithm, cores):
+    schedule, horizon, stats = run_simulation(tasks, algorithm, cores)
+    path = save_trace(str(tmp_path / "run.npz"), schedule, tasks, algorithm, cores, horizon, stats)
+    return (schedule, horizon, stats), open_trace(path)
+
+
+@pytest.mark.parametrize("algorithm", ["Rate Monotonic (RM)", "Earliest Deadline First (EDF)", "Sporadic Server", "Background"])
+@pytest.mark.parametrize("cores", [1, 2])
+def test_round_trip(tmp_path, algorithm, cores):
+    (schedule, horizon, stats), trace = saved(tmp_path, parse_content(SET), algorithm, cores)
+    assert trace.schedule() == schedule
+    assert (trace.algorithm, trace.num_cores, trace.horizon) == (algorithm, cores, horizon)
+    assert trace.stats == stats
+    assert [[getattr(t, f) for f in Task.__slots__] for t in trace.tasks] == [[getattr(t, f) for f in Task.__slots__] for t in parse_content(SET)]
+    assert [trace[i] for i in range(len(trace))] == schedule
+    # Loads as a plain .npz too
+    with np.load(trace.path) as data: assert len(data['segments']) == len(schedule)
+
+
+def test_fixture_preempts(tmp_path):
+    schedule, _, stats = run_simulation(parse_content(SET), "Rate Monotonic (RM)", 1)
+    assert {seg['task_id'] for seg in schedule} >= {1, 2, 3} and stats['preemptions'] > 0
+
+
+def test_window(tmp_path):
+    (schedule, _, _), trace = saved(tmp_path, parse_content(SET), "Poller", 1)
+    assert trace.schedule(7, 19) == [s for s in schedule if s['start'] < 19 and s['end'] > 7]
+
+
+def test_chunked_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(trace_module, "CHUNK_ROWS", 3)
+    (schedule, _, _), trace = saved(tmp_path, parse_content(SET), "Deferrable Server", 2)
+    assert len(schedule) > 3 and trace.schedule() == schedule
+
+
+def test_empty_trace(tmp_path):
+    path = save_trace(str(tmp_path / "empty.npz"), [], [], "Rate Monotonic (RM)", 1, 0, {})
+    trace = open_trace(path)
+    assert len(trace) == 0 and trace.schedule() == []
+    assert len(SegmentStore.from_trace(trace)) == 0
+
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / "other.npz"
+    np.savez(path, x=np.arange(3))
+    with pytest.raises(ValueError): open_trace(str(path))
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test_sample", "*.txt"))), ids=os.path.basename)
+@pytest.mark.parametrize("cores", [1, 3])
+def test_segment_store_from_trace(tmp_path, path, cores):
+    with open(path) as f: tasks = parse_content(f.read())
+    (schedule, _, _), trace = saved(tmp_path, tasks, "Earliest Deadline First (EDF)", cores)
+    a = SegmentStore(schedule, tasks, cores); b = SegmentStore.from_trace(trace)
+    for column in ('start', 'end', 'y', 'order'): assert (getattr(a, column) == getattr(b, column)).all()
+    assert [a.colors[c] for c in a.color] == [b.colors[c] for c in b.color]
+    assert [a.job(i) for i in range(len(a))] == [b.job(i) for i in range(len(b))]